@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache checks: per-node SQLite queries vs the preloaded area_cache.
+
+Stores a full quadtree of leaves (4**DEPTH areas, a few crimes each) for one
+date, then times the lookups the engines and historical fetchers make:
+
+- bisection: one cache check per node, for every node of the tree
+- historical: the crime_areas lookup plus crime count for every area
+
+The "SQL" column replays the queries the notebook used to run per node; the
+"area_cache" column uses the notebook's own `cache_functions` cell.
+"""
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+DEPTH = 6
+CRIMES_PER_AREA = 3
+DATE = "2024-01"
+
+
+def build_database(db_path):
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, factory = main.database_connection_factory.run(DB_PATH=str(db_path), DB_PROFILE="fast", sqlite3=sqlite3)
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    conn, cursor = db["conn"], db["cursor"]
+
+    root_bounds = (53.0, 50.5, 1.0, -2.0)
+    root = quadtree["root_cell"](db["get_root_id"](root_bounds))
+    nodes, level, crime_id = [(root_bounds, root)], [(root_bounds, root)], 0
+    for _ in range(DEPTH):
+        level = [child for bounds, cell in level for child in quadtree["split_cell"](*bounds, cell)]
+        nodes.extend(level)
+    for bounds, cell in level:
+        cell_id = db["get_cell_id"](bounds, cell)
+        cursor.execute("INSERT INTO crime_areas (cell_id, crime_count, date) VALUES (?, ?, ?)",
+                       (cell_id, CRIMES_PER_AREA, DATE))
+        area_id = cursor.lastrowid
+        cursor.executemany("INSERT INTO crimes (area_id, crime_id) VALUES (?, ?)",
+                           [(area_id, str(crime_id + i)) for i in range(CRIMES_PER_AREA)])
+        crime_id += CRIMES_PER_AREA
+    conn.commit()
+    cell_ids = [row[0] for row in cursor.execute("SELECT cell_id FROM crime_areas")]
+    return factory["connect_db"], db, quadtree, nodes, cell_ids
+
+
+def timed(label, fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {len(items) / elapsed:>12,.0f} lookups/s  ({elapsed * 1000:.1f} ms)")
+    return elapsed
+
+
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    connect_db, db, quadtree, nodes, cell_ids = build_database(Path(tmp) / "cache.db")
+    cursor = db["cursor"]
+    cells = [cell for _, cell in nodes]
+    print(f"{len(cell_ids):,} stored leaves, {len(cells):,} bisection nodes")
+    print("=" * 70)
+
+    def sql_check(cell):
+        cursor.execute(
+            """SELECT ca.crime_count FROM area_cells c
+               JOIN crime_areas ca ON ca.cell_id = c.id AND ca.date = ?
+               WHERE c.root_id = ? AND c.quadkey = ? AND c.depth = ?""",
+            (DATE, cell[0], cell[2], cell[1]),
+        )
+        return cursor.fetchone()
+
+    def sql_historical(cell_id):
+        cursor.execute("SELECT id, crime_count FROM crime_areas WHERE cell_id = ? AND date = ?", (cell_id, DATE))
+        area_id, _ = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM crimes WHERE area_id = ?", (area_id,))
+        return cursor.fetchone()
+
+    sql_nodes = timed("bisection checks, SQL per node", sql_check, cells)
+    sql_areas = timed("historical checks, 2 SQL per area", sql_historical, cell_ids)
+
+    start = time.perf_counter()
+    _, cache = main.cache_functions.run(
+        connect_db=connect_db, cursor=cursor, descendant_range=quadtree["descendant_range"], threading=threading
+    )
+    cache["area_cache"].area(cell_ids[0], DATE)
+    print(f"{'area_cache load (one query)':<34} {(time.perf_counter() - start) * 1000:>23.1f} ms")
+    mem_nodes = timed("bisection checks, area_cache", lambda cell: cache["check_area_cached"](cell, DATE), cells)
+    mem_areas = timed("historical checks, area_cache", lambda cell_id: cache["area_cache"].area(cell_id, DATE), cell_ids)
+
+print("=" * 70)
+print(f"Speedup: bisection {sql_nodes / mem_nodes:.0f}x, historical {sql_areas / mem_areas:.0f}x (excluding the one-off load)")
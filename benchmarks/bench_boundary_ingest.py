@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start boundary ingestion: buffered .json() vs streaming parse.
+
+Serves two synthetic GeoJSON FeatureCollections (sized like the GB and NI
+downloads, with holes) from a bandwidth-limited stub in a child process, then compares the
+original sequential httpx.get + .json() + Polygon loop against the notebook's
+streaming, concurrent `fetch_boundary`. Peak memory is the Python heap as seen
+by tracemalloc (parsed JSON dominates it; GEOS allocations are not counted).
+"""
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+BANDWIDTH_BYTES_PER_SECOND = 10_000_000  # per connection
+CHUNK_BYTES = 64 * 1024
+
+
+def synthetic_collection(features, vertices, seed):
+    """Grid of wavy multipolygon 'districts', each with a hole, over the UK extent."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    side = int(np.ceil(np.sqrt(features)))
+    spacing = 9.0 / side
+    items = []
+    for i in range(features):
+        lon, lat = -7.5 + spacing * (i % side), 50.0 + spacing * (i // side)
+        wobble = sum(0.04 * np.sin(k * angles + rng.uniform(0, 2 * np.pi)) for k in (3, 7, 17))
+        radius = 0.3 * spacing * (1 + wobble)
+        shell = np.c_[lon + radius * np.cos(angles), lat + radius * np.sin(angles)]
+        hole = np.c_[lon + 0.1 * spacing * np.cos(-angles[::4]), lat + 0.1 * spacing * np.sin(-angles[::4])]
+        islet = np.c_[lon + 0.42 * spacing + 0.05 * spacing * np.cos(angles[::8]),
+                      lat + 0.05 * spacing * np.sin(angles[::8])]
+        shell, hole, islet = (np.vstack([r, r[:1]]).round(6).tolist() for r in (shell, hole, islet))
+        items.append({
+            "type": "Feature",
+            "properties": {"name": f"district {i}"},
+            "geometry": {"type": "MultiPolygon", "coordinates": [[shell, hole], [islet]]},
+        })
+    return json.dumps({"type": "FeatureCollection", "features": items}).encode()
+
+
+DOCUMENTS = {
+    "/gb.json": synthetic_collection(380, 400, seed=0),
+    "/ni.json": synthetic_collection(11, 40_000, seed=1),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = DOCUMENTS[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for offset in range(0, len(body), CHUNK_BYTES):
+            self.wfile.write(body[offset:offset + CHUNK_BYTES])
+            time.sleep(CHUNK_BYTES / BANDWIDTH_BYTES_PER_SECOND)
+
+    def log_message(self, *args):
+        pass
+
+
+def buffered_fetch(gb_url, ni_url):
+    """The original fetch_boundary: sequential, whole-document .json(), shells only."""
+    def extract(geojson_data):
+        polygons = []
+        for feature in geojson_data["features"]:
+            geom = feature["geometry"]
+            if geom["type"] == "Polygon":
+                polygons.append(Polygon(geom["coordinates"][0]))
+            elif geom["type"] == "MultiPolygon":
+                for poly_coords in geom["coordinates"]:
+                    polygons.append(Polygon(poly_coords[0]))
+        return polygons
+
+    gb_response = httpx.get(gb_url, timeout=30.0)
+    ni_response = httpx.get(ni_url, timeout=30.0)
+    return unary_union(extract(gb_response.json()) + extract(ni_response.json()))
+
+
+def measure(label, fetch):
+    """Time one cold fetch, then repeat it under tracemalloc for the peak heap."""
+    start = time.perf_counter()
+    boundary = fetch()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    holes = sum(len(p.interiors) for p in getattr(boundary, "geoms", [boundary]))
+    print(f"{label:<30} {elapsed:6.2f} s | peak heap {peak / 1e6:7.1f} MB | {holes} holes kept")
+    return elapsed, peak
+
+
+# Serve from a child process so the stub does not compete with the parser for the GIL
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+stub = multiprocessing.Process(target=server.serve_forever, daemon=True)
+stub.start()
+base = f"http://127.0.0.1:{server.server_port}"
+gb_url, ni_url = f"{base}/gb.json", f"{base}/ni.json"
+
+print(f"GB {len(DOCUMENTS['/gb.json']) / 1e6:.1f} MB, NI {len(DOCUMENTS['/ni.json']) / 1e6:.1f} MB, "
+      f"stub bandwidth {BANDWIDTH_BYTES_PER_SECOND / 1e6:.0f} MB/s per connection")
+print("=" * 78)
+
+before = measure("buffered .json() (sequential)", lambda: buffered_fetch(gb_url, ni_url))
+
+_, parsing = main.boundary_geojson_functions.run(np=np, shapely=shapely)
+_, fetching = main.fetch_uk_boundary_from_github.run(
+    GITHUB_GB_BOUNDARY_URL=gb_url,
+    GITHUB_NI_BOUNDARY_URL=ni_url,
+    httpx=httpx,
+    np=np,
+    stream_polygons_from_geojson=parsing["stream_polygons_from_geojson"],
+    unary_union=unary_union,
+)
+after = measure("streaming (concurrent)", fetching["fetch_boundary"])
+
+print("=" * 78)
+print(f"Cold start: {before[0] / after[0]:.1f}x faster | peak heap: {before[1] / after[1]:.1f}x lower")
+stub.terminate()
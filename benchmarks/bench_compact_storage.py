@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark compact crime storage: the text crimes table vs crime_records.
+
+Builds a database in the previous layout (crimes with text category,
+street and month columns and REAL coordinates, plus its indexes), times the
+GROUP BY queries the notebook runs over it, then opens it with the
+notebook's `database_setup`, which migrates it to crime_records and the
+lookup tables, and times the same queries on the compacted layout.
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+CRIMES = 1_200_000
+MONTHS = 12
+CRIMES_PER_AREA = 400
+STREETS = 40_000
+CATEGORIES = ["anti-social-behaviour", "bicycle-theft", "burglary", "criminal-damage-arson", "drugs",
+              "other-crime", "other-theft", "possession-of-weapons", "public-order", "robbery",
+              "shoplifting", "theft-from-the-person", "vehicle-crime", "violent-crime"]
+STREET_WORDS = ["High", "Station", "Church", "Park", "Victoria", "Green", "Manor", "Kings", "Queens", "Mill",
+                "School", "North", "South", "West", "East", "New", "Albert", "Grange", "Chapel", "Windsor"]
+STREET_TYPES = ["Street", "Road", "Lane", "Avenue", "Close", "Way", "Drive", "Crescent", "Gardens", "Place"]
+
+# The crimes table and indexes before compaction
+LEGACY_SCHEMA = [
+    """CREATE TABLE crimes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        area_id INTEGER,
+        crime_id TEXT UNIQUE,
+        category TEXT,
+        latitude REAL,
+        longitude REAL,
+        street_name TEXT,
+        month TEXT
+    )""",
+    "CREATE INDEX idx_crimes_area_category_month ON crimes(area_id, category, month)",
+    """CREATE INDEX idx_crimes_area_location ON crimes(area_id, latitude, longitude, street_name, category)
+       WHERE latitude IS NOT NULL AND longitude IS NOT NULL""",
+]
+# (name, query before, query after compaction)
+QUERIES = [
+    ("per-area counts (summary rebuild)",
+     "SELECT area_id, category, month, COUNT(*) FROM crimes GROUP BY 1, 2, 3",
+     "SELECT area_id, category_id, month, COUNT(*) FROM crime_records GROUP BY 1, 2, 3"),
+    ("hotspots (all areas)",
+     """SELECT area_id, latitude, longitude, street_name, COUNT(*) FROM crimes
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        GROUP BY area_id, latitude, longitude, street_name HAVING COUNT(*) > 1""",
+     """SELECT area_id, latitude_e6, longitude_e6, street_id, COUNT(*) FROM crime_records
+        WHERE latitude_e6 IS NOT NULL AND longitude_e6 IS NOT NULL
+        GROUP BY area_id, latitude_e6, longitude_e6, street_id HAVING COUNT(*) > 1"""),
+    ("category x month (table scan)",
+     "SELECT category, month, COUNT(*) FROM crimes NOT INDEXED GROUP BY 1, 2",
+     "SELECT category_id, month, COUNT(*) FROM crime_records NOT INDEXED GROUP BY 1, 2"),
+]
+
+
+def legacy_rows(rng):
+    """(area_id, crime_id, category, latitude, longitude, street_name, month) rows, stored area by area."""
+    streets = [f"On or near {rng.choice(STREET_WORDS)} {rng.choice(STREET_TYPES)} {n}" for n in range(STREETS)]
+    street_index = rng.integers(0, STREETS, CRIMES)
+    categories = rng.integers(0, len(CATEGORIES), CRIMES)
+    lat = np.round(rng.uniform(50.0, 55.0, CRIMES), 6)
+    lon = np.round(rng.uniform(-5.0, 1.5, CRIMES), 6)
+    per_month = CRIMES // MONTHS
+    return [
+        (i // CRIMES_PER_AREA + 1, str(110_000_000 + i), CATEGORIES[categories[i]], float(lat[i]), float(lon[i]),
+         streets[street_index[i]], f"2024-{i // per_month + 1:02d}")
+        for i in range(CRIMES)
+    ]
+
+
+def file_size(conn):
+    return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def time_queries(conn, column, repeats=3):
+    best = {}
+    for query in QUERIES:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            conn.execute(query[column]).fetchall()
+            times.append(time.perf_counter() - start)
+        best[query[0]] = min(times)
+    return best
+
+
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    db_path = Path(tmp) / "compact.db"
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, factory = main.database_connection_factory.run(DB_PATH=str(db_path), DB_PROFILE="fast", sqlite3=sqlite3)
+    conn = factory["connect_db"]()
+    for sql in LEGACY_SCHEMA:
+        conn.execute(sql)
+    conn.executemany(
+        """INSERT INTO crimes (area_id, crime_id, category, latitude, longitude, street_name, month)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        legacy_rows(np.random.default_rng(11)),
+    )
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.execute("VACUUM")
+    size_before = file_size(conn)
+    before = time_queries(conn, 1)
+    conn.close()
+
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    start = time.perf_counter()
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    migration = time.perf_counter() - start
+    conn = db["conn"]
+    # Compare the same tables: the legacy database was built without an R*Tree
+    conn.execute("DROP TABLE crimes_rtree")
+    conn.commit()
+    conn.execute("VACUUM")
+    size_after = file_size(conn)
+    after = time_queries(conn, 2)
+    conn.close()
+
+print("=" * 78)
+print(f"{CRIMES:,} crimes, {STREETS:,} streets, {len(CATEGORIES)} categories, {MONTHS} months")
+print(f"Migration (including the R*Tree backfill and VACUUM): {migration:.1f} s")
+print(f"{'file size, data + indexes':<34} {size_before / 1e6:>9.1f} MB {size_after / 1e6:>9.1f} MB "
+      f"({size_after / size_before - 1:+.0%})")
+print(f"{'bytes per crime':<34} {size_before / CRIMES:>12.0f} {size_after / CRIMES:>12.0f}")
+print(f"{'query':<34} {'text crimes':>12} {'crime_records':>14} {'speedup':>9}")
+for name, elapsed in before.items():
+    print(f"{name:<34} {elapsed * 1000:>9.0f} ms {after[name] * 1000:>11.0f} ms {elapsed / after[name]:>8.1f}x")
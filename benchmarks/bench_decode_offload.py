@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop lag and throughput while decoding 10,000-crime responses.
+
+Runs `fetch_historical_crimes_async` against a local stub of the API (in its
+own process, so serving does not compete for this process's GIL) that
+answers every area with a 10,000-crime payload, about 3.5 MB of JSON. A
+probe coroutine sleeps 5 ms at a time on the same event loop and records
+how late it wakes up: that lateness is time the loop spent blocked.
+
+- previous: `json.loads` on the event loop, crimes shaped in the ingest
+  writer thread (the notebook before the decode pool)
+- inline: decode and shape on the event loop (what the notebook does for
+  responses under DECODE_OFFLOAD_MIN_BYTES)
+- process pool: decode and shape in DECODE_PROCESSES worker processes; the
+  loop only unpickles the shaped columns
+
+End-to-end throughput counts until every crime is committed. The rate limit
+is raised so the runs are bound by decoding and writing rather than quota.
+"""
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import run_cells, start_stub  # noqa: E402
+
+AREAS = 40
+CRIMES_PER_RESPONSE = 10_000
+DATE = "2023-01"
+PROBE_INTERVAL = 0.005
+
+
+def make_responder():
+    """A 10,000-crime payload per request, after 20-80 ms."""
+    rng = random.Random(3)
+    # Each crime pre-encoded without its id; ids are spliced in per request
+    fragments = [json.dumps({
+        "category": rng.choice(["anti-social-behaviour", "burglary", "drugs", "shoplifting", "vehicle-crime"]),
+        "location_type": "Force",
+        "location": {"latitude": f"{51.3 + rng.random() * 0.4:.6f}",
+                     "street": {"id": 1_000_000 + i, "name": f"On or near Street {rng.randrange(3000)}"},
+                     "longitude": f"{-0.5 + rng.random() * 0.8:.6f}"},
+        "context": "",
+        "outcome_status": {"category": "Under investigation", "date": DATE},
+        "persistent_id": "",
+        "location_subtype": "",
+        "month": DATE,
+    })[1:].encode() for i in range(CRIMES_PER_RESPONSE)]
+
+    def respond(params):
+        key = zlib.crc32(f"{params['date']}:{params['poly']}".encode())
+        time.sleep(random.Random(key).uniform(0.02, 0.08))
+        first_id = key * CRIMES_PER_RESPONSE
+        return 200, b"[" + b",".join(b'{"id": %d, ' % (first_id + i) + fragment
+                                     for i, fragment in enumerate(fragments)) + b"]"
+    return respond
+
+
+def previous_decode(content):
+    """The fetchers' previous response.json(): dictionaries, shaped later by the writer."""
+    crimes_data = json.loads(content)
+    return len(crimes_data), crimes_data
+
+
+MODES = {
+    "previous": {"decode_crimes": previous_decode},
+    "inline": {"DECODE_OFFLOAD_MIN_BYTES": float("inf")},
+    "process pool": {},
+}
+
+
+def build_env(db_path, overrides):
+    """Run the notebook cells against db_path and the stub; returns (definitions, leaves)."""
+    env = run_cells("async_historical_fetcher", **{
+        "DB_PATH": str(db_path), "DB_PROFILE": "fast", "API_BASE_URL": url,
+        "MAX_CALLS_PER_SECOND": 1_000, "RATE_LIMIT_BURST": 10, **overrides,
+    })
+    leaves = []
+    for index in range(AREAS):
+        bounds = (52.0, 51.9, -2.0 + (index + 1) * 0.01, -2.0 + index * 0.01)
+        leaves.append((index + 1, env["get_cell_id"](bounds), bounds, CRIMES_PER_RESPONSE))
+    env["conn"].commit()
+    return env, leaves
+
+
+async def probe_lag(lags):
+    """Sleep PROBE_INTERVAL at a time on the loop, recording how late each wake-up is."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def fetch_with_probe(fetch, leaves, lags):
+    probe = asyncio.create_task(probe_lag(lags))
+    try:
+        return await fetch(leaves, DATE)
+    finally:
+        probe.cancel()
+
+
+# Spawned decode workers re-import this script: run only when executed
+if __name__ == "__main__":
+    # Start the stub before this process has any threads
+    url, stop_stub = start_stub(make_responder, process=True)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+        for mode, overrides in MODES.items():
+            env, leaves = build_env(Path(tmp) / f"{mode.replace(' ', '_')}.db", overrides)
+            # Warm up the client, the decode workers and the writer on one area
+            asyncio.run(env["fetch_historical_crimes_async"](leaves[:1], "2022-12"))
+            env["ingest_writer"].flush()
+            lags = []
+            start = time.perf_counter()
+            asyncio.run(fetch_with_probe(env["fetch_historical_crimes_async"], leaves, lags))
+            fetched = time.perf_counter() - start
+            env["ingest_writer"].flush()
+            elapsed = time.perf_counter() - start
+            stored = env["conn"].execute("SELECT COUNT(*) FROM crimes").fetchone()[0]
+            env["ingest_writer"].close()
+            env["conn"].close()
+            assert stored == (AREAS + 1) * CRIMES_PER_RESPONSE, (mode, stored)
+            lags.sort()
+            results[mode] = (statistics.median(lags), lags[int(len(lags) * 0.99)], lags[-1],
+                             AREAS / fetched, AREAS * CRIMES_PER_RESPONSE / elapsed)
+    stop_stub()
+
+    print(f"{AREAS} responses of {CRIMES_PER_RESPONSE:,} crimes, latency 20-80 ms; "
+          f"event-loop lag of a {PROBE_INTERVAL * 1000:.0f} ms sleep")
+    print("=" * 78)
+    print(f"{'mode':<14} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'fetched':>14} {'end to end':>17}")
+    for mode, (p50, p99, worst, responses, crimes) in results.items():
+        print(f"{mode:<14} {p50 * 1000:>6.1f} ms {p99 * 1000:>6.1f} ms {worst * 1000:>6.1f} ms "
+              f"{responses:>7.1f} resp/s {crimes:>10,.0f} crimes/s")
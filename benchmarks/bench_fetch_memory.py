@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of the async historical fetcher as the area list grows.
+
+Runs `fetch_historical_crimes_async` against a local stub of the API that
+returns a 1,000-crime payload per area, with jittered latency so responses
+land out of order. Python allocations are traced with tracemalloc, and the
+peak is reported for each fetcher at several area counts:
+
+- in-order awaits: the previous fetcher, one coroutine per area awaited in
+  list order (effectively sequential)
+- gather: every area in flight at once with asyncio.gather, which holds
+  every decoded payload until the last one arrives
+- worker pool: the notebook's fetcher, MAX_CONCURRENT_REQUESTS workers on a
+  queue, each response released once the ingest writer has queued it
+
+The worker pool holds at most MAX_CONCURRENT_REQUESTS payloads in flight plus
+INGEST_QUEUE_MAX_AREAS waiting for the writer, so its peak levels off once the
+writer's queue is full. The rate limit is raised so the run is bound by
+latency rather than quota; tracemalloc slows everything, so no times are shown.
+"""
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import run_cells, start_stub  # noqa: E402
+
+AREA_COUNTS = [100, 200, 400]
+CRIMES_PER_RESPONSE = 1_000
+DATE = "2023-01"
+
+
+def make_responder():
+    """A 1,000-crime payload per area, after 10-60 ms (1 in 20 takes 300 ms)."""
+    def respond(params):
+        key = zlib.crc32(params["poly"].encode())
+        rng = random.Random(key)
+        time.sleep(0.3 if rng.random() < 0.05 else rng.uniform(0.01, 0.06))
+        return 200, json.dumps([{
+            "category": "burglary",
+            "location_type": "Force",
+            "location": {"latitude": f"{51.3 + rng.random() * 0.4:.6f}",
+                         "street": {"id": 1_000_000 + i, "name": f"On or near Street {rng.randrange(3000)}"},
+                         "longitude": f"{-0.5 + rng.random() * 0.8:.6f}"},
+            "context": "",
+            "outcome_status": {"category": "Under investigation", "date": DATE},
+            "persistent_id": "",
+            "id": key * 10_000 + i,
+            "location_subtype": "",
+            "month": DATE,
+        } for i in range(CRIMES_PER_RESPONSE)]).encode()
+    return respond
+
+
+def build_env(db_path, areas):
+    """Run the notebook cells against db_path and the stub, with `areas` leaves stored for 2022-12."""
+    env = run_cells("async_historical_fetcher", DB_PATH=str(db_path), DB_PROFILE="fast", API_BASE_URL=url,
+                    MAX_CALLS_PER_SECOND=1_000, RATE_LIMIT_BURST=10)
+    leaves = []
+    for index in range(areas):
+        bounds = (52.0, 51.9, -2.0 + (index + 1) * 0.01, -2.0 + index * 0.01)
+        leaves.append((index + 1, env["get_cell_id"](bounds), bounds, CRIMES_PER_RESPONSE))
+    env["conn"].commit()
+    return env, leaves
+
+
+def in_order_fetch(env):
+    """The previous fetch_historical_crimes_async loop, for comparison."""
+    async def fetch(areas, date):
+        semaphore = asyncio.Semaphore(env["MAX_CONCURRENT_REQUESTS"])
+        async with httpx.AsyncClient() as client:
+            tasks = [env["fetch_crimes_async"](client, semaphore, env["bounds_to_polygon"](*bounds), date,
+                                               env["format_polygon"]) for _, _, bounds, _ in areas]
+            for (_, _, bounds, _), task in zip(areas, tasks):
+                status_code, data, crime_count = await task
+                await env["ingest_writer"].submit_async(bounds, crime_count, date, data)
+    return fetch
+
+
+def gather_fetch(env):
+    """Every area in flight at once; the payloads are written after the last arrives."""
+    async def fetch(areas, date):
+        semaphore = asyncio.Semaphore(len(areas))
+        async with httpx.AsyncClient(limits=httpx.Limits(max_connections=None)) as client:
+            responses = await asyncio.gather(*(
+                env["fetch_crimes_async"](client, semaphore, env["bounds_to_polygon"](*bounds), date,
+                                          env["format_polygon"]) for _, _, bounds, _ in areas
+            ))
+            for (_, _, bounds, _), (status_code, data, crime_count) in zip(areas, responses):
+                await env["ingest_writer"].submit_async(bounds, crime_count, date, data)
+    return fetch
+
+
+FETCHERS = {
+    "in-order awaits": in_order_fetch,
+    "gather": gather_fetch,
+    "worker pool": lambda env: env["fetch_historical_crimes_async"],
+}
+
+# Spawned decode workers re-import this script: run only when executed
+if __name__ == "__main__":
+    url, stop_stub = start_stub(make_responder)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+        for areas in AREA_COUNTS:
+            for name, fetcher in FETCHERS.items():
+                env, leaves = build_env(Path(tmp) / f"{name.replace(' ', '_')}_{areas}.db", areas)
+                fetch = fetcher(env)
+                tracemalloc.start()
+                asyncio.run(fetch(leaves, DATE))
+                env["ingest_writer"].flush()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                stored = env["conn"].execute("SELECT COUNT(*) FROM crimes").fetchone()[0]
+                env["ingest_writer"].close()
+                env["conn"].close()
+                assert stored == areas * CRIMES_PER_RESPONSE, (name, areas, stored)
+                results[name, areas] = peak
+    stop_stub()
+
+    print(f"{CRIMES_PER_RESPONSE:,} crimes per area, latency 10-60 ms with 5% at 300 ms; peak traced memory")
+    print("=" * 70)
+    print(f"{'fetcher':<18}" + "".join(f"{f'{areas} areas':>14}" for areas in AREA_COUNTS))
+    for name in FETCHERS:
+        print(f"{name:<18}" + "".join(f"{results[name, areas] / 1e6:>11.0f} MB" for areas in AREA_COUNTS))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the async historical collector against a local stub of the API.
+
+The stub answers each (polygon, month) with a small crimes payload after a
+long-tailed latency: most requests take 0.2-0.6 s and 1 in 20 takes 3 s. The
+latency is derived from the request, so every mode sees the same latencies.
+The notebook's own cells run with their real concurrency and rate limits.
+
+- previous fetcher: `fetch_historical_crimes_async`, month by month, as the
+  collector ran it (it awaits one area at a time)
+- month by month: one `fetch_historical_months_async` job per month, each
+  waiting for its slowest area before the next month starts
+- one job: every month in a single job on one work queue
+
+No API quota is used.
+"""
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import run_cells, start_stub  # noqa: E402
+
+AREAS = 40
+MONTHS = [f"2023-{month:02d}" for month in range(1, 7)]
+CRIMES_PER_RESPONSE = 200
+SLOW_SHARE, SLOW_SECONDS = 0.05, 3.0
+
+
+def make_responder():
+    """A small payload per (polygon, month), after a latency derived from the request."""
+    def respond(params):
+        key = zlib.crc32(f"{params['date']}:{params['poly']}".encode())
+        rng = random.Random(key)
+        time.sleep(SLOW_SECONDS if rng.random() < SLOW_SHARE else rng.uniform(0.2, 0.6))
+        return 200, json.dumps([
+            {"id": key * 1000 + i, "category": "burglary", "month": params["date"],
+             "location": {"latitude": "51.5", "longitude": "-0.1", "street": {"name": "On or near High Street"}}}
+            for i in range(CRIMES_PER_RESPONSE)
+        ]).encode()
+    return respond
+
+
+def build_env(db_path):
+    """Run the notebook cells against db_path and the stub; returns their definitions."""
+    env = run_cells("async_historical_fetcher", "historical_data_functions",
+                    DB_PATH=str(db_path), DB_PROFILE="fast", API_BASE_URL=url)
+    # AREAS stored leaves for a base month, as a bisection run leaves them
+    for index in range(AREAS):
+        west = -2.0 + index * 0.05
+        cell_id = env["get_cell_id"]((52.0, 51.9, west + 0.05, west))
+        env["cursor"].execute("INSERT INTO crime_areas (cell_id, crime_count, date) VALUES (?, ?, ?)",
+                              (cell_id, CRIMES_PER_RESPONSE, "2022-12"))
+    env["conn"].commit()
+    return env
+
+
+url, stop_stub = start_stub(make_responder)
+
+results = {}
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    for mode in ("previous fetcher", "month by month", "one job"):
+        env = build_env(Path(tmp) / f"{mode.replace(' ', '_')}.db")
+        areas = env["load_existing_areas"]("2022-12")
+        completed = {}
+        start = time.perf_counter()
+        if mode == "previous fetcher":
+            for month in MONTHS:
+                asyncio.run(env["fetch_historical_crimes_async"](areas, month))
+                completed[month] = time.perf_counter() - start
+        elif mode == "month by month":
+            for month in MONTHS:
+                asyncio.run(env["fetch_historical_months_async"](areas, [month]))
+                completed[month] = time.perf_counter() - start
+        else:
+            asyncio.run(env["fetch_historical_months_async"](
+                areas, MONTHS, month_callback=lambda month, stats, complete: completed.__setitem__(month, time.perf_counter() - start)
+            ))
+        env["ingest_writer"].flush()
+        elapsed = time.perf_counter() - start
+        stored = env["conn"].execute("SELECT COUNT(*) FROM crimes").fetchone()[0]
+        env["ingest_writer"].close()
+        env["conn"].close()
+        assert stored == AREAS * len(MONTHS) * CRIMES_PER_RESPONSE, (mode, stored)
+        results[mode] = (elapsed, completed)
+stop_stub()
+
+config = run_cells("api_config", "async_api_config")
+print(f"{AREAS} areas x {len(MONTHS)} months, {config['MAX_CALLS_PER_SECOND']} calls/s, "
+      f"{config['MAX_CONCURRENT_REQUESTS']} in flight; "
+      f"latency 0.2-0.6 s, {SLOW_SHARE:.0%} at {SLOW_SECONDS:.0f} s")
+print("=" * 70)
+calls = AREAS * len(MONTHS)
+print(f"{'mode':<16} {'total':>8} {'calls/s':>8}   month completed at (s)")
+for mode, (elapsed, completed) in results.items():
+    print(f"{mode:<16} {elapsed:>6.1f} s {calls / elapsed:>8.1f}   "
+          + " ".join(f"{completed[month]:5.1f}" for month in MONTHS))
+print("=" * 70)
+print(f"One job vs previous fetcher: {results['previous fetcher'][0] / results['one job'][0]:.2f}x, "
+      f"vs month by month: {results['month by month'][0] / results['one job'][0]:.2f}x "
+      f"(rate limit floor {calls / config['MAX_CALLS_PER_SECOND']:.1f} s)")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request latency of module-level httpx.get vs a pooled httpx.Client.
+
+Runs against a local stub server that mimics the crimes-street endpoint, so no
+API quota is used. The stub speaks plain HTTP/1.1 with keep-alive; HTTP/2 is
+only negotiated over TLS, so this measures the connection-reuse win. Against
+data.police.uk the pooled client also saves the TLS handshake on every call.
+"""
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+REQUESTS = 300
+PAYLOAD = json.dumps([
+    {"id": i, "category": "anti-social-behaviour", "month": "2024-01",
+     "location": {"latitude": "51.5", "longitude": "-0.1", "street": {"name": "On or near High Street"}}}
+    for i in range(50)
+]).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Avoid 40 ms delayed-ACK stalls skewing latencies
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_requests(get, url):
+    """Return per-request latencies in milliseconds."""
+    latencies = []
+    params = {"date": "2024-01", "poly": "51.7,-0.5:51.7,0.3:51.3,0.3:51.3,-0.5"}
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = get(url, params=params)
+        response.json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(latencies):6.2f} ms | "
+          f"p50 {statistics.median(latencies):6.2f} ms | p95 {p95:6.2f} ms")
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_port}/api/crimes-street/all-crime"
+
+print(f"Benchmarking {REQUESTS} requests against {url}")
+print("=" * 60)
+
+baseline = time_requests(lambda u, params: httpx.get(u, params=params, timeout=30.0), url)
+report("httpx.get (new connection)", baseline)
+
+with httpx.Client(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60.0),
+) as client:
+    pooled = time_requests(client.get, url)
+report("pooled httpx.Client", pooled)
+
+print("=" * 60)
+print(f"Speedup (mean): {statistics.mean(baseline) / statistics.mean(pooled):.1f}x")
+server.shutdown()
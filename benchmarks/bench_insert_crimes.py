@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark insert_crimes_batch on 10,000-crime synthetic API payloads.
+
+Compares the row-by-row path (per-name lookups and an executemany
+INSERT OR IGNORE into crime_records) with the notebook's staged path
+(one temp-table load, then INSERT ... SELECT), for:
+
+- new crimes: every crime in the payload is new
+- re-fetched area: every crime is already stored
+- repeats in batch: the payload lists each crime twice
+
+Each case runs on its own database, with the R*Tree triggers in place, and
+the two paths must store identical crimes.
+"""
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+from crime_payloads import shape_crimes  # noqa: E402
+
+PAYLOAD_CRIMES = 10_000
+PAYLOADS = 8
+STREETS = 3_000
+CATEGORIES = ["anti-social-behaviour", "bicycle-theft", "burglary", "criminal-damage-arson", "drugs",
+              "other-theft", "public-order", "shoplifting", "vehicle-crime", "violent-crime"]
+
+
+def api_payload(rng, first_id, month):
+    """A police API response body: PAYLOAD_CRIMES crime dictionaries."""
+    return [{
+        "category": rng.choice(CATEGORIES),
+        "location_type": "Force",
+        "location": {
+            "latitude": f"{51.3 + rng.random() * 0.4:.6f}",
+            "street": {"id": 1_000_000 + rng.randrange(STREETS), "name": f"On or near Street {rng.randrange(STREETS)}"},
+            "longitude": f"{-0.5 + rng.random() * 0.8:.6f}",
+        },
+        "context": "",
+        "outcome_status": {"category": "Under investigation", "date": month},
+        "persistent_id": "",
+        "id": first_id + i,
+        "location_subtype": "",
+        "month": month,
+    } for i in range(PAYLOAD_CRIMES)]
+
+
+def build_database(db_path):
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, factory = main.database_connection_factory.run(DB_PATH=str(db_path), DB_PROFILE="fast", sqlite3=sqlite3)
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    _, insertion = main.crime_insertion_functions.run(cursor=db["cursor"])
+    return db["conn"], db["cursor"], insertion
+
+
+def row_by_row_insert():
+    """The previous insert_crimes_batch, for comparison."""
+    def lookup_ids(table, names, db_cursor):
+        names = [name for name in names if name is not None]
+        db_cursor.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", [(name,) for name in names])
+        ids = {}
+        for offset in range(0, len(names), 500):
+            chunk = names[offset:offset + 500]
+            db_cursor.execute(f"SELECT name, id FROM {table} WHERE name IN ({', '.join('?' * len(chunk))})", chunk)
+            ids.update(db_cursor.fetchall())
+        return ids
+
+    def insert(area_id, crimes_data, db_cursor):
+        batch = shape_crimes(crimes_data)
+        category_ids = lookup_ids("crime_categories", set(batch.categories), db_cursor)
+        street_ids = lookup_ids("streets", set(batch.street_names), db_cursor)
+        db_cursor.executemany(
+            """INSERT OR IGNORE INTO crime_records
+               (area_id, crime_id, category_id, street_id, month, latitude_e6, longitude_e6)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(area_id, crime_id, category_ids.get(category), street_ids.get(street), month, lat, lon)
+             for crime_id, category, street, month, lat, lon in batch.rows()]
+        )
+        return db_cursor.rowcount
+    return insert
+
+
+def run_case(db_path, path, payloads, preload):
+    """Insert each payload as one area and commit, as the ingest writer does; returns (crimes/s, rows)."""
+    conn, cursor, insertion = build_database(db_path)
+    insert = (row_by_row_insert() if path == "row-by-row"
+              else lambda area_id, crimes, db_cursor: insertion["insert_crimes_batch"](area_id, crimes, db_cursor))
+    for area_id, crimes in enumerate(preload, start=1):
+        insertion["insert_crimes_batch"](area_id, crimes)
+    conn.commit()
+    start = time.perf_counter()
+    for area_id, crimes in enumerate(payloads, start=1):
+        insert(area_id, crimes, cursor)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    # Without the surrogate id: row-by-row inserts use one up for every ignored repeat
+    rows = conn.execute(
+        "SELECT area_id, crime_id, category, latitude, longitude, street_name, month FROM crimes ORDER BY crime_id"
+    ).fetchall()
+    conn.close()
+    return sum(len(crimes) for crimes in payloads) / elapsed, rows
+
+
+rng = random.Random(5)
+payloads = [api_payload(rng, n * PAYLOAD_CRIMES, f"2024-{n % 12 + 1:02d}") for n in range(PAYLOADS)]
+CASES = {
+    "new crimes": (payloads, []),
+    "re-fetched area": (payloads, payloads),
+    "repeats in batch": ([crimes + crimes for crimes in payloads], []),
+}
+
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    start = time.perf_counter()
+    for crimes in payloads:
+        shape_crimes(crimes)
+    shaping = (time.perf_counter() - start) / PAYLOADS
+
+    print(f"{PAYLOADS} payloads of {PAYLOAD_CRIMES:,} crimes, one commit per payload; "
+          f"shaping alone {shaping * 1000:.1f} ms per payload")
+    print("=" * 70)
+    print(f"{'case':<20} {'row-by-row':>16} {'staged':>16} {'speedup':>9}")
+    for name, (batches, preload) in CASES.items():
+        results = {}
+        for path in ("row-by-row", "staged"):
+            db_path = Path(tmp) / f"{name.replace(' ', '_')}_{path}.db"
+            results[path] = run_case(db_path, path, batches, preload)
+        assert results["row-by-row"][1] == results["staged"][1], name
+        before, after = results["row-by-row"][0], results["staged"][0]
+        print(f"{name:<20} {before:>10,.0f} rows/s {after:>10,.0f} rows/s {after / before:>8.2f}x")
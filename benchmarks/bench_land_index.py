@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: UK land intersection tests per second.
+
+Compares the original `box(...).intersects(uk_boundary_polygon)` against the
+indexed tests from the notebook's `uk_land_test` cell (prepared component
+polygons in an STRtree, plus the all-land fast path).
+
+Uses the notebook's boundary cache if present (run the notebook once to create it),
+otherwise a synthetic multi-part coastline of similar complexity.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box
+from shapely.ops import unary_union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+TESTS = 20_000
+
+
+def synthetic_boundary(parts=400, vertices=256, seed=0):
+    """Union of jagged blobs over the UK extent (~100k vertices)."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    blobs = []
+    for lon, lat in zip(rng.uniform(-7.5, 1.5, parts), rng.uniform(50.0, 60.0, parts)):
+        radius = rng.uniform(0.03, 0.25) * np.exp(0.1 * rng.standard_normal(vertices))
+        blobs.append(Polygon(np.c_[lon + radius * np.cos(angles), lat + radius * np.sin(angles)]))
+    return unary_union(blobs)
+
+
+def load_boundary():
+    _, config = main.api_config.run()
+    _, cache = main.boundary_cache_functions.run(
+        BOUNDARY_CACHE_PATH=config["BOUNDARY_CACHE_PATH"],
+        BOUNDARY_CACHE_VERSION=config["BOUNDARY_CACHE_VERSION"],
+        GITHUB_GB_BOUNDARY_URL=config["GITHUB_GB_BOUNDARY_URL"],
+        GITHUB_NI_BOUNDARY_URL=config["GITHUB_NI_BOUNDARY_URL"],
+        Path=Path,
+        json=json,
+        shapely=shapely,
+    )
+    boundary = cache["load_boundary_from_cache"]()
+    if boundary is not None:
+        return boundary, config["BOUNDARY_CACHE_PATH"]
+    return synthetic_boundary(), "synthetic"
+
+
+def random_boxes(count, seed=1):
+    """Boxes from 2 degrees down to ~1 km, like a deep bisection run."""
+    rng = np.random.default_rng(seed)
+    size = 2.0 / 2 ** rng.integers(0, 8, count)
+    west = rng.uniform(-8.2, 1.8, count)
+    south = rng.uniform(49.0, 60.9, count)
+    return [(s + d, s, w + d, w) for s, w, d in zip(south, west, size)]
+
+
+def rate(label, test, boxes):
+    start = time.perf_counter()
+    hits = sum(test(*b) for b in boxes)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {len(boxes) / elapsed:>10,.0f} tests/s  ({hits} with land)")
+    return len(boxes) / elapsed
+
+
+boundary, source = load_boundary()
+vertex_count = sum(len(g.exterior.coords) for g in getattr(boundary, "geoms", [boundary]))
+print(f"Boundary: {source}, {len(getattr(boundary, 'geoms', [boundary]))} parts, {vertex_count:,} vertices")
+print("=" * 70)
+
+boxes = random_boxes(TESTS)
+before = rate("box.intersects(unary_union)", lambda n, s, e, w: box(w, s, e, n).intersects(boundary), boxes)
+
+_, defs = main.uk_land_test.run(shapely=shapely, uk_boundary_polygon=boundary)
+after = rate("indexed area_has_uk_land", defs["area_has_uk_land"], boxes)
+rate("indexed area_inside_uk_land", defs["area_inside_uk_land"], boxes)
+
+print("=" * 70)
+print(f"Speedup: {after / before:.1f}x (sub-boxes of all-land boxes skip the test entirely)")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark resuming an async bisection after the kernel dies mid-run.
+
+A local stub of the API holds a fixed set of crimes (a dense cluster over a
+uniform background) and answers like the real one: 503 for a box with more
+than MAX_CRIMES_LIMIT crimes, otherwise the crimes inside it. Each session
+runs `process_area_async` in a forked process. The first session is killed
+with os._exit (queued writes are lost, as in a dead kernel) straight after
+the ingest writer's Nth commit, for N at each of KILL_SHARES of the
+uninterrupted run's commits, so the kill point is the same on every run. A
+second session then finishes the job on the same database, and the leaves
+it returns must match the stored ones: each cell once, with the same crime
+total.
+
+- uninterrupted: one session per mode, for the commit count and leaf set
+- cache only: no run_id; the restart resumes through check_area_cached and
+  has_leaves_under (the notebook before checkpointed runs)
+- checkpointed: both sessions pass the same run from start_bisection_run
+
+Requests the second session repeats are split by what the first session
+had committed when it died:
+- repeated: the box's answer was committed, yet it was requested again
+- re-sent: the box was in flight, or answered but not yet committed; its
+  answer died with the kernel, so it has to be requested again
+
+The notebook's own concurrency, rate limit and commit interval apply; no API
+quota is used.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import box
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import polygon_bounds, run_cells, start_stub  # noqa: E402
+
+ROOT = (51.7, 51.3, 0.3, -0.5)
+DATE = "2023-01"
+CRIMES = 1_000_000
+CLUSTER_SHARE = 0.6
+KILL_SHARES = (0.25, 0.5, 0.75)
+
+
+def make_responder(log_path):
+    """Stub API over a fixed crime set; appends every request to log_path."""
+    rng = np.random.default_rng(7)
+    north, south, east, west = ROOT
+    clustered = int(CRIMES * CLUSTER_SHARE)
+    lat = np.concatenate([rng.normal(51.51, 0.03, clustered), rng.uniform(south, north, CRIMES - clustered)])
+    lon = np.concatenate([rng.normal(-0.12, 0.05, clustered), rng.uniform(west, east, CRIMES - clustered)])
+    inside = (lat > south) & (lat < north) & (lon > west) & (lon < east)
+    lat, lon = lat[inside], lon[inside]
+    limit = run_cells("api_config")["MAX_CRIMES_LIMIT"]
+    log = open(log_path, "a", buffering=1)
+
+    def respond(params):
+        log.write(f"{params['date']} {params['poly']}\n")
+        box_north, box_south, box_east, box_west = polygon_bounds(params["poly"])
+        idx = np.flatnonzero((lat >= box_south) & (lat < box_north) & (lon >= box_west) & (lon < box_east))
+        if len(idx) > limit:
+            return 503, b""
+        return 200, json.dumps([
+            {"id": int(i), "category": "burglary", "month": DATE,
+             "location": {"latitude": f"{lat[i]:.6f}", "longitude": f"{lon[i]:.6f}",
+                          "street": {"name": "On or near High Street"}}}
+            for i in idx
+        ]).encode()
+    return respond
+
+
+def build_env(db_path):
+    """Run the notebook cells against db_path and the stub; returns their definitions."""
+    return run_cells("run_state_functions", "async_bisection_algorithm",
+                     DB_PATH=str(db_path), DB_PROFILE="fast", API_BASE_URL=url,
+                     DECODE_OFFLOAD_MIN_BYTES=float("inf"),
+                     uk_boundary_polygon=box(ROOT[3], ROOT[1], ROOT[2], ROOT[0]))
+
+
+def session(db_path, checkpointed, kill_after_commits, commits, returned):
+    """
+    One notebook session: bisect ROOT; os._exit right after the writer's
+    kill_after_commits-th commit. Leaves returned as (results, distinct cells, crimes).
+    """
+    sys.stdout = open(os.devnull, "w")
+    env = build_env(db_path)
+    run_id = env["start_bisection_run"](ROOT, DATE)[0] if checkpointed else None
+    area_cache, record = env["area_cache"], env["area_cache"].record
+
+    def record_and_count(records):
+        # The writer applies each commit's records to area_cache once the commit succeeds
+        record(records)
+        commits.value += 1
+        if commits.value == kill_after_commits:
+            os._exit(0)  # Kernel dies: nothing after this commit is kept
+    area_cache.record = record_and_count
+    results = asyncio.run(env["process_area_async"](*ROOT, DATE, [0], [], [0], run_id=run_id))
+    returned[:] = [len(results), len({cell for _, _, cell in results}), sum(count for _, count, _ in results)]
+    env["ingest_writer"].flush()
+    if run_id is not None:
+        env["finish_run"](run_id)
+    env["ingest_writer"].close()
+    os._exit(0)  # Skip the parent's atexit handlers
+
+
+def run_session(db_path, checkpointed, kill_after_commits=None):
+    """Run a session in a forked process; returns the writer commits it made and the leaves it returned."""
+    commits = fork.Value("i", 0)
+    returned = fork.Array("q", 3)
+    process = fork.Process(target=session, args=(db_path, checkpointed, kill_after_commits, commits, returned))
+    process.start()
+    process.join()
+    return commits.value, tuple(returned)
+
+
+def stored_leaves(db_path):
+    with sqlite3.connect(db_path) as db_conn:
+        return db_conn.execute("SELECT COUNT(*), SUM(crime_count) FROM crime_areas WHERE date = ?", (DATE,)).fetchone()
+
+
+def committed_boxes(db_path):
+    """Bounds of every box whose answer is committed: stored leaves and recorded splits."""
+    with sqlite3.connect(db_path) as db_conn:
+        return set(db_conn.execute(
+            """SELECT c.north, c.south, c.east, c.west FROM crime_areas ca JOIN area_cells c ON c.id = ca.cell_id
+               WHERE ca.date = ?
+               UNION SELECT c.north, c.south, c.east, c.west FROM split_cache sc JOIN area_cells c ON c.id = sc.cell_id
+               WHERE sc.date = ?""",
+            (DATE, DATE)
+        ).fetchall())
+
+
+# Spawned decode workers re-import this script: run only when executed
+if __name__ == "__main__":
+    # Start the stub before this process has any threads
+    fork = multiprocessing.get_context("fork")
+    tmp = tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent)
+    log_path = Path(tmp.name) / "requests.log"
+    url, stop_stub = start_stub(make_responder, log_path, process=True)
+
+    def requests_since(offset):
+        with open(log_path) as log:
+            return log.read().splitlines()[offset:]
+
+    baselines, results = {}, []
+    try:
+        for mode, checkpointed in (("cache only", False), ("checkpointed", True)):
+            db_path = Path(tmp.name) / f"{mode.replace(' ', '_')}.db"
+            offset = len(requests_since(0))
+            total_commits, _ = run_session(db_path, checkpointed)
+            baseline_leaves = stored_leaves(db_path)
+            baselines[mode] = (len(requests_since(offset)), total_commits, baseline_leaves)
+            for share in KILL_SHARES:
+                kill_after = int(total_commits * share)
+                db_path = Path(tmp.name) / f"{mode.replace(' ', '_')}_{kill_after}.db"
+                offset = len(requests_since(0))
+                run_session(db_path, checkpointed, kill_after)
+                first = requests_since(offset)
+                committed = committed_boxes(db_path)
+                _, returned = run_session(db_path, checkpointed)
+                second = requests_since(offset + len(first))
+                assert stored_leaves(db_path) == baseline_leaves, (mode, stored_leaves(db_path), baseline_leaves)
+                # The resumed session's own answer: every stored leaf once, none reported twice
+                leaves, crimes = baseline_leaves
+                assert returned == (leaves, leaves, crimes), (mode, kill_after, returned, baseline_leaves)
+                asked_before = set(first)
+                again = [request for request in second if request in asked_before]
+                repeated = sum(polygon_bounds(request.split(" ", 1)[1]) in committed for request in again)
+                results.append((mode, kill_after, total_commits, len(first), len(second), repeated, len(again) - repeated))
+    finally:
+        stop_stub()
+        tmp.cleanup()
+
+    print(f"{CRIMES:,} crimes ({CLUSTER_SHARE:.0%} clustered), date {DATE}; uninterrupted runs:")
+    for mode, (calls, total_commits, leaves) in baselines.items():
+        print(f"  {mode}: {calls} API calls, {total_commits} commits, {leaves[0]} leaves")
+    print("=" * 78)
+    print(f"{'mode':<14} {'killed at':>12} {'session 1':>10} {'session 2':>10} {'total':>7} {'repeated':>9} {'re-sent':>8}")
+    for mode, kill_after, total_commits, first, second, repeated, resent in results:
+        print(f"{mode:<14} {f'{kill_after}/{total_commits}':>12} {first:>10} {second:>10} {first + second:>7} "
+              f"{repeated:>9} {resent:>8}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark spatial queries: R*Tree indexes vs scanning the crimes table.
+
+Fills a database with CRIMES crimes over MONTHS months, clustered around UK
+cities and snapped to a grid like the police API's anonymised locations.
+Crimes are inserted month by month and area by area, as the ingest writer
+stores them (R*Tree quality depends on insertion order). It then times the
+notebook's `spatial_query_functions` with the R*Tree tables and again with
+them dropped (the fallback: range filters over crimes).
+Also reports the ingest cost of the R*Tree triggers.
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+CRIMES = 2_000_000
+MONTHS = 24
+INGEST_SAMPLE_MONTHS = 3
+AREA_SIZE = 0.1  # Degrees; crimes of one area are stored together
+CITIES = [  # (latitude, longitude, share of crimes, spread in degrees)
+    (51.51, -0.13, 0.30, 0.15), (52.48, -1.90, 0.10, 0.08), (53.48, -2.24, 0.10, 0.08),
+    (53.80, -1.55, 0.07, 0.06), (55.86, -4.25, 0.07, 0.06), (53.41, -2.98, 0.06, 0.05),
+    (51.45, -2.59, 0.05, 0.05), (55.95, -3.19, 0.05, 0.05), (54.60, -5.93, 0.04, 0.05),
+]
+CATEGORIES = ["anti-social-behaviour", "burglary", "criminal-damage-arson", "drugs", "other-theft",
+              "public-order", "robbery", "shoplifting", "vehicle-crime", "violent-crime"]
+
+VIEWPORT = (51.53, 51.49, -0.10, -0.16)  # Central London at street zoom
+REGION = (52.0, 51.0, 0.5, -1.0)  # Ad-hoc region analysis, roughly London and the Home Counties
+POINT = (51.507, -0.128)
+MONTH = "2024-06"
+
+
+def crime_rows(count, start, month_number, rng):
+    """One month's (area_id, crime_id, category, latitude, longitude, street_name, month) rows, by area."""
+    city = rng.choice(len(CITIES) + 1, size=count, p=[c[2] for c in CITIES] + [1 - sum(c[2] for c in CITIES)])
+    lat = rng.uniform(50.0, 58.5, count)
+    lon = rng.uniform(-7.5, 1.7, count)
+    for index, (city_lat, city_lon, _, spread) in enumerate(CITIES):
+        mask = city == index
+        lat[mask] = rng.normal(city_lat, spread, mask.sum())
+        lon[mask] = rng.normal(city_lon, spread * 1.6, mask.sum())
+    lat, lon = np.round(lat, 3), np.round(lon, 3)  # Snap to anonymised map points
+    areas = (np.floor(lat / AREA_SIZE) * 10_000 + np.floor(lon / AREA_SIZE)).astype(np.int64)
+    order = np.argsort(areas, kind="stable")
+    categories = rng.integers(0, len(CATEGORIES), count)
+    month = f"{2023 + month_number // 12}-{month_number % 12 + 1:02d}"
+    return [
+        (int(areas[i]), str(start + n), CATEGORIES[categories[i]], float(lat[i]), float(lon[i]),
+         f"On or near {lat[i]:.3f},{lon[i]:.3f}", month)
+        for n, i in enumerate(order)
+    ]
+
+
+def build_database(db_path):
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, factory = main.database_connection_factory.run(DB_PATH=str(db_path), DB_PROFILE="fast", sqlite3=sqlite3)
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    return db["conn"], db["cursor"]
+
+
+def insert(conn, rows, batch=50_000):
+    start = time.perf_counter()
+    for offset in range(0, len(rows), batch):
+        conn.executemany(
+            """INSERT INTO crimes (area_id, crime_id, category, latitude, longitude, street_name, month)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows[offset:offset + batch],
+        )
+        conn.commit()
+    return len(rows) / (time.perf_counter() - start)
+
+
+def best_time(fn, repeats=3):
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run_queries(cursor):
+    _, spatial = main.spatial_query_functions.run(cursor=cursor, np=np)
+    queries = {
+        f"viewport, {MONTH}": lambda: spatial["crimes_in_bbox"](*VIEWPORT, month=MONTH),
+        "viewport, all months": lambda: spatial["crimes_in_bbox"](*VIEWPORT),
+        f"viewport hotspots, {MONTH}": lambda: spatial["hotspots_in_bbox"](*VIEWPORT, month=MONTH, limit=200),
+        f"region hotspots, {MONTH}": lambda: spatial["hotspots_in_bbox"](*REGION, month=MONTH, limit=200),
+        f"1 km radius, {MONTH}": lambda: spatial["crimes_within_radius"](*POINT, 1000, month=MONTH),
+        "20 nearest, all months": lambda: spatial["nearest_crimes"](*POINT, k=20),
+    }
+    return {name: best_time(fn) for name, fn in queries.items()}
+
+
+rng = np.random.default_rng(7)
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    # Ingest cost of the R*Tree triggers
+    per_month = CRIMES // MONTHS
+    sample = [row for month_number in range(INGEST_SAMPLE_MONTHS)
+              for row in crime_rows(per_month, month_number * per_month, month_number, rng)]
+    conn, _ = build_database(Path(tmp) / "triggers.db")
+    with_index = insert(conn, sample)
+    conn.close()
+    conn, _ = build_database(Path(tmp) / "plain.db")
+    for (trigger,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%rtree%'").fetchall():
+        conn.execute(f"DROP TRIGGER {trigger}")
+    without_index = insert(conn, sample)
+    conn.close()
+    print(f"Ingest: {without_index:,.0f} crimes/s without R*Tree, {with_index:,.0f} crimes/s with "
+          f"({with_index / without_index - 1:+.0%})")
+
+    conn, cursor = build_database(Path(tmp) / "spatial.db")
+    start = time.perf_counter()
+    for month_number in range(MONTHS):
+        insert(conn, crime_rows(per_month, month_number * per_month, month_number, rng))
+    print(f"{CRIMES:,} crimes over {MONTHS} months loaded in {time.perf_counter() - start:.0f} s")
+    print("=" * 78)
+
+    indexed = run_queries(cursor)
+    cursor.execute("DROP TABLE crimes_rtree")
+    cursor.execute("DROP TABLE area_cells_rtree")
+    scanned = run_queries(cursor)
+
+    print(f"{'query':<30} {'rows':>7} {'scan crimes':>14} {'R*Tree':>10} {'speedup':>9}")
+    for name, (elapsed, rows) in indexed.items():
+        scan_elapsed, scan_rows = scanned[name]
+        assert len(rows) == len(scan_rows), name
+        print(f"{name:<30} {len(rows):>7,} {scan_elapsed * 1000:>11.1f} ms {elapsed * 1000:>7.1f} ms "
+              f"{scan_elapsed / elapsed:>8.0f}x")
+    conn.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark bisecting a month of an area that was already bisected: the next
+month after the previous one, and the same month again.
+
+A local stub of the API holds a crime set per month (a dense cluster over a
+uniform background; each month keeps a random share of a common pool and
+the cluster drifts) and answers like the real one: 503 for a box with more
+than MAX_CRIMES_LIMIT crimes, otherwise the crimes inside it. The previous
+month is bisected once; each mode then bisects the next month with
+`process_area_async` on a copy of that database.
+
+- no history: an empty database (the cost of bisecting a month cold)
+- density predictor: load_density_predictor from the previous month's areas
+  inside the root box, which only skips boxes confidently above
+  MAX_CRIMES_LIMIT
+
+A last row reruns the cold month after its leaves are dropped (as after a
+crash before they committed): split_cache answers every box that answered
+503, so only boxes that fit in one response are fetched again.
+
+The rate limit is raised so the runs are bound by the stub; no API quota is
+used.
+"""
+import asyncio
+import contextlib
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import box
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import polygon_bounds, run_cells, start_stub  # noqa: E402
+
+ROOT = (51.7, 51.3, 0.3, -0.5)
+PREVIOUS, DATE = "2023-01", "2023-02"
+POOL = 1_100_000
+MONTH_SHARE = 0.9
+CLUSTER_SHARE = 0.6
+CLUSTER_DRIFT = 0.01  # Degrees the cluster centre moves per month
+
+
+def month_crimes(month):
+    """(lat, lon) of the crimes for one month (1-based) inside ROOT."""
+    rng = np.random.default_rng(7)
+    north, south, east, west = ROOT
+    clustered = int(POOL * CLUSTER_SHARE)
+    lat = np.concatenate([rng.normal(0, 0.03, clustered), rng.uniform(south, north, POOL - clustered)])
+    lon = np.concatenate([rng.normal(0, 0.05, clustered), rng.uniform(west, east, POOL - clustered)])
+    lat[:clustered] += 51.51 + CLUSTER_DRIFT * month
+    lon[:clustered] += -0.12 + CLUSTER_DRIFT * month
+    keep = np.random.default_rng(month).random(POOL) < MONTH_SHARE
+    inside = keep & (lat > south) & (lat < north) & (lon > west) & (lon < east)
+    return lat[inside], lon[inside]
+
+
+def make_responder():
+    """Stub API over a fixed crime set per month."""
+    months = {date: month_crimes(int(date[5:])) for date in (PREVIOUS, DATE)}
+    limit = run_cells("api_config")["MAX_CRIMES_LIMIT"]
+
+    def respond(params):
+        date = params["date"]
+        lat, lon = months[date]
+        north, south, east, west = polygon_bounds(params["poly"])
+        idx = np.flatnonzero((lat >= south) & (lat < north) & (lon >= west) & (lon < east))
+        if len(idx) > limit:
+            return 503, b""
+        return 200, json.dumps([
+            {"id": int(i), "category": "burglary", "month": date,
+             "location": {"latitude": f"{lat[i]:.6f}", "longitude": f"{lon[i]:.6f}",
+                          "street": {"name": "On or near High Street"}}}
+            for i in idx
+        ]).encode()
+    return respond
+
+
+def build_env(db_path):
+    """Run the notebook cells against db_path and the stub; returns their definitions."""
+    return run_cells("density_prediction_functions", "async_bisection_algorithm",
+                     DB_PATH=str(db_path), DB_PROFILE="fast", API_BASE_URL=url,
+                     MAX_CALLS_PER_SECOND=1_000, RATE_LIMIT_BURST=10, DECODE_OFFLOAD_MIN_BYTES=float("inf"),
+                     uk_boundary_polygon=box(ROOT[3], ROOT[1], ROOT[2], ROOT[0]))
+
+
+def bisect(db_path, date, predictor=None):
+    """Bisect ROOT for date; returns (API calls, splits without a call, leaves, crimes in leaves)."""
+    env = build_env(db_path)
+    predict_split = None
+    if predictor == "density predictor":
+        predict_split, _ = env["load_density_predictor"](date, ROOT)
+    api_call_counter, cache_hits, predicted_splits = [0], [0], [0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(env["process_area_async"](*ROOT, date, api_call_counter, [], cache_hits,
+                                              predict_split=predict_split, predicted_splits=predicted_splits))
+    env["ingest_writer"].flush()
+    leaves, crimes = env["conn"].execute(
+        "SELECT COUNT(*), SUM(crime_count) FROM crime_areas WHERE date = ?", (date,)
+    ).fetchone()
+    env["ingest_writer"].close()
+    env["conn"].close()
+    return api_call_counter[0], cache_hits[0] + predicted_splits[0], leaves, crimes
+
+
+def copy_db(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+# Spawned decode workers re-import this script: run only when executed
+if __name__ == "__main__":
+    # Start the stub before this process has any threads
+    url, stop_stub = start_stub(make_responder, process=True)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+        previous_db = Path(tmp) / "previous.db"
+        previous = bisect(previous_db, PREVIOUS)
+        for mode in ("no history", "density predictor"):
+            db_path = Path(tmp) / f"{mode.replace(' ', '_')}.db"
+            if mode != "no history":
+                copy_db(previous_db, db_path)
+            results[mode] = bisect(db_path, DATE, mode)
+        # Same-date rerun of the cold run with the month's leaves gone but its split decisions kept
+        db_path = Path(tmp) / "no_history.db"
+        with sqlite3.connect(db_path) as db_conn:
+            db_conn.execute("PRAGMA foreign_keys = OFF")
+            db_conn.execute("DELETE FROM crime_records WHERE area_id IN (SELECT id FROM crime_areas WHERE date = ?)",
+                            (DATE,))
+            db_conn.execute("DELETE FROM crime_areas WHERE date = ?", (DATE,))
+        results["rerun (split_cache)"] = bisect(db_path, DATE)
+    stop_stub()
+
+    crimes = {mode: result[3] for mode, result in results.items()}
+    assert len(set(crimes.values())) == 1, crimes
+
+    print(f"{PREVIOUS}: {previous[0]} API calls, {previous[2]} leaves; "
+          f"refreshing {DATE} ({results['no history'][3]:,} crimes)")
+    print("=" * 72)
+    print(f"{'mode':<20} {'API calls':>10} {'skipped':>8} {'leaves':>7} {'calls per leaf':>15}")
+    for mode, (calls, skipped, leaves, _) in results.items():
+        print(f"{mode:<20} {calls:>10} {skipped:>8} {leaves:>7} {calls / leaves:>15.2f}")
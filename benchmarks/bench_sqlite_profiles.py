@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark crime ingest throughput (crimes/second) under each SQLite profile.
+
+Replays the per-area write pattern against a fresh database per profile: one
+`area_cells`/`crime_areas` row plus `insert_crimes_batch` and a commit per
+area, using the notebook's own `database_connection_factory`, `database_setup` and
+`crime_insertion_functions` cells. The database lives next to this script so
+commits hit a real disk rather than tmpfs.
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+AREAS = 200
+CRIMES_PER_AREA = 250
+CATEGORIES = ["anti-social-behaviour", "burglary", "shoplifting", "vehicle-crime", "violent-crime"]
+
+
+def synthetic_area(area_index):
+    return [
+        {
+            "id": area_index * CRIMES_PER_AREA + i,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "month": "2024-01",
+            "location": {
+                "latitude": f"{51.5 + i * 1e-4:.6f}",
+                "longitude": f"{-0.1 - area_index * 1e-4:.6f}",
+                "street": {"name": "On or near High Street"},
+            },
+        }
+        for i in range(CRIMES_PER_AREA)
+    ]
+
+
+def ingest_rate(profile, db_path, areas):
+    _, factory = main.database_connection_factory.run(
+        DB_PATH=str(db_path), DB_PROFILE=profile, sqlite3=sqlite3
+    )
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    _, insertion = main.crime_insertion_functions.run(cursor=db["cursor"])
+    conn, cursor = db["conn"], db["cursor"]
+
+    start = time.perf_counter()
+    inserted = 0
+    for area_index, crimes in enumerate(areas):
+        cell_id = db["get_cell_id"]((51.5 + area_index, 51.5, -0.1, -0.2))
+        cursor.execute(
+            "INSERT INTO crime_areas (cell_id, crime_count, date) VALUES (?, ?, ?)",
+            (cell_id, len(crimes), "2024-01"),
+        )
+        inserted += insertion["insert_crimes_batch"](cursor.lastrowid, crimes)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return inserted / elapsed, elapsed
+
+
+areas = [synthetic_area(i) for i in range(AREAS)]
+_, factory = main.database_connection_factory.run(DB_PATH="", DB_PROFILE="fast", sqlite3=sqlite3)
+profiles = list(factory["DB_PROFILES"])
+
+print(f"Ingesting {AREAS} areas x {CRIMES_PER_AREA} crimes, one commit per area")
+print("=" * 60)
+
+rates = {}
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    for profile in profiles:
+        rates[profile], elapsed = ingest_rate(profile, Path(tmp) / f"{profile}.db", areas)
+        print(f"{profile:<10} {rates[profile]:>10,.0f} crimes/s  ({elapsed:.2f} s)")
+
+print("=" * 60)
+baseline = rates[profiles[0]]
+for profile in profiles[1:]:
+    print(f"{profile} vs {profiles[0]}: {rates[profile] / baseline:.1f}x")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark the summary display queries: GROUP BY views over crimes vs the
+materialised summary tables.
+
+Fills a database with MONTHS x AREAS_PER_MONTH areas of CRIMES_PER_AREA
+crimes, then times the three queries `get_summary_stats_display` runs,
+first against the original view definitions (aggregating the crimes table)
+and then against the notebook's views over the summary tables. Also reports
+the per-area cost the ingest writer pays in `refresh_area_summaries`.
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+MONTHS = 12
+AREAS_PER_MONTH = 300
+CRIMES_PER_AREA = 500
+CATEGORIES = ["anti-social-behaviour", "burglary", "criminal-damage-arson", "drugs", "other-theft",
+              "public-order", "robbery", "shoplifting", "vehicle-crime", "violent-crime"]
+
+# The original views, inlined, for comparison
+ORIGINAL_QUERIES = {
+    "monthly_totals": """
+        SELECT month, COUNT(*) as total_crimes, COUNT(DISTINCT category) as unique_categories,
+               COUNT(DISTINCT area_id) as areas_with_crimes
+        FROM crimes GROUP BY month ORDER BY month""",
+    "category_totals": """
+        SELECT category, COUNT(*) as total_crimes, COUNT(DISTINCT month) as months_present,
+               COUNT(DISTINCT area_id) as areas_affected, MIN(month), MAX(month)
+        FROM crimes GROUP BY category ORDER BY total_crimes DESC""",
+    "area_statistics": """
+        SELECT COUNT(*), SUM(actual_crime_count), MIN(earliest_crime), MAX(latest_crime) FROM (
+            SELECT ca.id, COUNT(c.id) as actual_crime_count, MIN(c.month) as earliest_crime,
+                   MAX(c.month) as latest_crime, COUNT(DISTINCT c.category), COUNT(DISTINCT c.month)
+            FROM crime_areas ca LEFT JOIN crimes c ON ca.id = c.area_id
+            GROUP BY ca.id)""",
+}
+MATERIALISED_QUERIES = {
+    "monthly_totals": "SELECT * FROM monthly_totals",
+    "category_totals": "SELECT * FROM category_totals",
+    "area_statistics": """
+        SELECT COUNT(*), SUM(actual_crime_count), MIN(earliest_crime), MAX(latest_crime)
+        FROM area_statistics""",
+}
+
+
+def build_database(db_path):
+    _, config = main.api_config.run()
+    _, constants = main.uk_boundary_constants.run()
+    _, factory = main.database_connection_factory.run(DB_PATH=str(db_path), DB_PROFILE="fast", sqlite3=sqlite3)
+    _, helpers = main.polygon_helper_functions.run()
+    _, quadtree = main.quadtree_key_functions.run(
+        QUADKEY_MAX_DEPTH=config["QUADKEY_MAX_DEPTH"], split_bounds_quad=helpers["split_bounds_quad"]
+    )
+    _, db = main.database_setup.run(
+        TEST_AREA_BOUNDS=constants["TEST_AREA_BOUNDS"],
+        connect_db=factory["connect_db"],
+        locate_cell=quadtree["locate_cell"],
+        parse_polygon_bounds=helpers["parse_polygon_bounds"],
+    )
+    conn, cursor = db["conn"], db["cursor"]
+    crime_id = 0
+    for month_index in range(MONTHS):
+        month = f"2024-{month_index + 1:02d}"
+        for area_index in range(AREAS_PER_MONTH):
+            cell_id = db["get_cell_id"]((51.0 + area_index * 1e-3, 51.0, 0.0, -0.001))
+            cursor.execute("INSERT INTO crime_areas (cell_id, crime_count, date) VALUES (?, ?, ?)",
+                           (cell_id, CRIMES_PER_AREA, month))
+            area_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO crimes (area_id, crime_id, category, month) VALUES (?, ?, ?, ?)",
+                [(area_id, str(crime_id + i), CATEGORIES[(crime_id + i) % len(CATEGORIES)], month)
+                 for i in range(CRIMES_PER_AREA)],
+            )
+            crime_id += CRIMES_PER_AREA
+    conn.commit()
+    _, views = main.create_database_views.run(cursor=cursor, conn=conn)
+    return conn, cursor
+
+
+def time_queries(conn, queries, repeats=3):
+    best = {}
+    for name, sql in queries.items():
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            times.append(time.perf_counter() - start)
+        best[name] = min(times)
+    return best
+
+
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    conn, cursor = build_database(Path(tmp) / "summary.db")
+    total = MONTHS * AREAS_PER_MONTH * CRIMES_PER_AREA
+    print(f"{total:,} crimes in {MONTHS * AREAS_PER_MONTH:,} areas over {MONTHS} months")
+    print("=" * 70)
+
+    # Importing the cell builds the summary tables for the existing crimes
+    start = time.perf_counter()
+    _, summary = main.summary_table_functions.run(conn=conn, cursor=cursor)
+    print(f"Initial build of summary tables: {time.perf_counter() - start:.2f} s")
+
+    before = time_queries(conn, ORIGINAL_QUERIES)
+    after = time_queries(conn, MATERIALISED_QUERIES)
+    for name in ORIGINAL_QUERIES:
+        print(f"{name:<18} views over crimes {before[name] * 1000:8.1f} ms | summary tables {after[name] * 1000:7.2f} ms")
+    print(f"{'display total':<18} views over crimes {sum(before.values()) * 1000:8.1f} ms | "
+          f"summary tables {sum(after.values()) * 1000:7.2f} ms")
+
+    # Per-area maintenance cost: drop areas' summaries and refresh them as a
+    # fresh ingest would, then roll back so the tables stay consistent
+    area_ids = [row[0] for row in cursor.execute("SELECT id FROM crime_areas LIMIT 200")]
+    cursor.executemany("DELETE FROM area_category_totals WHERE area_id = ?", [(a,) for a in area_ids])
+    start = time.perf_counter()
+    for area_id in area_ids:
+        summary["refresh_area_summaries"](area_id)
+    elapsed = time.perf_counter() - start
+    conn.rollback()
+    print(f"refresh_area_summaries: {elapsed / len(area_ids) * 1000:.2f} ms per {CRIMES_PER_AREA}-crime area")
+    print("=" * 70)
+    print(f"Rebuild drift check: {summary['rebuild_summary_tables']()}")
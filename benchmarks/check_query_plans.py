@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN QUERY PLAN regression check for the notebook's SQL.
+
+Runs the notebook's own cells against a small seeded database (ingest
+writer, area cache, density predictor, historical area loads, spatial
+queries, error log and the summary display, which is where the notebook
+reads the views) with a trace callback on every connection, then explains
+each distinct statement they issued. Exits non-zero if any plan scans a
+table that grows with the data: a bare `SCAN <table>`, or a `SCAN <table>
+USING [COVERING] INDEX`, which reads the whole index rather than seeking
+into it. Reports that read every row by design are listed in FULL_READS
+and printed with their reason instead of failing.
+
+The plans are checked twice: on a fresh database and after ANALYZE, since
+statistics can change the planner's choice. Pass -v to print every plan.
+"""
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from harness import run_cells  # noqa: E402
+
+DATES = [f"2023-{month:02d}" for month in range(1, 13)]
+DEPTH = 3
+CRIMES_PER_AREA = 20
+CATEGORIES = ["anti-social-behaviour", "burglary", "drugs", "shoplifting", "vehicle-crime"]
+VERBOSE = "-v" in sys.argv[1:]
+
+# Tables bounded by the number of root boxes, categories, months x
+# categories or one insert batch, rather than growing with the crime data
+BOUNDED_TABLES = {"area_roots", "crime_categories", "crime_staging", "month_totals", "month_category_totals"}
+# Statements (by prefix) whose scans stop early
+EARLY_EXIT = {
+    "SELECT EXISTS(": "stops at the first row",
+    "SELECT c.*, ca.date, ca.crime_count as area_crime_count": "newest rows in rowid order, stops at the LIMIT",
+    "SELECT * FROM api_error_log ORDER BY timestamp DESC LIMIT": "newest rows in index order, stops at the LIMIT",
+}
+# Statements (by prefix) that report on every row of a table by design
+FULL_READS = {
+    "SELECT error_type, COUNT(*) as error_count": "error summary over the whole log",
+    "SELECT MIN(ca.id), ca.cell_id": "load_existing_areas() lists every stored cell",
+    "SELECT COUNT(*) as total_areas": "summary display totals over every area",
+    "SELECT (SELECT COUNT(*) FROM crime_areas) as total_area_records": "summary display totals over every area",
+}
+EXPLAINED = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT\s+(OR\s+\w+\s+)?INTO\s+\w+\s*(\([^)]*\))?\s*SELECT)", re.I)
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+SUBQUERY = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)$")
+TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|JOIN|LEFT|INNER|ON|GROUP|ORDER|LIMIT|HAVING|USING)\b)(\w+))?", re.I)
+LITERALS = re.compile(r"'[^']*'|-?\b\d+(\.\d+)?(e[-+]?\d+)?\b")
+
+
+def seed_and_trace(db_path):
+    """Run the notebook cells, returning (checker connection, traced statements)."""
+    statements = []
+    tracing = threading.Event()
+
+    def trace(sql):
+        if tracing.is_set():
+            statements.append(sql)
+
+    env = run_cells("database_connection_factory", DB_PATH=str(db_path), DB_PROFILE="fast")
+    factory_connect_db = env["connect_db"]
+
+    def connect_db(*args, **kwargs):
+        db_conn = factory_connect_db(*args, **kwargs)
+        db_conn.set_trace_callback(trace)
+        return db_conn
+
+    run_cells("database_setup", "create_database_views", env=env, connect_db=connect_db)
+    conn, cursor = env["conn"], env["cursor"]
+
+    # Everything after schema setup and migrations is traced
+    tracing.set()
+    run_cells(
+        "cache_functions", "error_logging_functions", "crime_insertion_functions", "summary_table_functions",
+        "ingest_writer_functions", "density_prediction_functions", "run_state_functions",
+        "historical_data_functions", "database_summary_stats", "spatial_query_functions", env=env,
+    )
+    writer = env["ingest_writer"]
+
+    # Ingest a quadtree of leaves for each date through the writer
+    root_bounds = (51.7, 51.3, 0.3, -0.5)
+    root = env["root_cell"](env["get_root_id"](root_bounds))
+    level = [(root_bounds, root)]
+    for _ in range(DEPTH):
+        level = [child for bounds, cell in level for child in env["split_cell"](*bounds, cell)]
+    crime_id, crimes = 0, []
+    for date in DATES:
+        env["check_area_cached"](root, date)
+        # Each date is a checkpointed bisection run: split nodes, then leaves
+        run_id, _ = env["start_bisection_run"](root_bounds, date)
+        writer.submit_split(root_bounds, root, date, 503)
+        writer.submit_run_state(run_id, [(root_bounds, root, date, "split", None, False)] + [
+            (bounds, cell, date, "pending", None, True) for bounds, cell in level
+        ])
+        for leaf, (bounds, cell) in enumerate(level):
+            crimes = [{
+                "id": crime_id + i,
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "location": {"latitude": str(bounds[1] + 1e-4 * (i % 3)), "longitude": str(bounds[3]),
+                             "street": {"name": f"On or near Street {leaf}-{i % 3}"}},
+                "month": date,
+            } for i in range(CRIMES_PER_AREA)]
+            crime_id += CRIMES_PER_AREA
+            writer.submit(bounds, CRIMES_PER_AREA, date, crimes, cell, run_id)
+    writer.flush()
+
+    # A re-fetched area through the notebook cursor: every crime is already stored
+    env["insert_crimes_batch"](1, crimes)
+    conn.commit()
+
+    # Read paths
+    for date in DATES + ["2024-01"]:
+        env["check_area_cached"](root, date)
+        env["check_split_cached"](root, date)
+        env["has_leaves_under"](root, date)
+        env["get_cache_stats"](date)
+        env["load_density_predictor"](date)
+        env["load_density_predictor"](date, root_bounds)
+        env["load_existing_areas"](date)
+    env["start_bisection_run"](root_bounds, DATES[0])
+    env["load_run_frontier"](run_id)
+    env["load_run_leaves"](run_id)
+    env["get_run_progress"](run_id)
+    env["finish_run"](run_id)
+    env["load_leaves_under"](root)
+    env["load_leaves_under"](level[0][1], DATES[0])
+    env["load_existing_areas"]()
+    north, south, east, west = root_bounds
+    env["crimes_in_bbox"](north, south, east, west)
+    env["crimes_in_bbox"](north, south, east, west, month=DATES[0], limit=100)
+    env["nearest_crimes"](51.5, -0.1, k=5, month=DATES[0])
+    env["areas_in_bbox"](north, south, east, west, date=DATES[0])
+    env["hotspots_in_bbox"](north, south, east, west, month=DATES[0])
+    env["log_api_error"]("API_TIMEOUT", date_requested=DATES[0], error_message="timeout")
+    env["get_error_summary"]()
+    env["get_recent_errors"]()
+    env["get_summary_stats_display"]()
+    run_cells("crimes_data", env=env)
+
+    tracing.clear()
+    writer.close()
+    return conn, statements
+
+
+def scanned_tables(conn, sql, plan):
+    """Resolve the aliases in full SCAN lines to table names (through views too)."""
+    views = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'view'").fetchall())
+    text = sql + " ".join(definition for name, definition in views.items() if re.search(rf"\b{name}\b", sql))
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(text):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    subqueries = {match.group(1) for match in map(SUBQUERY.match, plan) if match}
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        # Scans of a view or subquery are reads of its already-planned
+        # results; skip the schema table
+        if (match and match.group(1) not in views and match.group(1) not in subqueries
+                and not match.group(1).startswith("sqlite_")):
+            yield aliases.get(match.group(1), match.group(1))
+
+
+def check_plans(conn, statements):
+    """Explain each distinct statement shape; returns the number of full scans found."""
+    seen, failures = set(), 0
+    for sql in statements:
+        if not EXPLAINED.match(sql):
+            continue
+        shape = " ".join(LITERALS.sub("?", sql).split())
+        if shape in seen:
+            continue
+        seen.add(shape)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        scans = [] if shape.startswith(tuple(EARLY_EXIT)) else [
+            table for table in scanned_tables(conn, sql, plan) if table not in BOUNDED_TABLES
+        ]
+        full_read = next((reason for prefix, reason in FULL_READS.items() if shape.startswith(prefix)), None)
+        if scans and full_read:
+            status, scans = f"full read: {full_read}", []
+        else:
+            status = "FULL SCAN " + ", ".join(scans) if scans else "ok"
+        failures += bool(scans)
+        print(f"[{status}] {shape[:110]}")
+        if scans or VERBOSE:
+            for detail in plan:
+                print(f"      {detail}")
+    print(f"{len(seen)} distinct statements, {failures} with full table scans")
+    return failures
+
+
+with tempfile.TemporaryDirectory(dir=Path(__file__).resolve().parent) as tmp:
+    conn, statements = seed_and_trace(Path(tmp) / "plans.db")
+    print("=" * 70)
+    print("Fresh database")
+    print("=" * 70)
+    failures = check_plans(conn, statements)
+    conn.execute("ANALYZE")
+    print("=" * 70)
+    print("After ANALYZE")
+    print("=" * 70)
+    failures += check_plans(conn, statements)
+    conn.close()
+
+sys.exit(1 if failures else 0)
@@ -0,0 +1,111 @@
+"""
+Shared scaffolding for the benchmarks: run notebook cells outside marimo and
+serve a local stub of the Police API.
+"""
+import multiprocessing
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import main  # noqa: E402
+
+API_PATH = "/api/crimes-street/all-crime"
+# Named notebook cells (anonymous `_` cells only display output)
+CELLS = {name: cell for name, cell in vars(main).items() if isinstance(cell, type(main.imports)) and name != "_"}
+DEFINED_BY = {name: cell for cell in CELLS.values() for name in cell.defs}
+
+
+def run_cells(*names, env=None, **overrides):
+    """
+    Run notebook cells outside marimo, after the cells they depend on.
+
+    Each reference is taken from `env` (which `overrides` are merged into) or
+    from the cell that defines it, run once. Overrides also replace the
+    cells' own definitions (e.g. DB_PATH from api_config), so every later
+    cell sees them.
+
+    Returns:
+        env: every definition so far, by name (pass it back to run more cells)
+    """
+    env = {} if env is None else env
+    env.update(overrides)
+
+    def run(cell):
+        for ref in sorted(cell.refs):
+            if ref not in env and ref in DEFINED_BY:
+                run(DEFINED_BY[ref])
+        _, defs = cell.run(**{ref: env[ref] for ref in cell.refs if ref in env})
+        env.update(defs)
+        env.update(overrides)
+
+    for name in names:
+        run(CELLS[name])
+    return env
+
+
+def polygon_bounds(poly):
+    """The `poly` query parameter ('lat,lon:lat,lon:...') -> (north, south, east, west)."""
+    lats, lons = zip(*(map(float, point.split(",")) for point in poly.split(":")))
+    return max(lats), min(lats), max(lons), min(lons)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers each GET with `server.respond(params)` -> (status_code, body)."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        status_code, body = self.server.respond(params)
+        self.send_response(status_code)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gone mid-response (e.g. a killed session)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 1_024  # Some fetchers connect for every area at once
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Killed clients reset their connections
+
+
+def _serve(make_responder, args, port_queue):
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    server.respond = make_responder(*args)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def start_stub(make_responder, *args, process=False):
+    """
+    Serve a stub of the API on localhost; returns (url, stop).
+
+    make_responder(*args) builds the stub's state and returns respond(params),
+    which gets the query's `date` and `poly` and returns (status_code, body
+    bytes). With process=True the stub is served from a forked process, so
+    serving does not compete for the benchmark's GIL; start it before the
+    benchmark has any threads.
+    """
+    if process:
+        context = multiprocessing.get_context("fork")
+        port_queue = context.Queue()
+        stub = context.Process(target=_serve, args=(make_responder, args, port_queue), daemon=True)
+        stub.start()
+        return f"http://127.0.0.1:{port_queue.get()}{API_PATH}", stub.terminate
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    server.respond = make_responder(*args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}{API_PATH}", server.shutdown
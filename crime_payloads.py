@@ -0,0 +1,98 @@
+"""
+Decoding and shaping of Police API crime payloads.
+
+Kept outside the notebook so the async fetchers' worker processes can import
+(and pickle) these: functions and classes defined in marimo cells cannot be
+sent to another process.
+"""
+import json
+
+
+class CrimeBatch:
+    """
+    Crimes from one API response, shaped for crime_records: one list per
+    column, each crime id once (the first occurrence), month as YYYYMM and
+    coordinates as integer microdegrees. Categories and streets stay as
+    names; the insert resolves them through their lookup tables.
+    """
+    __slots__ = ("crime_ids", "categories", "street_names", "months", "latitudes_e6", "longitudes_e6")
+
+    def __init__(self, crime_ids, categories, street_names, months, latitudes_e6, longitudes_e6):
+        self.crime_ids = crime_ids
+        self.categories = categories
+        self.street_names = street_names
+        self.months = months
+        self.latitudes_e6 = latitudes_e6
+        self.longitudes_e6 = longitudes_e6
+
+    def __len__(self):
+        return len(self.crime_ids)
+
+    def columns(self):
+        """The six column lists, in crime_records order."""
+        return (self.crime_ids, self.categories, self.street_names, self.months,
+                self.latitudes_e6, self.longitudes_e6)
+
+    def rows(self):
+        """(crime_id, category, street_name, month, latitude_e6, longitude_e6) tuples."""
+        return zip(*self.columns())
+
+    def take(self, indices):
+        """The crimes at `indices`, as a new batch."""
+        return CrimeBatch(*([column[i] for i in indices] for column in self.columns()))
+
+
+def month_number(month):
+    """'YYYY-MM' as the YYYYMM integer stored in crime_records (None if malformed)."""
+    if month and len(month) >= 7 and month[4] == '-' and month[:4].isdigit() and month[5:7].isdigit():
+        return int(month[:4]) * 100 + int(month[5:7])
+    return None
+
+
+def shape_crimes(crimes_data):
+    """
+    Shape API crime dictionaries into a CrimeBatch.
+
+    Crimes without an id are skipped; a repeated id keeps its first
+    occurrence. Malformed months and coordinates are stored as NULL.
+    """
+    seen = set()
+    month_numbers = {}  # A payload holds one or a few months
+    crime_ids, categories, street_names, months, latitudes_e6, longitudes_e6 = [], [], [], [], [], []
+    for crime in crimes_data or []:
+        crime_id = crime.get('id', None)
+        if crime_id is None or crime_id in seen:
+            continue
+        seen.add(crime_id)
+
+        location = crime.get('location') or {}
+        latitude = location.get('latitude')
+        longitude = location.get('longitude')
+        # Convert latitude/longitude (they come as strings) to microdegrees
+        try:
+            latitude = round(float(latitude) * 1_000_000) if latitude else None
+            longitude = round(float(longitude) * 1_000_000) if longitude else None
+        except (ValueError, TypeError):
+            latitude = None
+            longitude = None
+        month = crime.get('month', '')
+        if month not in month_numbers:
+            month_numbers[month] = month_number(month)
+
+        crime_ids.append(crime_id)
+        categories.append(crime.get('category', ''))
+        street_names.append((location.get('street') or {}).get('name', ''))
+        months.append(month_numbers[month])
+        latitudes_e6.append(latitude)
+        longitudes_e6.append(longitude)
+    return CrimeBatch(crime_ids, categories, street_names, months, latitudes_e6, longitudes_e6)
+
+
+def decode_crimes(content):
+    """
+    Decode an API response body into (crime_count, CrimeBatch).
+
+    crime_count is the number of crimes the API returned, before shaping.
+    """
+    crimes_data = json.loads(content)
+    return len(crimes_data), shape_crimes(crimes_data)
@@ -2,7 +2,8 @@
 # requires-python = ">=3.13"
 # dependencies = [
 #     "altair==6.0.0",
-#     "httpx==0.28.1",
+#     "httpx[http2]==0.28.1",
+#     "ijson==3.6.0",
 #     "polars==1.35.2",
 #     "pyarrow==22.0.0",
 #     "folium==0.20.0",
@@ -21,28 +22,73 @@ def imports():
     import marimo as mo
     import polars as pl
     import altair as alt
+    import atexit
+    import contextlib
     import httpx
+    import json
+    import numpy as np
     import sqlite3
+    import threading
     from pathlib import Path
     from datetime import datetime
-    from time import sleep
+    from time import monotonic, sleep
     import folium
+    import shapely
     from shapely.geometry import Polygon, box
     from shapely.ops import unary_union
+    from crime_payloads import CrimeBatch, decode_crimes, shape_crimes
     return (
+        CrimeBatch,
         Path,
         Polygon,
+        atexit,
         box,
+        contextlib,
+        datetime,
+        decode_crimes,
         folium,
         httpx,
+        json,
         mo,
+        monotonic,
+        np,
         pl,
+        shape_crimes,
+        shapely,
         sleep,
         sqlite3,
+        threading,
         unary_union,
     )
 
 
+@app.cell
+def resource_registry(atexit):
+    """Long-lived resources (clients, threads, pools) owned by notebook cells."""
+    live_resources = {}
+
+    def replace_resource(name, close):
+        """
+        Register the `close` callback of a cell's resource under `name`.
+
+        When the cell re-runs, the resource its previous run created is closed
+        first, so re-runs do not leak connections, threads or processes. The
+        latest one is closed when the notebook process exits.
+        """
+        previous_close = live_resources.pop(name, None)
+        if previous_close is not None:
+            atexit.unregister(previous_close)
+            try:
+                previous_close()
+            except Exception as e:
+                # A resource that already failed must not block its replacement
+                print(f"⚠ Closing the previous {name} failed: {e}")
+        live_resources[name] = close
+        atexit.register(close)
+
+    return (replace_resource,)
+
+
 @app.cell
 def configuration(mo):
     mo.md("""
@@ -66,19 +112,37 @@ def api_config():
     # API Configuration
     API_BASE_URL = "https://data.police.uk/api/crimes-street/all-crime"
     MAX_CALLS_PER_SECOND = 10
-    API_DELAY_SECONDS = 0.1  # Delay between API calls (10 calls/sec = 0.1s delay)
+    RATE_LIMIT_BURST = 1  # Token bucket capacity (1 = evenly spaced calls, never above quota)
+
+    # HTTP client settings (pooled sync client and the async engines' clients)
+    HTTP_TIMEOUT_SECONDS = 30.0
+    HTTP_USE_HTTP2 = True  # Multiplex requests over one TLS connection (requires h2)
+    HTTP_MAX_CONNECTIONS = 10
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
 
     # Crime count targets for bisection algorithm
     TARGET_MIN_CRIMES = 5000
     TARGET_MAX_CRIMES = 7500
     MAX_CRIMES_LIMIT = 10000  # API returns 403 if exceeded
 
+    # Retry / circuit breaker settings
+    MAX_RETRIES = 4  # Retries per request for throttled (429) and transient (5xx, timeout) failures
+    RETRY_BACKOFF_BASE_SECONDS = 0.5  # First backoff; doubles each attempt (with jitter)
+    RETRY_BACKOFF_MAX_SECONDS = 30.0  # Upper bound for backoff and Retry-After
+    CIRCUIT_BREAKER_THRESHOLD = 10  # Consecutive failed attempts before the run is aborted
+
     # Bisection algorithm settings
     MAX_RECURSION_DEPTH = 15  # Prevent infinite recursion
+    PREDICTIVE_SPLIT_SAFETY = 1.2  # Predicted count must exceed MAX_CRIMES_LIMIT by this factor to skip the call
+    QUADKEY_MAX_DEPTH = 30  # Depth capacity of quadtree cell keys (2 bits per level, fits SQLite INTEGER)
 
     # Database settings
     DB_PATH = "uk_crime_data.db"
-    BATCH_COMMIT_SIZE = 50  # Commit every N area inserts (if using batch mode)
+    DB_PROFILE = "fast"  # Connection pragmas: "rollback" (SQLite defaults), "wal", "fast" (see DB_PROFILES)
+    BATCH_COMMIT_SIZE = 50  # Ingest writer commits every N areas...
+    INGEST_COMMIT_INTERVAL_SECONDS = 1.0  # ...or after this long, whichever comes first
+    INGEST_QUEUE_MAX_AREAS = 100  # Fetchers wait when this many areas are queued for writing
 
     # Default dates for UI
     DEFAULT_BASE_DATE = "2025-09"  # Default base date for historical collection
@@ -86,7 +150,9 @@ def api_config():
     DEFAULT_END_DATE = "2024-01"
 
     # Boundary cache
-    BOUNDARY_CACHE_PATH = "uk_boundary_cache.pkl"
+    BOUNDARY_CACHE_PATH = "uk_boundary_cache.wkb"
+    BOUNDARY_CACHE_VERSION = 2  # Bump when the boundary build changes to invalidate old caches
+    BOUNDARY_LOD_TOLERANCES = (0.001, 0.005, 0.02)  # Simplified map levels, in degrees
 
     # GitHub GeoJSON sources for UK boundaries
     GITHUB_GB_BOUNDARY_URL = "https://raw.githubusercontent.com/martinjc/UK-GeoJSON/master/json/administrative/gb/lad.json"
@@ -94,16 +160,34 @@ def api_config():
 
     return (
         API_BASE_URL,
-        API_DELAY_SECONDS,
         BATCH_COMMIT_SIZE,
         BOUNDARY_CACHE_PATH,
+        BOUNDARY_CACHE_VERSION,
+        BOUNDARY_LOD_TOLERANCES,
+        CIRCUIT_BREAKER_THRESHOLD,
         DB_PATH,
+        DB_PROFILE,
         DEFAULT_BASE_DATE,
         DEFAULT_END_DATE,
         DEFAULT_START_DATE,
         GITHUB_GB_BOUNDARY_URL,
         GITHUB_NI_BOUNDARY_URL,
+        HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        HTTP_MAX_CONNECTIONS,
+        HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        HTTP_TIMEOUT_SECONDS,
+        HTTP_USE_HTTP2,
+        INGEST_COMMIT_INTERVAL_SECONDS,
+        INGEST_QUEUE_MAX_AREAS,
+        MAX_CALLS_PER_SECOND,
+        MAX_CRIMES_LIMIT,
         MAX_RECURSION_DEPTH,
+        MAX_RETRIES,
+        PREDICTIVE_SPLIT_SAFETY,
+        QUADKEY_MAX_DEPTH,
+        RATE_LIMIT_BURST,
+        RETRY_BACKOFF_BASE_SECONDS,
+        RETRY_BACKOFF_MAX_SECONDS,
         TARGET_MAX_CRIMES,
         TARGET_MIN_CRIMES,
     )
@@ -127,93 +211,221 @@ def uk_boundary_constants():
         "east": 1.76,
         "west": -8.18
     }
-    return UK_BOUNDS, UK_FULL_BOUNDS
+
+    # Bisection roots offered in the UI
+    TEST_AREA_BOUNDS = {
+        "small": {  # London area
+            "north": 51.7,
+            "south": 51.3,
+            "east": 0.3,
+            "west": -0.5
+        },
+        "medium": {  # South East England
+            "north": 52.0,
+            "south": 50.5,
+            "east": 1.5,
+            "west": -1.5
+        },
+        "large": UK_BOUNDS,        # England mainland
+        "full": UK_FULL_BOUNDS     # Full UK (England, Scotland, Wales, N. Ireland)
+    }
+    return TEST_AREA_BOUNDS, UK_BOUNDS, UK_FULL_BOUNDS
 
 
 @app.cell
-def boundary_cache_functions(Path):
-    """Functions for loading and saving boundary cache."""
-    import pickle
+def boundary_cache_functions(
+    BOUNDARY_CACHE_PATH,
+    BOUNDARY_CACHE_VERSION,
+    GITHUB_GB_BOUNDARY_URL,
+    GITHUB_NI_BOUNDARY_URL,
+    Path,
+    json,
+    shapely,
+):
+    """
+    Functions for loading and saving boundary cache.
+
+    File layout: one JSON header line (format, version, sources, sha256, size)
+    followed by the boundary as raw WKB. The payload is memory-mapped and
+    verified against the header hash before decoding.
+    """
+    import hashlib
+    import mmap
+    import os
+    from shapely.errors import GEOSException
+
+    CACHE_FORMAT = "uk-boundary-wkb"
+    CACHE_SOURCES = [GITHUB_GB_BOUNDARY_URL, GITHUB_NI_BOUNDARY_URL]
+
+    class BoundaryCacheError(ValueError):
+        """Boundary cache is stale (version/sources changed) or corrupt."""
+
+    def read_boundary_cache(cache_path):
+        """Validate and decode a boundary cache file. Raises BoundaryCacheError."""
+        with open(cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header_end = data.find(b"\n")
+            if header_end < 0:
+                raise BoundaryCacheError("missing header")
+            header = json.loads(data[:header_end])
+            if header.get("format") != CACHE_FORMAT or header.get("version") != BOUNDARY_CACHE_VERSION:
+                raise BoundaryCacheError(f"stale cache (version {header.get('version')}, expected {BOUNDARY_CACHE_VERSION})")
+            if header.get("sources") != CACHE_SOURCES:
+                raise BoundaryCacheError("stale cache (boundary sources changed)")
+
+            payload = memoryview(data)[header_end + 1:]
+            try:
+                if len(payload) != header.get("size") or hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+                    raise BoundaryCacheError("corrupt cache (size/hash mismatch)")
+                return shapely.from_wkb(bytes(payload))
+            finally:
+                payload.release()
 
     def load_boundary_from_cache():
         """Load UK boundary from disk cache. Returns polygon or None."""
-        cache_path = Path("uk_boundary_cache.pkl")
+        cache_path = Path(BOUNDARY_CACHE_PATH)
         if cache_path.exists():
             try:
                 print("Loading UK boundary from cache...")
-                with open(cache_path, "rb") as f:
-                    boundary = pickle.load(f)
+                boundary = read_boundary_cache(cache_path)
                 print("✓ Loaded UK boundary from cache (instant)")
                 return boundary
-            except Exception as e:
+            except (OSError, ValueError, GEOSException) as e:
+                # ValueError covers BoundaryCacheError and malformed JSON headers
                 print(f"⚠ Cache load failed: {e}, will fetch fresh data...")
                 return None
         return None
 
     def save_boundary_to_cache(boundary):
-        """Save UK boundary polygon to disk cache."""
-        cache_path = Path("uk_boundary_cache.pkl")
+        """Save UK boundary polygon to disk cache (written atomically)."""
+        cache_path = Path(BOUNDARY_CACHE_PATH)
+        payload = shapely.to_wkb(boundary)
+        header = {
+            "format": CACHE_FORMAT,
+            "version": BOUNDARY_CACHE_VERSION,
+            "sources": CACHE_SOURCES,
+            "size": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        }
+        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(boundary, f)
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
             print(f"✓ Saved boundary to cache: {cache_path}")
-        except Exception as e:
+        except OSError as e:
             print(f"⚠ Could not save cache: {e}")
     return load_boundary_from_cache, save_boundary_to_cache
 
 
 @app.cell
-def boundary_geojson_functions(Polygon):
-    """Functions for parsing GeoJSON boundary data."""
-    def extract_polygons_from_geojson(geojson_data):
-        """Extract polygon geometries from GeoJSON FeatureCollection."""
-        polygons = []
-        for feature in geojson_data['features']:
-            geom = feature['geometry']
-            if geom['type'] == 'Polygon':
-                coords = geom['coordinates'][0]
-                polygons.append(Polygon(coords))
-            elif geom['type'] == 'MultiPolygon':
-                for poly_coords in geom['coordinates']:
-                    polygons.append(Polygon(poly_coords[0]))
-        return polygons
-    return (extract_polygons_from_geojson,)
+def boundary_geojson_functions(np, shapely):
+    """
+    Streaming GeoJSON parsing for the boundary downloads.
+
+    Features are pulled one at a time from the response body with ijson, so the
+    multi-megabyte documents are never held in memory whole. Rings are kept as
+    coordinate arrays and every polygon (holes included) is built in a single
+    vectorised shapely call at the end.
+    """
+    import ijson
+    from itertools import chain
+
+    class ChunkReader:
+        """File-like view of an httpx byte stream for ijson's C reader."""
+
+        def __init__(self, chunks):
+            self.chunks = iter(chunks)
+
+        def read(self, size=-1):
+            # ijson probes with read(0) to detect bytes vs str
+            return next(self.chunks, b'') if size else b''
+
+    class PolygonAccumulator:
+        """Collects GeoJSON rings and builds all polygons in one pass."""
+
+        def __init__(self):
+            self.ring_coords = []  # (n, 2) array per ring
+            self.ring_polygon = []  # owning polygon index; first ring is the shell
+            self.polygon_count = 0
+
+        def add_feature(self, feature):
+            geom = feature.get('geometry') or {}
+            if geom.get('type') == 'Polygon':
+                parts = [geom['coordinates']]
+            elif geom.get('type') == 'MultiPolygon':
+                parts = geom['coordinates']
+            else:
+                return
+            for rings in parts:
+                if not rings:
+                    continue
+                for ring in rings:
+                    dims = len(ring[0])
+                    coords = np.fromiter(chain.from_iterable(ring), dtype=float, count=len(ring) * dims)
+                    self.ring_coords.append(coords.reshape(-1, dims)[:, :2])
+                    self.ring_polygon.append(self.polygon_count)
+                self.polygon_count += 1
+
+        def build(self):
+            """Return an array of shapely Polygons."""
+            if not self.ring_coords:
+                return np.empty(0, dtype=object)
+            ring_lengths = [len(coords) for coords in self.ring_coords]
+            rings = shapely.linearrings(
+                np.concatenate(self.ring_coords),
+                indices=np.repeat(np.arange(len(ring_lengths)), ring_lengths),
+            )
+            return shapely.polygons(rings, indices=self.ring_polygon)
+
+    def stream_polygons_from_geojson(client, url):
+        """Stream a GeoJSON FeatureCollection from url and return its polygons."""
+        accumulator = PolygonAccumulator()
+        with client.stream('GET', url) as response:
+            response.raise_for_status()
+            features = ijson.items(ChunkReader(response.iter_bytes()), 'features.item', use_float=True)
+            for feature in features:
+                accumulator.add_feature(feature)
+        return accumulator.build()
+    return (stream_polygons_from_geojson,)
 
 
 @app.cell
 def fetch_uk_boundary_from_github(
-    extract_polygons_from_geojson,
+    GITHUB_GB_BOUNDARY_URL,
+    GITHUB_NI_BOUNDARY_URL,
     httpx,
+    np,
+    stream_polygons_from_geojson,
     unary_union,
 ):
     """Fetch UK boundary data from GitHub GeoJSON repository."""
+    from concurrent.futures import ThreadPoolExecutor
+
     def fetch_boundary():
         """Fetch and merge GB + NI boundaries. Returns polygon or None."""
+        sources = {
+            "Great Britain": GITHUB_GB_BOUNDARY_URL,
+            "Northern Ireland": GITHUB_NI_BOUNDARY_URL,
+        }
         try:
             print("Fetching UK boundary data from GitHub...")
+            print(f"  - Streaming {', '.join(sources)} boundaries concurrently...")
 
-            # Fetch Great Britain (England, Scotland, Wales)
-            gb_url = "https://raw.githubusercontent.com/martinjc/UK-GeoJSON/master/json/administrative/gb/lad.json"
-            print("  - Fetching Great Britain boundaries...")
-            gb_response = httpx.get(gb_url, timeout=30.0)
-
-            # Fetch Northern Ireland
-            ni_url = "https://raw.githubusercontent.com/martinjc/UK-GeoJSON/master/json/administrative/ni/lgd.json"
-            print("  - Fetching Northern Ireland boundaries...")
-            ni_response = httpx.get(ni_url, timeout=30.0)
-
-            if gb_response.status_code != 200 or ni_response.status_code != 200:
-                raise Exception(f"Failed to fetch: GB={gb_response.status_code}, NI={ni_response.status_code}")
+            # Both downloads share one client and are parsed as they arrive
+            with httpx.Client(timeout=30.0, follow_redirects=True) as client, \
+                    ThreadPoolExecutor(max_workers=len(sources)) as pool:
+                futures = {
+                    name: pool.submit(stream_polygons_from_geojson, client, url)
+                    for name, url in sources.items()
+                }
+                polygons = {name: future.result() for name, future in futures.items()}
 
-            # Extract polygons from both datasets
-            gb_polygons = extract_polygons_from_geojson(gb_response.json())
-            print(f"  ✓ Loaded {len(gb_polygons)} Great Britain boundaries")
-
-            ni_polygons = extract_polygons_from_geojson(ni_response.json())
-            print(f"  ✓ Loaded {len(ni_polygons)} Northern Ireland boundaries")
+            for name, parts in polygons.items():
+                print(f"  ✓ Loaded {len(parts)} {name} boundaries")
 
             # Merge all polygons
-            all_polygons = gb_polygons + ni_polygons
+            all_polygons = np.concatenate(list(polygons.values()))
             boundary = unary_union(all_polygons)
             print(f"✓ Total: {len(all_polygons)} UK administrative boundaries (GB + NI)")
 
@@ -289,37 +501,437 @@ def uk_boundaries(
 
 
 @app.cell
-def database_setup(DB_PATH, sqlite3):
-    conn = sqlite3.connect(DB_PATH)
+def uk_boundary_lod(BOUNDARY_LOD_TOLERANCES, shapely, uk_boundary_polygon):
+    """
+    Level-of-detail pyramid of the UK boundary for map rendering.
+    Folium serialises every vertex it is given, so the map layer uses the
+    coarsest level whose tolerance is still below one pixel at the map's zoom.
+    Levels are simplified on first use, keeping notebook start-up unchanged.
+    """
+    from functools import cache
+
+    @cache
+    def simplified_boundary(tolerance):
+        return shapely.simplify(uk_boundary_polygon, tolerance)
+
+    def boundary_for_zoom(zoom):
+        """UK boundary simplified to the pixel size of a web-map zoom level."""
+        degrees_per_pixel = 360 / (256 * 2 ** zoom)
+        for tolerance in sorted(BOUNDARY_LOD_TOLERANCES, reverse=True):  # coarsest first
+            if tolerance <= degrees_per_pixel:
+                return simplified_boundary(tolerance)
+        return uk_boundary_polygon
+    return (boundary_for_zoom,)
+
+
+@app.cell
+def database_connection_factory(DB_PATH, DB_PROFILE, sqlite3):
+    """
+    SQLite connection factory with named pragma profiles.
+
+    - rollback: SQLite defaults (rollback journal, synchronous=FULL); every
+      commit fsyncs the journal and the database
+    - wal: write-ahead log, still synchronous=FULL; readers no longer block the
+      writer, but every commit still fsyncs the log
+    - fast: WAL with synchronous=NORMAL (fsync only at checkpoints; a power
+      loss can drop the last commits but never corrupts the database), plus a
+      memory-mapped read path, a 64 MB page cache and in-memory temp tables
+    """
+    DB_PROFILES = {
+        "rollback": {"journal_mode": "DELETE", "synchronous": "FULL"},
+        "wal": {"journal_mode": "WAL", "synchronous": "FULL"},
+        "fast": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,  # Negative = KiB
+            "temp_store": "MEMORY",
+        },
+    }
+
+    def connect_db(profile=None, db_path=None, **connect_kwargs):
+        """
+        Open a SQLite connection with a tuning profile applied.
+
+        Args:
+            profile: Key of DB_PROFILES (defaults to DB_PROFILE)
+            db_path: Database file (defaults to DB_PATH)
+            **connect_kwargs: Passed to sqlite3.connect (e.g. check_same_thread)
+        """
+        pragmas = DB_PROFILES[profile or DB_PROFILE]
+        db_conn = sqlite3.connect(db_path or DB_PATH, **connect_kwargs)
+        for name, value in pragmas.items():
+            db_conn.execute(f"PRAGMA {name} = {value}")
+        return db_conn
+    return DB_PROFILES, connect_db
+
+
+@app.cell
+def database_setup(
+    TEST_AREA_BOUNDS,
+    connect_db,
+    locate_cell,
+    parse_polygon_bounds,
+):
+    # 1: crime_areas references area_cells by integer id
+    # 2: area_cells carry quadtree keys (root_id, depth, quadkey)
+    # 3: crimes stored compactly in crime_records, read through the crimes view
+    SCHEMA_VERSION = 3
+
+    conn = connect_db()
     cursor = conn.cursor()
+    schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    # Create table for bisection root boxes; quadtree keys are relative to a root
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS area_roots (
+            id INTEGER PRIMARY KEY,
+            north REAL NOT NULL,
+            south REAL NOT NULL,
+            east REAL NOT NULL,
+            west REAL NOT NULL,
+            UNIQUE(north, south, east, west)
+        )
+    """)
 
-    # Create table for storing area polygons that meet our criteria
+    # Create table for the geometry of every area, keyed by integer id
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS crime_areas (
+        CREATE TABLE IF NOT EXISTS area_cells (
+            id INTEGER PRIMARY KEY,
+            north REAL NOT NULL,
+            south REAL NOT NULL,
+            east REAL NOT NULL,
+            west REAL NOT NULL,
+            root_id INTEGER REFERENCES area_roots(id),
+            depth INTEGER,
+            quadkey INTEGER,
+            UNIQUE(north, south, east, west)
+        )
+    """)
+    if "quadkey" not in [row[1] for row in cursor.execute("PRAGMA table_info(area_cells)")]:
+        for column in ("root_id INTEGER REFERENCES area_roots(id)", "depth INTEGER", "quadkey INTEGER"):
+            cursor.execute(f"ALTER TABLE area_cells ADD COLUMN {column}")
+
+    # Cache checks and "all leaves under a cell" range scans
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_area_cells_quadkey
+        ON area_cells(root_id, quadkey, depth)
+    """)
+
+    CRIME_AREAS_TABLE = """
+        CREATE TABLE IF NOT EXISTS {name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            polygon TEXT NOT NULL,
+            cell_id INTEGER NOT NULL,
             crime_count INTEGER NOT NULL,
             date TEXT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(polygon, date)
+            UNIQUE(cell_id, date),
+            FOREIGN KEY (cell_id) REFERENCES area_cells(id)
         )
-    """)
+    """
+
+    def get_root_id(bounds, db_cursor=None):
+        """Return the area_roots id for (north, south, east, west), registering and committing it if new."""
+        db_cursor = db_cursor or cursor
+        db_cursor.execute(
+            "INSERT OR IGNORE INTO area_roots (north, south, east, west) VALUES (?, ?, ?, ?)",
+            bounds
+        )
+        db_cursor.execute(
+            "SELECT id FROM area_roots WHERE north = ? AND south = ? AND east = ? AND west = ?",
+            bounds
+        )
+        root_id = db_cursor.fetchone()[0]
+        # Commit now so the ingest writer's connection can see the root
+        db_cursor.connection.commit()
+        return root_id
+
+    def get_cell_id(bounds, cell=None, db_cursor=None):
+        """
+        Return the area_cells id for (north, south, east, west), creating the row if needed.
+        cell is the quadtree key (root_id, depth, quadkey); it is recorded on cells that lack one.
+        """
+        db_cursor = db_cursor or cursor
+        root_id, depth, quadkey = cell or (None, None, None)
+        db_cursor.execute(
+            """INSERT INTO area_cells (north, south, east, west, root_id, depth, quadkey)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(north, south, east, west) DO UPDATE
+               SET root_id = excluded.root_id, depth = excluded.depth, quadkey = excluded.quadkey
+               WHERE area_cells.root_id IS NULL AND excluded.root_id IS NOT NULL""",
+            (*bounds, root_id, depth, quadkey)
+        )
+        db_cursor.execute(
+            "SELECT id FROM area_cells WHERE north = ? AND south = ? AND east = ? AND west = ?",
+            bounds
+        )
+        return db_cursor.fetchone()[0]
+
+    def migrate_polygon_areas():
+        """
+        Move crime_areas from the polygon TEXT key to integer area_cells ids.
+
+        Runs in one transaction: area ids (and so crimes.area_id) are kept, and
+        the views are dropped so create_database_views rebuilds them.
+        """
+        print("Migrating crime_areas to integer cell ids...")
+        conn.commit()
+        cursor.execute("BEGIN")
+        try:
+            views = cursor.execute("SELECT name FROM sqlite_master WHERE type = 'view'").fetchall()
+            for (view,) in views:
+                cursor.execute(f"DROP VIEW {view}")
+
+            cursor.execute("CREATE TEMP TABLE polygon_cells (polygon TEXT PRIMARY KEY, cell_id INTEGER)")
+            polygons = cursor.execute("SELECT DISTINCT polygon FROM crime_areas").fetchall()
+            for (polygon,) in polygons:
+                cell_id = get_cell_id(parse_polygon_bounds(polygon))
+                cursor.execute("INSERT INTO polygon_cells VALUES (?, ?)", (polygon, cell_id))
+
+            cursor.execute(CRIME_AREAS_TABLE.format(name="crime_areas_v1"))
+            cursor.execute("""
+                INSERT OR IGNORE INTO crime_areas_v1 (id, cell_id, crime_count, date, created_at)
+                SELECT ca.id, pc.cell_id, ca.crime_count, ca.date, ca.created_at
+                FROM crime_areas ca JOIN polygon_cells pc ON pc.polygon = ca.polygon
+                ORDER BY ca.id
+            """)
+            # Differently formatted strings for the same cell collapse into one area
+            cursor.execute("""
+                UPDATE crimes SET area_id = (
+                    SELECT kept.id
+                    FROM crime_areas old
+                    JOIN polygon_cells pc ON pc.polygon = old.polygon
+                    JOIN crime_areas_v1 kept ON kept.cell_id = pc.cell_id AND kept.date = old.date
+                    WHERE old.id = crimes.area_id
+                )
+                WHERE area_id NOT IN (SELECT id FROM crime_areas_v1)
+            """)
+            cursor.execute("DROP TABLE crime_areas")
+            cursor.execute("ALTER TABLE crime_areas_v1 RENAME TO crime_areas")
+            cursor.execute("DROP TABLE polygon_cells")
+            cursor.execute("PRAGMA user_version = 1")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"✓ Migrated {len(polygons)} polygons to area_cells")
+
+    def backfill_cell_keys():
+        """Give cells stored before quadtree keys existed a key under any UI test-area root that produces them."""
+        cells = cursor.execute("SELECT id, north, south, east, west FROM area_cells WHERE root_id IS NULL").fetchall()
+        if not cells:
+            return
+        roots = []
+        for b in TEST_AREA_BOUNDS.values():
+            root_bounds = (b["north"], b["south"], b["east"], b["west"])
+            roots.append((get_root_id(root_bounds), root_bounds))
+        keyed = 0
+        for cell_id, *bounds in cells:
+            for root_id, root_bounds in roots:
+                cell = locate_cell(root_id, root_bounds, bounds)
+                if cell is not None:
+                    cursor.execute(
+                        "UPDATE area_cells SET root_id = ?, depth = ?, quadkey = ? WHERE id = ?",
+                        (*cell, cell_id)
+                    )
+                    keyed += 1
+                    break
+        conn.commit()
+        print(f"✓ Added quadtree keys to {keyed} of {len(cells)} existing cells")
+
+    crime_areas_columns = [row[1] for row in cursor.execute("PRAGMA table_info(crime_areas)")]
+    if "polygon" in crime_areas_columns:
+        migrate_polygon_areas()
+    if schema_version < 2:
+        backfill_cell_keys()
+
+    # Create table for storing areas that meet our criteria
+    cursor.execute(CRIME_AREAS_TABLE.format(name="crime_areas"))
+
+    # Create lookup tables for the crime attributes repeated on every row
+    for table in ("crime_categories", "streets"):
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
 
-    # Create table for storing actual crime data
+    # Create table for storing actual crime data, compactly: category and
+    # street as lookup ids, month as YYYYMM and coordinates in microdegrees
+    # (the API's 6 decimal places). The crimes view decodes it.
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS crimes (
+        CREATE TABLE IF NOT EXISTS crime_records (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             area_id INTEGER,
-            crime_id TEXT UNIQUE,
-            category TEXT,
-            latitude REAL,
-            longitude REAL,
-            street_name TEXT,
-            month TEXT,
-            FOREIGN KEY (area_id) REFERENCES crime_areas(id)
+            crime_id INTEGER UNIQUE,
+            category_id INTEGER,
+            street_id INTEGER,
+            month INTEGER,
+            latitude_e6 INTEGER,
+            longitude_e6 INTEGER,
+            FOREIGN KEY (area_id) REFERENCES crime_areas(id),
+            FOREIGN KEY (category_id) REFERENCES crime_categories(id),
+            FOREIGN KEY (street_id) REFERENCES streets(id)
         )
     """)
 
+    # Encodings from the original crimes columns
+    MONTH_NUMBER_SQL = "CASE WHEN {0} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*' THEN CAST(substr({0}, 1, 4) || substr({0}, 6, 2) AS INTEGER) END"
+    MICRODEGREES_SQL = "CAST(round({0} * 1000000) AS INTEGER)"
+
+    def compact_crimes():
+        """
+        Move the crimes table into crime_records and the lookup tables.
+
+        Runs in one transaction and keeps crime ids, so crimes_rtree stays
+        valid; then VACUUMs to give the space back.
+        """
+        print("Compacting crimes storage...")
+        conn.commit()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("""
+                INSERT OR IGNORE INTO crime_categories (name)
+                SELECT DISTINCT category FROM crimes WHERE category IS NOT NULL
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO streets (name)
+                SELECT DISTINCT street_name FROM crimes WHERE street_name IS NOT NULL
+            """)
+            cursor.execute(f"""
+                INSERT INTO crime_records
+                    (id, area_id, crime_id, category_id, street_id, month, latitude_e6, longitude_e6)
+                SELECT c.id, c.area_id, c.crime_id, cat.id, s.id, {MONTH_NUMBER_SQL.format("c.month")},
+                       {MICRODEGREES_SQL.format("c.latitude")}, {MICRODEGREES_SQL.format("c.longitude")}
+                FROM crimes c
+                LEFT JOIN crime_categories cat ON cat.name = c.category
+                LEFT JOIN streets s ON s.name = c.street_name
+                ORDER BY c.id
+            """)
+            compacted = cursor.rowcount
+            cursor.execute("DROP TABLE crimes")
+            # Malformed months are not kept, so let summary_table_functions
+            # rebuild the summaries from crime_records
+            for table in ("area_category_totals", "area_totals", "month_category_totals", "month_totals"):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        cursor.execute("VACUUM")
+        print(f"✓ Compacted {compacted} crimes into crime_records")
+
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'crimes'")
+    if cursor.fetchone() == ("table",):
+        compact_crimes()
+
+    # Compatibility view with the original crimes columns. Inserts through it
+    # are encoded by the trigger; the notebook itself writes crime_records.
+    cursor.execute("""
+        CREATE VIEW IF NOT EXISTS crimes AS
+        SELECT
+            r.id,
+            r.area_id,
+            r.crime_id,
+            cat.name as category,
+            r.latitude_e6 / 1e6 as latitude,
+            r.longitude_e6 / 1e6 as longitude,
+            s.name as street_name,
+            CASE WHEN r.month IS NOT NULL THEN printf('%04d-%02d', r.month / 100, r.month % 100) END as month
+        FROM crime_records r
+        LEFT JOIN crime_categories cat ON cat.id = r.category_id
+        LEFT JOIN streets s ON s.id = r.street_id
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS crimes_insert INSTEAD OF INSERT ON crimes
+        BEGIN
+            INSERT OR IGNORE INTO crime_categories (name) SELECT NEW.category WHERE NEW.category IS NOT NULL;
+            INSERT OR IGNORE INTO streets (name) SELECT NEW.street_name WHERE NEW.street_name IS NOT NULL;
+            INSERT INTO crime_records
+                (id, area_id, crime_id, category_id, street_id, month, latitude_e6, longitude_e6)
+            VALUES (
+                NEW.id, NEW.area_id, NEW.crime_id,
+                (SELECT id FROM crime_categories WHERE name = NEW.category),
+                (SELECT id FROM streets WHERE name = NEW.street_name),
+                {MONTH_NUMBER_SQL.format("NEW.month")},
+                {MICRODEGREES_SQL.format("NEW.latitude")},
+                {MICRODEGREES_SQL.format("NEW.longitude")}
+            );
+        END
+    """)
+
+    # R*Tree spatial indexes on crime points (with the month as a third
+    # dimension) and area bounds, kept in sync by triggers. Skipped if this
+    # SQLite build lacks the rtree module; spatial_query_functions then
+    # falls back to plain range queries.
+    MONTH_INDEX_SQL = "COALESCE({0} / 100 * 12 + {0} % 100 - 1, -1)"
+    spatial_tables = {row[0] for row in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE name IN ('crimes_rtree', 'area_cells_rtree')"
+    )}
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS crimes_rtree
+            USING rtree(id, min_lat, max_lat, min_lon, max_lon, min_month, max_month)
+        """)
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS area_cells_rtree
+            USING rtree(id, south, north, west, east)
+        """)
+    except conn.OperationalError as e:
+        print(f"⚠ No R*Tree support in this SQLite build ({e}); spatial queries will scan")
+    else:
+        crime_point = "{0}.id, {0}.latitude_e6 / 1e6, {0}.latitude_e6 / 1e6, {0}.longitude_e6 / 1e6, {0}.longitude_e6 / 1e6, {1}, {1}"
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS crimes_rtree_insert AFTER INSERT ON crime_records
+            WHEN NEW.latitude_e6 IS NOT NULL AND NEW.longitude_e6 IS NOT NULL
+            BEGIN
+                INSERT INTO crimes_rtree VALUES ({crime_point.format("NEW", MONTH_INDEX_SQL.format("NEW.month"))});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS crimes_rtree_update
+            AFTER UPDATE OF latitude_e6, longitude_e6, month ON crime_records
+            BEGIN
+                DELETE FROM crimes_rtree WHERE id = OLD.id;
+                INSERT INTO crimes_rtree
+                SELECT {crime_point.format("NEW", MONTH_INDEX_SQL.format("NEW.month"))}
+                WHERE NEW.latitude_e6 IS NOT NULL AND NEW.longitude_e6 IS NOT NULL;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS crimes_rtree_delete AFTER DELETE ON crime_records
+            BEGIN
+                DELETE FROM crimes_rtree WHERE id = OLD.id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS area_cells_rtree_insert AFTER INSERT ON area_cells
+            BEGIN
+                INSERT INTO area_cells_rtree VALUES (NEW.id, NEW.south, NEW.north, NEW.west, NEW.east);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS area_cells_rtree_delete AFTER DELETE ON area_cells
+            BEGIN
+                DELETE FROM area_cells_rtree WHERE id = OLD.id;
+            END
+        """)
+
+        # Index rows stored before the spatial tables existed
+        if len(spatial_tables) < 2:
+            cursor.execute("DELETE FROM crimes_rtree")
+            cursor.execute(f"""
+                INSERT INTO crimes_rtree
+                SELECT {crime_point.format("crime_records", MONTH_INDEX_SQL.format("month"))}
+                FROM crime_records WHERE latitude_e6 IS NOT NULL AND longitude_e6 IS NOT NULL
+            """)
+            indexed_crimes = cursor.rowcount
+            cursor.execute("DELETE FROM area_cells_rtree")
+            cursor.execute("INSERT INTO area_cells_rtree SELECT id, south, north, west, east FROM area_cells")
+            if indexed_crimes or cursor.rowcount:
+                print(f"✓ Built spatial index for {indexed_crimes} crimes and {cursor.rowcount} cells")
+
     # Create table for error logging
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS api_error_log (
@@ -334,71 +946,189 @@ def database_setup(DB_PATH, sqlite3):
         )
     """)
 
-    # Create indexes for performance
+    # Create tables for checkpointed runs. A run is one bisection (root box,
+    # date) or historical backfill (base date, months); run_state holds its
+    # nodes: 'pending' (the frontier), 'split', 'leaf' or 'skipped'. Rows are
+    # written by the ingest writer, leaves in the same commit as their crimes.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS run_state (
+            run_id INTEGER NOT NULL,
+            cell_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            state TEXT NOT NULL,
+            crime_count INTEGER,
+            inland INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (run_id, cell_id, date),
+            FOREIGN KEY (run_id) REFERENCES runs(id),
+            FOREIGN KEY (cell_id) REFERENCES area_cells(id)
+        ) WITHOUT ROWID
+    """)
+
+    # Create table for split decisions: boxes the API showed must split for a
+    # date (503, too many crimes for one response), so reruns skip the call
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS split_cache (
+            date TEXT NOT NULL,
+            cell_id INTEGER NOT NULL,
+            status_code INTEGER NOT NULL,
+            PRIMARY KEY (date, cell_id),
+            FOREIGN KEY (cell_id) REFERENCES area_cells(id)
+        ) WITHOUT ROWID
+    """)
+
+    # Create indexes for the notebook's query mix (checked by
+    # benchmarks/check_query_plans.py). Monthly and category totals come
+    # from the summary tables, so crime_records has no single-column indexes.
+
+    # Per-area counts, the area cache load and refresh_area_summaries
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crime_records_area_category_month
+        ON crime_records(area_id, category_id, month)
+    """)
+
+    # crime_hotspots: grouped by area and location, covering category
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crime_records_area_location
+        ON crime_records(area_id, latitude_e6, longitude_e6, street_id, category_id)
+        WHERE latitude_e6 IS NOT NULL AND longitude_e6 IS NOT NULL
+    """)
+
+    # Per-date area loads (area cache, density predictor, historical fetches)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crime_areas_date
+        ON crime_areas(date, cell_id, crime_count)
+    """)
+
+    # Error log summary and most-recent listing
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_api_error_log_type
+        ON api_error_log(error_type, timestamp)
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_api_error_log_timestamp
+        ON api_error_log(timestamp)
+    """)
+
+    # Resuming a run: its frontier and its completed leaves (covering, so
+    # only nodes in the requested state are read)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_run_state_state
+        ON run_state(run_id, state, crime_count, inland)
+    """)
+
+    # Finding the unfinished run to resume
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_runs_kind
+        ON runs(kind, params, status)
+    """)
+
+    # Summary tables, maintained per ingested area (see summary_table_functions)
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_crimes_area_id
-        ON crimes(area_id)
+        CREATE TABLE IF NOT EXISTS area_category_totals (
+            area_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            month TEXT NOT NULL,
+            crime_count INTEGER NOT NULL,
+            PRIMARY KEY (area_id, category, month)
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS area_totals (
+            area_id INTEGER PRIMARY KEY,
+            crime_count INTEGER NOT NULL,
+            unique_categories INTEGER NOT NULL,
+            months_with_data INTEGER NOT NULL,
+            earliest_crime TEXT,
+            latest_crime TEXT
+        )
     """)
 
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_crimes_month
-        ON crimes(month)
+        CREATE TABLE IF NOT EXISTS month_category_totals (
+            month TEXT NOT NULL,
+            category TEXT NOT NULL,
+            crime_count INTEGER NOT NULL,
+            areas_affected INTEGER NOT NULL,
+            PRIMARY KEY (month, category)
+        ) WITHOUT ROWID
     """)
 
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_crimes_category
-        ON crimes(category)
+        CREATE TABLE IF NOT EXISTS month_totals (
+            month TEXT PRIMARY KEY,
+            total_crimes INTEGER NOT NULL,
+            areas_with_crimes INTEGER NOT NULL
+        )
     """)
 
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
-    return conn, cursor
+    return conn, cursor, get_cell_id, get_root_id
 
 
 @app.cell
 def create_database_views(cursor, conn):
     """Create database views for common queries."""
 
+    # The summary views read the materialised summary tables; drop older
+    # definitions that aggregated the crimes table directly (and the older
+    # crime_hotspots grouping that could not use idx_crimes_area_location)
+    for view in ("crime_summary", "monthly_totals", "category_totals", "area_statistics", "crime_hotspots"):
+        cursor.execute(f"DROP VIEW IF EXISTS {view}")
+
     # View: Crime summary by area, category, and month
     cursor.execute("""
         CREATE VIEW IF NOT EXISTS crime_summary AS
         SELECT
-            c.area_id,
+            t.area_id,
             ca.date as area_date,
-            ca.polygon,
-            c.category,
-            c.month,
-            COUNT(*) as crime_count,
-            COUNT(DISTINCT c.crime_id) as unique_crimes
-        FROM crimes c
-        LEFT JOIN crime_areas ca ON c.area_id = ca.id
-        GROUP BY c.area_id, ca.date, ca.polygon, c.category, c.month
+            ca.cell_id,
+            t.category,
+            t.month,
+            t.crime_count,
+            t.crime_count as unique_crimes
+        FROM area_category_totals t
+        LEFT JOIN crime_areas ca ON t.area_id = ca.id
     """)
 
     # View: Monthly totals across all areas
     cursor.execute("""
         CREATE VIEW IF NOT EXISTS monthly_totals AS
         SELECT
-            c.month,
-            COUNT(*) as total_crimes,
-            COUNT(DISTINCT c.category) as unique_categories,
-            COUNT(DISTINCT c.area_id) as areas_with_crimes
-        FROM crimes c
-        GROUP BY c.month
-        ORDER BY c.month
+            m.month,
+            m.total_crimes,
+            (SELECT COUNT(*) FROM month_category_totals mc WHERE mc.month = m.month) as unique_categories,
+            m.areas_with_crimes
+        FROM month_totals m
+        ORDER BY m.month
     """)
 
     # View: Category breakdown across all data
+    # (an area belongs to one date, so summing per-month area counts counts each area once)
     cursor.execute("""
         CREATE VIEW IF NOT EXISTS category_totals AS
         SELECT
-            c.category,
-            COUNT(*) as total_crimes,
-            COUNT(DISTINCT c.month) as months_present,
-            COUNT(DISTINCT c.area_id) as areas_affected,
-            MIN(c.month) as first_occurrence,
-            MAX(c.month) as last_occurrence
-        FROM crimes c
-        GROUP BY c.category
+            mc.category,
+            SUM(mc.crime_count) as total_crimes,
+            COUNT(*) as months_present,
+            SUM(mc.areas_affected) as areas_affected,
+            MIN(mc.month) as first_occurrence,
+            MAX(mc.month) as last_occurrence
+        FROM month_category_totals mc
+        GROUP BY mc.category
         ORDER BY total_crimes DESC
     """)
 
@@ -408,35 +1138,52 @@ def create_database_views(cursor, conn):
         SELECT
             ca.id as area_id,
             ca.date,
-            ca.polygon,
+            ca.cell_id,
+            cells.north,
+            cells.south,
+            cells.east,
+            cells.west,
             ca.crime_count as reported_count,
-            COUNT(c.id) as actual_crime_count,
-            COUNT(DISTINCT c.category) as unique_categories,
-            COUNT(DISTINCT c.month) as months_with_data,
-            MIN(c.month) as earliest_crime,
-            MAX(c.month) as latest_crime
+            COALESCE(t.crime_count, 0) as actual_crime_count,
+            COALESCE(t.unique_categories, 0) as unique_categories,
+            COALESCE(t.months_with_data, 0) as months_with_data,
+            t.earliest_crime,
+            t.latest_crime
         FROM crime_areas ca
-        LEFT JOIN crimes c ON ca.id = c.area_id
-        GROUP BY ca.id, ca.date, ca.polygon, ca.crime_count
+        JOIN area_cells cells ON cells.id = ca.cell_id
+        LEFT JOIN area_totals t ON t.area_id = ca.id
     """)
 
     # View: Crime hotspots (areas with highest crime rates)
+    # (an area has one date, so grouping by area_id alone keeps the index order)
+    # (grouped on the stored integer columns, decoded afterwards)
     cursor.execute("""
         CREATE VIEW IF NOT EXISTS crime_hotspots AS
         SELECT
-            c.area_id,
+            h.area_id,
             ca.date as area_date,
-            c.latitude,
-            c.longitude,
-            c.street_name,
-            COUNT(*) as crime_count,
-            GROUP_CONCAT(DISTINCT c.category) as crime_types
-        FROM crimes c
-        LEFT JOIN crime_areas ca ON c.area_id = ca.id
-        WHERE c.latitude IS NOT NULL AND c.longitude IS NOT NULL
-        GROUP BY c.area_id, ca.date, c.latitude, c.longitude, c.street_name
-        HAVING crime_count > 1
-        ORDER BY crime_count DESC
+            h.latitude_e6 / 1e6 as latitude,
+            h.longitude_e6 / 1e6 as longitude,
+            s.name as street_name,
+            h.crime_count,
+            h.crime_types
+        FROM (
+            SELECT
+                r.area_id,
+                r.latitude_e6,
+                r.longitude_e6,
+                r.street_id,
+                COUNT(*) as crime_count,
+                GROUP_CONCAT(DISTINCT cat.name) as crime_types
+            FROM crime_records r
+            LEFT JOIN crime_categories cat ON cat.id = r.category_id
+            WHERE r.latitude_e6 IS NOT NULL AND r.longitude_e6 IS NOT NULL
+            GROUP BY r.area_id, r.latitude_e6, r.longitude_e6, r.street_id
+            HAVING crime_count > 1
+        ) h
+        LEFT JOIN crime_areas ca ON h.area_id = ca.id
+        LEFT JOIN streets s ON s.id = h.street_id
+        ORDER BY h.crime_count DESC
     """)
 
     conn.commit()
@@ -445,18 +1192,146 @@ def create_database_views(cursor, conn):
 
 
 @app.cell
-def cache_functions(cursor):
-    def check_area_cached(polygon_str, date):
+def cache_functions(connect_db, cursor, descendant_range, threading):
+    """
+    Per-date in-memory index of stored areas and split decisions.
+
+    A date is loaded on first use with one aggregate query (and one on
+    split_cache) and then kept in sync by the ingest writer after each
+    commit, so cache checks in the bisection engines and the historical
+    fetchers never go to SQLite.
+    """
+    from bisect import bisect_right, insort
+
+    class AreaCache:
+        def __init__(self):
+            # Own connection so any thread (async engines, ingest writer) can use the cache
+            self.conn = connect_db(check_same_thread=False)
+            self.lock = threading.Lock()
+            self.dates = {}
+
+        def _index(self, date):
+            """Index for `date`, loading it on first use. Caller holds the lock."""
+            index = self.dates.get(date)
+            if index is None:
+                index = {'areas': {}, 'cells': {}, 'quadkeys': {}, 'splits': {}}
+                rows = self.conn.execute(
+                    """SELECT ca.cell_id, c.root_id, c.depth, c.quadkey, ca.id, ca.crime_count,
+                              (SELECT COUNT(*) FROM crime_records cr WHERE cr.area_id = ca.id)
+                       FROM crime_areas ca
+                       JOIN area_cells c ON c.id = ca.cell_id
+                       WHERE ca.date = ?""",
+                    (date,)
+                ).fetchall()
+                for cell_id, root_id, depth, quadkey, area_id, crime_count, stored_crimes in rows:
+                    cell = (root_id, depth, quadkey) if root_id is not None else None
+                    self._add(index, cell_id, cell, area_id, crime_count, stored_crimes)
+                splits = self.conn.execute(
+                    """SELECT c.root_id, c.depth, c.quadkey, sc.status_code
+                       FROM split_cache sc JOIN area_cells c ON c.id = sc.cell_id
+                       WHERE sc.date = ? AND c.root_id IS NOT NULL""",
+                    (date,)
+                ).fetchall()
+                for root_id, depth, quadkey, status_code in splits:
+                    index['splits'][(root_id, depth, quadkey)] = status_code
+                self.dates[date] = index
+            return index
+
+        def _add(self, index, cell_id, cell, area_id, crime_count, stored_crimes):
+            index['areas'][cell_id] = (area_id, crime_count, stored_crimes)
+            if cell is not None and cell not in index['cells']:
+                root_id, depth, quadkey = cell
+                index['cells'][cell] = crime_count
+                insort(index['quadkeys'].setdefault(root_id, []), (quadkey, depth))
+
+        def crime_count(self, cell, date):
+            with self.lock:
+                return self._index(date)['cells'].get(cell)
+
+        def split(self, cell, date):
+            """Status code that split the cell for this date, or None."""
+            with self.lock:
+                return self._index(date)['splits'].get(cell)
+
+        def area(self, cell_id, date):
+            """(area_id, crime_count, stored_crimes) for an area_cells id, or None."""
+            with self.lock:
+                return self._index(date)['areas'].get(cell_id)
+
+        def has_leaves_under(self, cell, date):
+            root_id, depth, quadkey = cell
+            _, end = descendant_range(cell)
+            with self.lock:
+                keys = self._index(date)['quadkeys'].get(root_id, [])
+                # Descendants sort right after the cell itself: quadkey >= the cell's, deeper
+                idx = bisect_right(keys, (quadkey, depth))
+                return idx < len(keys) and keys[idx][0] < end
+
+        def record(self, areas):
+            """
+            Apply committed writes: (date, cell_id, cell, area_id, crime_count, inserted_crimes).
+            Dates not loaded yet are skipped; they will read the committed rows on load.
+            """
+            with self.lock:
+                for date, cell_id, cell, area_id, crime_count, inserted in areas:
+                    index = self.dates.get(date)
+                    if index is None:
+                        continue
+                    existing = index['areas'].get(cell_id)
+                    if existing is not None:
+                        area_id, crime_count, stored_crimes = existing
+                        inserted += stored_crimes
+                    self._add(index, cell_id, cell, area_id, crime_count, inserted)
+
+        def record_splits(self, splits):
+            """Apply committed split decisions: (date, cell, status_code)."""
+            with self.lock:
+                for date, cell, status_code in splits:
+                    index = self.dates.get(date)
+                    if index is not None and cell is not None:
+                        index['splits'][cell] = status_code
+
+    area_cache = AreaCache()
+
+    def check_area_cached(cell, date):
         """
         Check if area already processed for this date.
+        cell is the quadtree key (root_id, depth, quadkey).
         Returns crime_count if cached, None otherwise.
         """
-        cursor.execute(
-            "SELECT crime_count FROM crime_areas WHERE polygon = ? AND date = ?",
-            (polygon_str, date)
+        return area_cache.crime_count(cell, date)
+
+    def check_split_cached(cell, date):
+        """
+        Check if the cell was split for this date in an earlier run.
+        Returns the status code that split it, or None.
+        """
+        return area_cache.split(cell, date)
+
+    def has_leaves_under(cell, date):
+        """True if an area strictly below `cell` is stored for this date, i.e. the cell was split before."""
+        return area_cache.has_leaves_under(cell, date)
+
+    def load_leaves_under(cell, date=None, db_cursor=None):
+        """
+        All stored areas at or below a quadtree cell (one range scan on quadkey).
+
+        Returns:
+            List of (area_id, (root_id, depth, quadkey), (north, south, east, west), date, crime_count)
+        """
+        root_id, depth, _ = cell
+        start, end = descendant_range(cell)
+        db_cursor = db_cursor or cursor
+        db_cursor.execute(
+            """SELECT ca.id, c.depth, c.quadkey, c.north, c.south, c.east, c.west, ca.date, ca.crime_count
+               FROM area_cells c JOIN crime_areas ca ON ca.cell_id = c.id
+               WHERE c.root_id = ? AND c.quadkey >= ? AND c.quadkey < ? AND c.depth >= ?
+                 AND (? IS NULL OR ca.date = ?)
+               ORDER BY c.quadkey, c.depth""",
+            (root_id, start, end, depth, date, date)
         )
-        result = cursor.fetchone()
-        return result[0] if result else None
+        return [(area_id, (root_id, leaf_depth, quadkey), (n, s, e, w), leaf_date, count)
+                for area_id, leaf_depth, quadkey, n, s, e, w, leaf_date, count in db_cursor.fetchall()]
 
     def get_cache_stats(date):
         """Get statistics about cached areas for a date."""
@@ -466,13 +1341,23 @@ def cache_functions(cursor):
         )
         result = cursor.fetchone()
         return {"areas": result[0] or 0, "total_crimes": result[1] or 0}
-    return (check_area_cached,)
+    return (
+        area_cache,
+        check_area_cached,
+        check_split_cached,
+        has_leaves_under,
+        load_leaves_under,
+    )
 
 
 @app.cell
-def error_logging_functions(cursor, conn):
+def error_logging_functions(conn, connect_db, cursor, threading):
     """Functions for logging and viewing API errors."""
 
+    # Dedicated connection so fetchers running in run_async threads can log too
+    error_log_conn = connect_db(check_same_thread=False)
+    error_log_lock = threading.Lock()
+
     def log_api_error(error_type, status_code=None, date_requested=None,
                      polygon=None, error_message=None, recursion_depth=None):
         """
@@ -486,13 +1371,14 @@ def error_logging_functions(cursor, conn):
             error_message: Detailed error message
             recursion_depth: Current recursion depth when error occurred
         """
-        cursor.execute(
-            """INSERT INTO api_error_log
-               (error_type, status_code, date_requested, polygon, error_message, recursion_depth)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (error_type, status_code, date_requested, polygon, error_message, recursion_depth)
-        )
-        conn.commit()
+        with error_log_lock:
+            error_log_conn.execute(
+                """INSERT INTO api_error_log
+                   (error_type, status_code, date_requested, polygon, error_message, recursion_depth)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (error_type, status_code, date_requested, polygon, error_message, recursion_depth)
+            )
+            error_log_conn.commit()
 
     def get_error_summary():
         """Get summary of errors by type."""
@@ -528,69 +1414,827 @@ def error_logging_functions(cursor, conn):
 
 
 @app.cell
-def crime_insertion_functions(conn, cursor):
-    def insert_crimes_batch(area_id, crimes_data):
+def crime_insertion_functions(CrimeBatch, cursor, shape_crimes):
+    """
+    Shared insert path for API crimes.
+
+    A shaped batch is staged in a per-connection temp table and loaded with
+    set-based statements: one INSERT ... SELECT per lookup table and one
+    into crime_records.
+    """
+    def insert_crimes_batch(area_id, crimes_data, db_cursor=None):
         """
-        Insert individual crime records into the crimes table.
+        Insert individual crime records into crime_records, encoding categories
+        and streets through their lookup tables.
+        Does not commit; the caller (normally the ingest writer) owns the transaction,
+        and errors propagate so it can roll back the area with its crimes.
 
         Args:
             area_id: The area_id from crime_areas table
-            crimes_data: List of crime dictionaries from API response
+            crimes_data: CrimeBatch, or a list of crime dictionaries from an
+                API response (shaped here)
+            db_cursor: Cursor to write through (defaults to the notebook cursor)
 
         Returns:
             Number of crimes inserted (may be less than total if duplicates exist)
         """
         if not crimes_data:
             return 0
+        if not isinstance(crimes_data, CrimeBatch):
+            crimes_data = shape_crimes(crimes_data)
+        db_cursor = db_cursor or cursor
+
+        # Stage the batch, then load it with INSERT OR IGNORE ... SELECT to handle duplicates
+        db_cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS crime_staging (
+                crime_id INTEGER,
+                category TEXT,
+                street_name TEXT,
+                month INTEGER,
+                latitude_e6 INTEGER,
+                longitude_e6 INTEGER
+            )
+        """)
+        db_cursor.execute("DELETE FROM crime_staging")
+        db_cursor.executemany("INSERT INTO crime_staging VALUES (?, ?, ?, ?, ?, ?)", crimes_data.rows())
+        db_cursor.execute("""
+            INSERT OR IGNORE INTO crime_categories (name)
+            SELECT DISTINCT category FROM crime_staging WHERE category IS NOT NULL
+        """)
+        db_cursor.execute("""
+            INSERT OR IGNORE INTO streets (name)
+            SELECT DISTINCT street_name FROM crime_staging WHERE street_name IS NOT NULL
+        """)
+        db_cursor.execute(
+            """INSERT OR IGNORE INTO crime_records
+               (area_id, crime_id, category_id, street_id, month, latitude_e6, longitude_e6)
+               SELECT ?, s.crime_id, cat.id, st.id, s.month, s.latitude_e6, s.longitude_e6
+               FROM crime_staging s
+               LEFT JOIN crime_categories cat ON cat.name = s.category
+               LEFT JOIN streets st ON st.name = s.street_name
+               WHERE NOT EXISTS (SELECT 1 FROM crime_records r WHERE r.crime_id = s.crime_id)""",
+            (area_id,)
+        )
+        return db_cursor.rowcount
+    return (insert_crimes_batch,)
 
-        # Prepare batch insert data
-        crime_records = []
-        for crime in crimes_data:
-            # Extract data from API response
-            crime_id = crime.get('id', None)
-            if crime_id is None:
-                # Skip crimes without ID
-                continue
 
-            category = crime.get('category', '')
-            location = crime.get('location', {})
-            latitude = location.get('latitude')
-            longitude = location.get('longitude')
-            street_name = location.get('street', {}).get('name', '')
-            month = crime.get('month', '')
+@app.cell
+def summary_table_functions(conn, cursor):
+    """
+    Materialised aggregates behind the summary views.
+
+    area_category_totals holds per-area (category, month) crime counts;
+    area_totals, month_category_totals and month_totals are kept in step by
+    applying the per-area deltas. The ingest writer refreshes each area in
+    the same transaction as its crimes, so the summary display reads a few
+    small tables instead of re-aggregating the crimes table.
+    """
+    SUMMARY_TABLES = ("area_category_totals", "area_totals", "month_category_totals", "month_totals")
+
+    # (category, month, count) per area from crime_records: counted on the
+    # stored ids through the covering index, then decoded. A missing category
+    # or month counts as '', as in the crimes table before compaction.
+    AREA_COUNTS_SQL = """
+        SELECT r.area_id, COALESCE(cat.name, ''),
+               COALESCE(CASE WHEN r.month IS NOT NULL THEN printf('%04d-%02d', r.month / 100, r.month % 100) END, ''),
+               SUM(r.crime_count)
+        FROM (
+            SELECT area_id, category_id, month, COUNT(*) as crime_count
+            FROM crime_records WHERE {0}
+            GROUP BY area_id, category_id, month
+        ) r
+        LEFT JOIN crime_categories cat ON cat.id = r.category_id
+        GROUP BY 1, 2, 3
+    """
 
-            # Convert latitude/longitude to float (they come as strings)
-            try:
-                latitude = float(latitude) if latitude else None
-                longitude = float(longitude) if longitude else None
-            except (ValueError, TypeError):
-                latitude = None
-                longitude = None
-
-            crime_records.append((
-                area_id,
-                crime_id,
-                category,
-                latitude,
-                longitude,
-                street_name,
-                month
-            ))
+    def refresh_area_summaries(area_id, db_cursor=None):
+        """Bring every summary table in line with the crimes stored for one area. Does not commit."""
+        db_cursor = db_cursor or cursor
+        db_cursor.execute(
+            "SELECT category, month, crime_count FROM area_category_totals WHERE area_id = ?",
+            (area_id,)
+        )
+        old = {(category, month): count for category, month, count in db_cursor.fetchall()}
+        db_cursor.execute(AREA_COUNTS_SQL.format("area_id = ?"), (area_id,))
+        new = {(category, month): count for _, category, month, count in db_cursor.fetchall()}
+        if new == old:
+            return
+
+        db_cursor.execute("DELETE FROM area_category_totals WHERE area_id = ?", (area_id,))
+        db_cursor.executemany(
+            "INSERT INTO area_category_totals (area_id, category, month, crime_count) VALUES (?, ?, ?, ?)",
+            [(area_id, category, month, count) for (category, month), count in new.items()]
+        )
+        db_cursor.execute("DELETE FROM area_totals WHERE area_id = ?", (area_id,))
+        if new:
+            months = {month for _, month in new}
+            db_cursor.execute(
+                """INSERT INTO area_totals
+                   (area_id, crime_count, unique_categories, months_with_data, earliest_crime, latest_crime)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (area_id, sum(new.values()), len({category for category, _ in new}), len(months), min(months), max(months))
+            )
+
+        # Apply this area's deltas to the month-level tables
+        month_before, month_after = {}, {}
+        for key in old.keys() | new.keys():
+            category, month = key
+            before, after = old.get(key, 0), new.get(key, 0)
+            month_before[month] = month_before.get(month, 0) + before
+            month_after[month] = month_after.get(month, 0) + after
+            db_cursor.execute(
+                """INSERT INTO month_category_totals (month, category, crime_count, areas_affected)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(month, category) DO UPDATE SET
+                   crime_count = crime_count + excluded.crime_count,
+                   areas_affected = areas_affected + excluded.areas_affected""",
+                (month, category, after - before, (after > 0) - (before > 0))
+            )
+            if not after:
+                db_cursor.execute(
+                    "DELETE FROM month_category_totals WHERE month = ? AND category = ? AND crime_count = 0",
+                    (month, category)
+                )
+        for month, after in month_after.items():
+            before = month_before[month]
+            db_cursor.execute(
+                """INSERT INTO month_totals (month, total_crimes, areas_with_crimes) VALUES (?, ?, ?)
+                   ON CONFLICT(month) DO UPDATE SET
+                   total_crimes = total_crimes + excluded.total_crimes,
+                   areas_with_crimes = areas_with_crimes + excluded.areas_with_crimes""",
+                (month, after - before, (after > 0) - (before > 0))
+            )
+            if not after:
+                db_cursor.execute("DELETE FROM month_totals WHERE month = ? AND total_crimes = 0", (month,))
+
+    def rebuild_summary_tables():
+        """
+        Recompute every summary table from crime_records in one transaction.
+        Flush the ingest writer first so nothing is written concurrently.
 
-        # Batch insert with INSERT OR IGNORE to handle duplicates
+        Returns:
+            {table: number of rows that differed from the incrementally maintained copy}
+        """
+        drift = {}
+        conn.commit()
         try:
+            for table in SUMMARY_TABLES:
+                cursor.execute(f"CREATE TEMP TABLE previous_{table} AS SELECT * FROM {table}")
+                cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                "INSERT INTO area_category_totals (area_id, category, month, crime_count)"
+                + AREA_COUNTS_SQL.format("area_id IS NOT NULL")
+            )
+            cursor.execute("""
+                INSERT INTO area_totals
+                    (area_id, crime_count, unique_categories, months_with_data, earliest_crime, latest_crime)
+                SELECT area_id, SUM(crime_count), COUNT(DISTINCT category), COUNT(DISTINCT month), MIN(month), MAX(month)
+                FROM area_category_totals GROUP BY area_id
+            """)
+            cursor.execute("""
+                INSERT INTO month_category_totals (month, category, crime_count, areas_affected)
+                SELECT month, category, SUM(crime_count), COUNT(*)
+                FROM area_category_totals GROUP BY month, category
+            """)
+            cursor.execute("""
+                INSERT INTO month_totals (month, total_crimes, areas_with_crimes)
+                SELECT month, SUM(crime_count), COUNT(DISTINCT area_id)
+                FROM area_category_totals GROUP BY month
+            """)
+            for table in SUMMARY_TABLES:
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM (
+                        SELECT * FROM (SELECT * FROM {table} EXCEPT SELECT * FROM previous_{table})
+                        UNION ALL
+                        SELECT * FROM (SELECT * FROM previous_{table} EXCEPT SELECT * FROM {table})
+                    )
+                """)
+                drift[table] = cursor.fetchone()[0]
+                cursor.execute(f"DROP TABLE previous_{table}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return drift
+
+    # Databases from before the summary tables existed: populate them once
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM crime_records), EXISTS(SELECT 1 FROM area_category_totals)")
+    has_crimes, has_summaries = cursor.fetchone()
+    if has_crimes and not has_summaries:
+        print("Building summary tables from existing crimes...")
+        rebuild_summary_tables()
+    return rebuild_summary_tables, refresh_area_summaries
+
+
+@app.cell
+def spatial_query_functions(cursor, np):
+    """
+    Bounding box, radius and nearest-neighbour queries over stored crimes and areas.
+
+    Backed by the crimes_rtree and area_cells_rtree R*Tree indexes created in
+    database_setup. R*Tree coordinates are 32-bit floats rounded outwards, so
+    candidates are re-checked against the exact columns.
+    """
+    METRES_PER_DEGREE = 111_320  # One degree of latitude; longitude scales with cos(latitude)
+    MAX_SEARCH_RADIUS_M = 2_000_000  # nearest_crimes gives up beyond this (covers the UK)
+
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name IN ('crimes_rtree', 'area_cells_rtree')")
+    has_spatial_index = cursor.fetchone()[0] == 2
+
+    def crime_month_index(month):
+        """'YYYY-MM' -> year * 12 + month - 1, the crimes_rtree month dimension."""
+        year, month_number = map(int, month.split('-'))
+        return year * 12 + month_number - 1
+
+    def crime_box_clause(north, south, east, west, month=None):
+        """FROM/WHERE clause and parameters selecting crimes `c` inside a box (and month)."""
+        if has_spatial_index:
+            # CROSS JOIN keeps the R*Tree as the outer loop; with ANALYZE statistics
+            # the planner would otherwise drive the join from a scan of crime_records
+            clause = """FROM crimes_rtree rt CROSS JOIN crimes c ON c.id = rt.id
+                        WHERE rt.min_lat <= ? AND rt.max_lat >= ? AND rt.min_lon <= ? AND rt.max_lon >= ?
+                          AND c.latitude BETWEEN ? AND ? AND c.longitude BETWEEN ? AND ?"""
+            params = [north, south, east, west, south, north, west, east]
+            if month:
+                clause += " AND rt.min_month <= ? AND rt.max_month >= ?"
+                params += [crime_month_index(month)] * 2
+        else:
+            clause = "FROM crimes c WHERE c.latitude BETWEEN ? AND ? AND c.longitude BETWEEN ? AND ?"
+            params = [south, north, west, east]
+        if month:
+            clause += " AND c.month = ?"
+            params.append(month)
+        return clause, params
+
+    def crimes_in_bbox(north, south, east, west, month=None, limit=None, db_cursor=None):
+        """
+        Crimes located inside a bounding box.
+
+        Args:
+            north, south, east, west: Box bounds in degrees
+            month: Optional crime month (YYYY-MM)
+            limit: Optional maximum number of rows
+            db_cursor: Cursor to read through (defaults to the notebook cursor)
+
+        Returns:
+            List of (id, crime_id, area_id, category, latitude, longitude, street_name, month)
+        """
+        db_cursor = db_cursor or cursor
+        clause, params = crime_box_clause(north, south, east, west, month)
+        sql = f"""SELECT c.id, c.crime_id, c.area_id, c.category, c.latitude, c.longitude, c.street_name, c.month
+                  {clause}"""
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        db_cursor.execute(sql, params)
+        return db_cursor.fetchall()
+
+    def crimes_within_radius(latitude, longitude, radius_m, month=None, db_cursor=None):
+        """
+        Crimes within radius_m metres of a point, nearest first.
+
+        Returns:
+            List of (distance_m, id, crime_id, area_id, category, latitude, longitude, street_name, month)
+        """
+        lat_delta = radius_m / METRES_PER_DEGREE
+        lon_delta = radius_m / (METRES_PER_DEGREE * max(np.cos(np.radians(latitude)), 1e-6))
+        rows = crimes_in_bbox(latitude + lat_delta, latitude - lat_delta,
+                              longitude + lon_delta, longitude - lon_delta, month, db_cursor=db_cursor)
+        if not rows:
+            return []
+        points = np.radians(np.array([(row[4], row[5]) for row in rows], dtype=float))
+        lat0, lon0 = np.radians(latitude), np.radians(longitude)
+        # Haversine distance on a sphere with the same metres per degree
+        a = (np.sin((points[:, 0] - lat0) / 2) ** 2
+             + np.cos(lat0) * np.cos(points[:, 0]) * np.sin((points[:, 1] - lon0) / 2) ** 2)
+        distances = 2 * np.degrees(np.arcsin(np.sqrt(np.clip(a, 0, 1)))) * METRES_PER_DEGREE
+        order = np.argsort(distances, kind='stable')
+        return [(float(distances[i]), *rows[i]) for i in order if distances[i] <= radius_m]
+
+    def nearest_crimes(latitude, longitude, k=10, month=None, start_radius_m=250, db_cursor=None):
+        """
+        The k crimes nearest to a point, nearest first (same rows as crimes_within_radius).
+
+        Searches a radius that doubles until it holds k crimes; every crime closer
+        than the k-th is then guaranteed to be inside it.
+        """
+        radius_m = start_radius_m
+        while True:
+            found = crimes_within_radius(latitude, longitude, radius_m, month, db_cursor=db_cursor)
+            if len(found) >= k or radius_m >= MAX_SEARCH_RADIUS_M:
+                return found[:k]
+            radius_m *= 2
+
+    def areas_in_bbox(north, south, east, west, date=None, db_cursor=None):
+        """
+        Stored areas overlapping a bounding box (boxes that only touch an edge are excluded).
+
+        Returns:
+            List of (area_id, cell_id, (north, south, east, west), date, crime_count)
+        """
+        db_cursor = db_cursor or cursor
+        clause = "FROM area_cells c JOIN crime_areas ca ON ca.cell_id = c.id"
+        conditions = ["c.south < ?", "c.north > ?", "c.west < ?", "c.east > ?"]
+        params = [north, south, east, west]
+        if has_spatial_index:
+            clause = "FROM area_cells_rtree r JOIN area_cells c ON c.id = r.id JOIN crime_areas ca ON ca.cell_id = c.id"
+            conditions += ["r.south <= ?", "r.north >= ?", "r.west <= ?", "r.east >= ?"]
+            params += [north, south, east, west]
+        if date:
+            conditions.append("ca.date = ?")
+            params.append(date)
+        db_cursor.execute(
+            f"""SELECT ca.id, ca.cell_id, c.north, c.south, c.east, c.west, ca.date, ca.crime_count
+                {clause} WHERE {" AND ".join(conditions)} ORDER BY ca.id""",
+            params
+        )
+        return [(area_id, cell_id, (n, s, e, w), area_date, count)
+                for area_id, cell_id, n, s, e, w, area_date, count in db_cursor.fetchall()]
+
+    def hotspots_in_bbox(north, south, east, west, month=None, limit=50, db_cursor=None):
+        """
+        Locations with more than one crime inside a bounding box, busiest first
+        (the crime_hotspots view restricted to a region).
+
+        Returns:
+            List of (latitude, longitude, street_name, crime_count, crime_types)
+        """
+        db_cursor = db_cursor or cursor
+        clause, params = crime_box_clause(north, south, east, west, month)
+        db_cursor.execute(
+            f"""SELECT c.latitude, c.longitude, c.street_name, COUNT(*) as crime_count,
+                       GROUP_CONCAT(DISTINCT c.category) as crime_types
+                {clause}
+                GROUP BY c.latitude, c.longitude, c.street_name
+                HAVING crime_count > 1
+                ORDER BY crime_count DESC
+                LIMIT ?""",
+            params + [limit]
+        )
+        return db_cursor.fetchall()
+
+    return (
+        areas_in_bbox,
+        crimes_in_bbox,
+        crimes_within_radius,
+        hotspots_in_bbox,
+        nearest_crimes,
+    )
+
+
+@app.cell
+def ingest_writer_functions(
+    BATCH_COMMIT_SIZE,
+    INGEST_COMMIT_INTERVAL_SECONDS,
+    INGEST_QUEUE_MAX_AREAS,
+    area_cache,
+    asyncio,
+    connect_db,
+    contextlib,
+    get_cell_id,
+    insert_crimes_batch,
+    monotonic,
+    refresh_area_summaries,
+    replace_resource,
+    threading,
+):
+    """
+    Single background writer for area and crime inserts.
+
+    Fetchers hand finished areas to a bounded queue and go straight back to the
+    network. The writer thread owns its own connection and commits in groups:
+    every BATCH_COMMIT_SIZE areas or INGEST_COMMIT_INTERVAL_SECONDS, whichever
+    comes first. A full queue makes producers wait, so a slow disk throttles
+    the fetchers instead of buffering payloads without bound. Committed areas
+    are applied to area_cache so cache checks see them without a query, and
+    each area's summary rows are refreshed in the same transaction as its crimes.
+    Each job is written in its own savepoint, so a job that fails leaves none
+    of its rows in the group. Checkpointed runs record their run_state through the same queue, so a
+    leaf is marked done in the commit that stores it, and a node's split
+    decision commits together with its pending children, or with the leaves
+    its payload was partitioned into. Split decisions for
+    split_cache go through the queue too and reach area_cache once committed.
+    """
+    import queue
+
+    class IngestWriterError(RuntimeError):
+        """The ingest writer thread has stopped, so nothing more can be saved."""
+
+    class IngestWriter:
+        _FLUSH = object()
+        _STOP = object()
+        _RUN_STATE = object()
+        _SPLIT = object()
+        _PARTITION = object()
+        _LIVENESS_POLL_SECONDS = 0.5  # How often blocked producers check that the thread is still running
+
+        def __init__(self):
+            self.queue = queue.Queue(maxsize=INGEST_QUEUE_MAX_AREAS)
+            self.stats = {'areas': 0, 'crimes': 0, 'commits': 0, 'errors': 0}
+            self.error = None  # Exception that stopped the writer thread, re-raised to producers
+            self.thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+            self.thread.start()
+
+        def submit(self, bounds, crime_count, date, crimes_data, cell=None, run_id=None):
+            """
+            Queue an area and its crimes for writing. Blocks while the queue is full.
+
+            bounds is the area's (north, south, east, west); cell is its
+            quadtree key (root_id, depth, quadkey) when known. With a run_id
+            the area is also marked as a completed leaf of that run.
+            """
+            self._put((bounds, cell, crime_count, date, crimes_data, run_id))
+
+        async def submit_async(self, bounds, crime_count, date, crimes_data, cell=None, run_id=None):
+            """Queue from the event loop; waits in a worker thread if the queue is full."""
+            await self._put_async((bounds, cell, crime_count, date, crimes_data, run_id))
+
+        def submit_partition(self, bounds, cell, date, leaves, run_id=None, inland=False):
+            """
+            Queue the leaves one box's payload was partitioned into, written as
+            one job: all of them or none. leaves is a list of
+            (leaf_bounds, leaf_cell, leaf_crimes). With a run_id the box is
+            marked split in the same job, so a restart never finds the box
+            pending with its leaves already stored.
+            """
+            self._put((self._PARTITION, bounds, cell, date, leaves, run_id, inland))
+
+        async def submit_partition_async(self, bounds, cell, date, leaves, run_id=None, inland=False):
+            await self._put_async((self._PARTITION, bounds, cell, date, leaves, run_id, inland))
+
+        def submit_run_state(self, run_id, nodes):
+            """
+            Queue run_state updates, committed together.
+
+            nodes is a list of (bounds, cell, date, state, crime_count, inland).
+            """
+            self._put((self._RUN_STATE, run_id, nodes))
+
+        async def submit_run_state_async(self, run_id, nodes):
+            await self._put_async((self._RUN_STATE, run_id, nodes))
+
+        def submit_split(self, bounds, cell, date, status_code):
+            """Queue a split decision for split_cache: the API answered status_code for the box."""
+            self._put((self._SPLIT, bounds, cell, date, status_code))
+
+        async def submit_split_async(self, bounds, cell, date, status_code):
+            await self._put_async((self._SPLIT, bounds, cell, date, status_code))
+
+        def check_alive(self):
+            """Raise IngestWriterError instead of waiting on a writer thread that is no longer running."""
+            if self.thread.is_alive():
+                return
+            if self.error is not None:
+                raise IngestWriterError(f"Ingest writer stopped: {self.error}") from self.error
+            raise IngestWriterError("Ingest writer is closed")
+
+        def _put(self, job):
+            """queue.put that fails, rather than blocking forever, if the writer thread dies."""
+            while True:
+                self.check_alive()
+                try:
+                    self.queue.put(job, timeout=self._LIVENESS_POLL_SECONDS)
+                    return
+                except queue.Full:
+                    pass
+
+        async def _put_async(self, job):
+            self.check_alive()
+            try:
+                self.queue.put_nowait(job)
+            except queue.Full:
+                await asyncio.to_thread(self._put, job)
+
+        def flush(self):
+            """Block until everything submitted so far is committed."""
+            committed = threading.Event()
+            self._put((self._FLUSH, committed.set))
+            while not committed.wait(self._LIVENESS_POLL_SECONDS):
+                self.check_alive()
+
+        async def flush_async(self):
+            """flush for the event loop: awaits the commit without blocking the loop."""
+            loop = asyncio.get_running_loop()
+            committed = loop.create_future()
+            await self._put_async((self._FLUSH, lambda: loop.call_soon_threadsafe(committed.set_result, None)))
+            while not committed.done():
+                self.check_alive()
+                await asyncio.wait([committed], timeout=self._LIVENESS_POLL_SECONDS)
+
+        def close(self):
+            """
+            Commit outstanding work and stop the writer thread. If the thread
+            died, raises the error that stopped it instead of waiting on it.
+            """
+            if self.thread.is_alive():
+                self._put(self._STOP)
+                self.thread.join()
+            if self.error is not None:
+                raise self.error
+
+        @contextlib.contextmanager
+        def _savepoint(self, db_cursor):
+            """Scope one job's writes: if the job fails, its rows are rolled back and the rest of the group is kept."""
+            db_cursor.execute("SAVEPOINT ingest_job")
+            try:
+                yield
+            except BaseException:
+                db_cursor.execute("ROLLBACK TO ingest_job")
+                raise
+            finally:
+                db_cursor.execute("RELEASE ingest_job")
+
+        def _write_area(self, db_cursor, bounds, cell, crime_count, date, crimes_data, run_id):
+            """Insert one area and its crimes; returns its area_cache record. Errors propagate."""
+            cell_id = get_cell_id(bounds, cell, db_cursor=db_cursor)
+            if cell is None:
+                db_cursor.execute("SELECT root_id, depth, quadkey FROM area_cells WHERE id = ?", (cell_id,))
+                key = db_cursor.fetchone()
+                cell = key if key[0] is not None else None
+            db_cursor.execute(
+                """INSERT OR IGNORE INTO crime_areas (cell_id, crime_count, date)
+                   VALUES (?, ?, ?)""",
+                (cell_id, crime_count, date)
+            )
+            db_cursor.execute(
+                """SELECT id FROM crime_areas WHERE cell_id = ? AND date = ?""",
+                (cell_id, date)
+            )
+            area_id = db_cursor.fetchone()[0]
+            inserted = insert_crimes_batch(area_id, crimes_data, db_cursor=db_cursor)
+            if inserted:
+                refresh_area_summaries(area_id, db_cursor=db_cursor)
+            if run_id is not None:
+                self._set_run_state(db_cursor, run_id, cell_id, date, 'leaf', crime_count)
+            return date, cell_id, cell, area_id, crime_count, inserted
+
+        def _count(self, records):
+            """Add written area_cache records to the area and crime stats."""
+            for *_, inserted in records:
+                self.stats['crimes'] += inserted
+                self.stats['areas'] += 1
+
+        def _write(self, db_cursor, job):
+            """Write one area and its crimes; returns the area_cache record, or None on error."""
+            bounds, cell, crime_count, date, crimes_data, run_id = job
+            try:
+                with self._savepoint(db_cursor):
+                    record = self._write_area(db_cursor, bounds, cell, crime_count, date, crimes_data, run_id)
+                self._count([record])
+                return record
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠ Error saving area/crimes for {date}: {e}")
+                return None
+
+        def _write_partition(self, db_cursor, job):
+            """Write a partitioned box's leaves, and its split state; returns their area_cache records ([] on error)."""
+            _, bounds, cell, date, leaves, run_id, inland = job
+            try:
+                with self._savepoint(db_cursor):
+                    records = [
+                        self._write_area(db_cursor, leaf_bounds, leaf_cell, len(leaf_crimes), date, leaf_crimes, run_id)
+                        for leaf_bounds, leaf_cell, leaf_crimes in leaves
+                    ]
+                    if run_id is not None:
+                        cell_id = get_cell_id(bounds, cell, db_cursor=db_cursor)
+                        self._set_run_state(db_cursor, run_id, cell_id, date, 'split', None, inland)
+                self._count(records)
+                return records
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠ Error saving partitioned area/crimes for {date}: {e}")
+                return []
+
+        def _set_run_state(self, db_cursor, run_id, cell_id, date, state, crime_count=None, inland=False):
+            db_cursor.execute(
+                """INSERT INTO run_state (run_id, cell_id, date, state, crime_count, inland)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(run_id, cell_id, date) DO UPDATE
+                   SET state = excluded.state, crime_count = excluded.crime_count, inland = excluded.inland""",
+                (run_id, cell_id, date, state, crime_count, int(inland))
+            )
+
+        def _write_run_state(self, db_cursor, job):
+            """Write one group of run_state updates."""
+            _, run_id, nodes = job
+            try:
+                with self._savepoint(db_cursor):
+                    for bounds, cell, date, state, crime_count, inland in nodes:
+                        cell_id = get_cell_id(bounds, cell, db_cursor=db_cursor)
+                        self._set_run_state(db_cursor, run_id, cell_id, date, state, crime_count, inland)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠ Error saving state of run {run_id}: {e}")
+
+        def _write_split(self, db_cursor, job):
+            """Write one split decision; returns the area_cache record, or None on error."""
+            _, bounds, cell, date, status_code = job
+            try:
+                with self._savepoint(db_cursor):
+                    cell_id = get_cell_id(bounds, cell, db_cursor=db_cursor)
+                    db_cursor.execute(
+                        "INSERT OR REPLACE INTO split_cache (date, cell_id, status_code) VALUES (?, ?, ?)",
+                        (date, cell_id, status_code)
+                    )
+                    return date, cell, status_code
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"⚠ Error saving split decision for {date}: {e}")
+                return None
+
+        def _run(self):
+            try:
+                self._write_loop()
+            except BaseException as e:
+                # Producers re-raise it instead of waiting on a dead thread
+                self.error = e
+                raise
+
+        def _write_loop(self):
+            db_conn = connect_db()
+            db_cursor = db_conn.cursor()
+            pending = 0  # Queue items taken since the last commit (task_done deferred until committed)
+            written = 0  # Jobs (areas, partitions, run_state groups, splits) written since the last commit
+            committed = []  # area_cache records, applied once their commit succeeds
+            committed_splits = []
+            group_started = monotonic()
+
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, INGEST_COMMIT_INTERVAL_SECONDS - (monotonic() - group_started))
+                try:
+                    job = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    job = None  # Commit interval elapsed
+                flushing = job is not None and job is not self._STOP and job[0] is self._FLUSH
+                if job is not None:
+                    if not pending:
+                        group_started = monotonic()
+                    pending += 1
+                    if job is not self._STOP and not flushing:
+                        if not db_conn.in_transaction:
+                            # Open the group's transaction, so each job's savepoint nests in it
+                            # (an outermost savepoint would commit on release)
+                            db_conn.execute("BEGIN")
+                        if job[0] is self._RUN_STATE:
+                            self._write_run_state(db_cursor, job)
+                        elif job[0] is self._SPLIT:
+                            record = self._write_split(db_cursor, job)
+                            if record is not None:
+                                committed_splits.append(record)
+                        elif job[0] is self._PARTITION:
+                            committed.extend(self._write_partition(db_cursor, job))
+                        else:
+                            record = self._write(db_cursor, job)
+                            if record is not None:
+                                committed.append(record)
+                        written += 1
+
+                if (job is None or flushing or job is self._STOP or written >= BATCH_COMMIT_SIZE
+                        or monotonic() - group_started >= INGEST_COMMIT_INTERVAL_SECONDS):
+                    if written:
+                        try:
+                            db_conn.commit()
+                            self.stats['commits'] += 1
+                            area_cache.record(committed)
+                            area_cache.record_splits(committed_splits)
+                        except Exception as e:
+                            db_conn.rollback()
+                            self.stats['errors'] += written
+                            print(f"⚠ Error committing {written} writes: {e}")
+                    for _ in range(pending):
+                        self.queue.task_done()
+                    pending = written = 0
+                    committed = []
+                    committed_splits = []
+                    if flushing:
+                        job[1]()  # Everything queued before the flush is committed
+
+                if job is self._STOP:
+                    break
+
+            db_conn.close()
+
+    ingest_writer = IngestWriter()
+    # A re-run commits and stops the previous writer; the last one closes at exit
+    replace_resource("ingest_writer", ingest_writer.close)
+    return IngestWriterError, ingest_writer
+
+
+@app.cell
+def run_state_functions(conn, cursor, get_cell_id, get_root_id, json, root_cell):
+    """
+    Checkpointed runs, so a bisection or backfill continues where it stopped.
+
+    Starting a run with the same parameters as an unfinished one resumes it.
+    The engines record every node through the ingest writer, so the committed
+    run_state is a consistent prefix of the work: a restart queues only the
+    pending nodes, and split nodes and stored leaves are not requested again.
+    """
+
+    def start_run(kind, params):
+        """Return (run_id, resumed): the latest unfinished `kind` run with these params, or a new one."""
+        key = json.dumps(params, sort_keys=True)
+        cursor.execute(
+            """SELECT id FROM runs WHERE kind = ? AND params = ? AND status = 'running'
+               ORDER BY id DESC LIMIT 1""",
+            (kind, key)
+        )
+        row = cursor.fetchone()
+        if row:
+            return row[0], True
+        cursor.execute("INSERT INTO runs (kind, params) VALUES (?, ?)", (kind, key))
+        return cursor.lastrowid, False
+
+    def start_bisection_run(bounds, date):
+        """
+        Start or resume the bisection of (north, south, east, west) for `date`.
+        A new run's frontier is the root box. Returns (run_id, resumed).
+        """
+        run_id, resumed = start_run('bisection', {'bounds': list(bounds), 'date': date})
+        if not resumed:
+            cell_id = get_cell_id(bounds, root_cell(get_root_id(bounds)))
+            cursor.execute(
+                "INSERT INTO run_state (run_id, cell_id, date, state) VALUES (?, ?, ?, 'pending')",
+                (run_id, cell_id, date)
+            )
+        conn.commit()
+        return run_id, resumed
+
+    def start_backfill_run(areas, base_date, months):
+        """
+        Start or resume a historical backfill of `areas` (from load_existing_areas)
+        for `months`. A new run's frontier is every (area, month) pair.
+        Returns (run_id, resumed).
+        """
+        run_id, resumed = start_run('backfill', {'base_date': base_date, 'months': list(months)})
+        if not resumed:
             cursor.executemany(
-                """INSERT OR IGNORE INTO crimes
-                   (area_id, crime_id, category, latitude, longitude, street_name, month)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                crime_records
+                "INSERT OR IGNORE INTO run_state (run_id, cell_id, date, state) VALUES (?, ?, ?, 'pending')",
+                [(run_id, cell_id, month) for month in months for _, cell_id, _, _ in areas]
+            )
+        conn.commit()
+        return run_id, resumed
+
+    def load_run_nodes(run_id, state, db_cursor=None):
+        """
+        A run's nodes in one state, shallowest first.
+
+        Returns:
+            List of (cell_id, (north, south, east, west), cell, date, crime_count, inland);
+            cell is the quadtree key, or None for cells stored without one
+        """
+        db_cursor = db_cursor or cursor
+        db_cursor.execute(
+            """SELECT rs.cell_id, c.north, c.south, c.east, c.west, c.root_id, c.depth, c.quadkey,
+                      rs.date, rs.crime_count, rs.inland
+               FROM run_state rs JOIN area_cells c ON c.id = rs.cell_id
+               WHERE rs.run_id = ? AND rs.state = ?
+               ORDER BY c.depth, rs.cell_id, rs.date""",
+            (run_id, state)
+        )
+        return [(cell_id, (n, s, e, w), (root_id, depth, quadkey) if root_id is not None else None,
+                 date, crime_count, bool(inland))
+                for cell_id, n, s, e, w, root_id, depth, quadkey, date, crime_count, inland in db_cursor.fetchall()]
+
+    def load_run_frontier(run_id, db_cursor=None):
+        """Pending nodes of a run (see load_run_nodes)."""
+        return load_run_nodes(run_id, 'pending', db_cursor)
+
+    def load_run_leaves(run_id, db_cursor=None):
+        """Completed leaves of a run (see load_run_nodes)."""
+        return load_run_nodes(run_id, 'leaf', db_cursor)
+
+    def get_run_progress(run_id):
+        """Node counts by state, e.g. {'pending': 3, 'split': 5, 'leaf': 12}."""
+        cursor.execute("SELECT state, COUNT(*) FROM run_state WHERE run_id = ? GROUP BY state", (run_id,))
+        return dict(cursor.fetchall())
+
+    def finish_run(run_id):
+        """
+        Mark a run complete if nothing is pending. Call after flushing the ingest writer.
+        Returns the number of pending nodes (failed requests stay pending for the next resume).
+        """
+        remaining = get_run_progress(run_id).get('pending', 0)
+        if not remaining:
+            cursor.execute(
+                "UPDATE runs SET status = 'complete', finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (run_id,)
             )
             conn.commit()
-            return len(crime_records)
-        except Exception as e:
-            print(f"    ⚠ Error inserting crimes: {e}")
-            return 0
-    return (insert_crimes_batch,)
+        return remaining
+
+    return (
+        finish_run,
+        get_run_progress,
+        load_run_frontier,
+        load_run_leaves,
+        start_backfill_run,
+        start_bisection_run,
+    )
 
 
 @app.cell
@@ -602,6 +2246,13 @@ def polygon_helper_functions():
         """
         return ":".join([f"{lat},{lon}" for lat, lon in coords])
 
+    def parse_polygon_bounds(polygon_str):
+        """Convert "lat,lon:lat,lon:..." back to (north, south, east, west)."""
+        points = [tuple(map(float, pair.split(','))) for pair in polygon_str.split(':')]
+        lats = [lat for lat, _ in points]
+        lons = [lon for _, lon in points]
+        return max(lats), min(lats), max(lons), min(lons)
+
     def bounds_to_polygon(north, south, east, west):
         """
         Convert bounding box to polygon coordinates (4 corners, clockwise from NW).
@@ -648,15 +2299,376 @@ def polygon_helper_functions():
             (mid_lat, south, east, mid_lon),      # SE
             (mid_lat, south, mid_lon, west),      # SW
         ]
-    return bounds_to_polygon, format_polygon, split_bounds_quad
+    return bounds_to_polygon, format_polygon, parse_polygon_bounds, split_bounds_quad
 
 
 @app.cell
-def api_functions(API_BASE_URL, format_polygon, httpx, sleep):
-    def fetch_crimes(polygon_coords, date, rate_limit_delay=0.1):
+def quadtree_key_functions(QUADKEY_MAX_DEPTH, split_bounds_quad):
+    """
+    Quadtree path keys for bisected cells.
+
+    split_bounds_quad always splits at midpoints, so a cell is exactly
+    identified by its root box plus the quadrant taken at each level
+    (0=NE, 1=NW, 2=SE, 3=SW, the split_bounds_quad order). A cell key is
+    (root_id, depth, quadkey): quadkey holds the path as 2-bit digits
+    left-aligned to QUADKEY_MAX_DEPTH, so a cell and all of its descendants
+    occupy one contiguous quadkey range.
+    """
+
+    def digit_shift(level):
+        """Bit position of the quadrant digit chosen at `level` (1 = first split)."""
+        return 2 * (QUADKEY_MAX_DEPTH - level)
+
+    def root_cell(root_id):
+        return (root_id, 0, 0)
+
+    def child_cell(cell, quadrant):
+        """Key of quadrant `quadrant` (index into split_bounds_quad) of `cell`."""
+        root_id, depth, quadkey = cell
+        if depth >= QUADKEY_MAX_DEPTH:
+            raise ValueError(f"Cell depth exceeds QUADKEY_MAX_DEPTH ({QUADKEY_MAX_DEPTH})")
+        return (root_id, depth + 1, quadkey | quadrant << digit_shift(depth + 1))
+
+    def parent_cell(cell):
+        """Key of the cell `cell` was split from; None for a root."""
+        root_id, depth, quadkey = cell
+        if depth == 0:
+            return None
+        return (root_id, depth - 1, quadkey & ~(3 << digit_shift(depth)))
+
+    def split_cell(north, south, east, west, cell):
+        """split_bounds_quad paired with child keys: [((n, s, e, w), child_cell), ...]."""
+        return [(quad, child_cell(cell, quadrant))
+                for quadrant, quad in enumerate(split_bounds_quad(north, south, east, west))]
+
+    def descendant_range(cell):
+        """Half-open quadkey range [start, end) covering the cell and every descendant."""
+        _, depth, quadkey = cell
+        return quadkey, quadkey + (1 << digit_shift(depth))
+
+    def cell_grid_position(cell):
+        """(x, y) of the cell in the 2**depth x 2**depth grid over its root; x grows east, y north."""
+        _, depth, quadkey = cell
+        x = y = 0
+        for level in range(1, depth + 1):
+            digit = quadkey >> digit_shift(level) & 3
+            x = x << 1 | (1 - (digit & 1))
+            y = y << 1 | (1 - (digit >> 1))
+        return x, y
+
+    def neighbour_cell(cell, d_east, d_north):
+        """Same-depth cell offset by (d_east, d_north) cells; None if outside the root."""
+        root_id, depth, _ = cell
+        x, y = cell_grid_position(cell)
+        x, y = x + d_east, y + d_north
+        if not (0 <= x < 1 << depth and 0 <= y < 1 << depth):
+            return None
+        quadkey = 0
+        for level in range(1, depth + 1):
+            bit = depth - level
+            digit = (1 - (y >> bit & 1)) << 1 | (1 - (x >> bit & 1))
+            quadkey |= digit << digit_shift(level)
+        return (root_id, depth, quadkey)
+
+    def locate_cell(root_id, root_bounds, bounds):
+        """
+        Key of `bounds` under a root, or None if bisecting the root never yields it.
+        Comparison is exact: split_bounds_quad reproduces the same floats every run.
+        """
+        cell = root_cell(root_id)
+        current = tuple(root_bounds)
+        north, south, east, west = bounds
+        while current != tuple(bounds):
+            if cell[1] >= QUADKEY_MAX_DEPTH:
+                return None
+            for quad, child in split_cell(*current, cell):
+                if quad[0] >= north and quad[1] <= south and quad[2] >= east and quad[3] <= west:
+                    current, cell = quad, child
+                    break
+            else:
+                return None
+        return cell
+
+    return (
+        child_cell,
+        descendant_range,
+        locate_cell,
+        neighbour_cell,
+        parent_cell,
+        root_cell,
+        split_cell,
+    )
+
+
+@app.cell
+def rate_limiter(
+    MAX_CALLS_PER_SECOND,
+    RATE_LIMIT_BURST,
+    asyncio,
+    monotonic,
+    sleep,
+    threading,
+):
+    """Token-bucket rate limiter shared by every API fetch path."""
+    class TokenBucket:
+        """
+        Token bucket with blocking (sync) and awaitable (async) acquire.
+
+        Tokens refill continuously at `rate` per second up to `capacity`.
+        Each caller reserves a token under a thread lock, so the quota holds
+        across the notebook thread and the event loops started by run_async.
+        """
+
+        def __init__(self, rate, capacity=1):
+            self.rate = float(rate)
+            self.capacity = float(capacity)
+            self._tokens = float(capacity)
+            self._updated = monotonic()
+            self._lock = threading.Lock()
+
+        def _reserve(self):
+            """Take one token and return how long the caller must wait for it."""
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                # A negative balance is a queue of reserved future tokens
+                return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+        def acquire(self):
+            """Block until a token is available."""
+            wait = self._reserve()
+            if wait > 0:
+                sleep(wait)
+
+        async def acquire_async(self):
+            """Await until a token is available without blocking the event loop."""
+            wait = self._reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        def pause(self, seconds):
+            """Hold back every caller for at least `seconds` (used when the API throttles us)."""
+            with self._lock:
+                self._tokens = min(self._tokens, -seconds * self.rate)
+
+    # Single limiter instance: every fetch path draws from the same quota
+    api_rate_limiter = TokenBucket(MAX_CALLS_PER_SECOND, RATE_LIMIT_BURST)
+    return (api_rate_limiter,)
+
+
+@app.cell
+def api_retry_policy(
+    CIRCUIT_BREAKER_THRESHOLD,
+    MAX_RETRIES,
+    RETRY_BACKOFF_BASE_SECONDS,
+    RETRY_BACKOFF_MAX_SECONDS,
+    api_rate_limiter,
+    datetime,
+    httpx,
+    log_api_error,
+    threading,
+):
+    """Response classification, backoff and circuit breaker for API calls."""
+    import random
+    from email.utils import parsedate_to_datetime
+    from datetime import timezone
+
+    # Outcome classes
+    OUTCOME_OK = "ok"
+    OUTCOME_TOO_MANY_CRIMES = "too_many_crimes"  # 503: area must be split
+    OUTCOME_THROTTLED = "throttled"              # 429: retry after backoff
+    OUTCOME_TRANSIENT = "transient"              # 500/502/504, timeouts, network errors
+    OUTCOME_CLIENT_ERROR = "client_error"        # Other 4xx: not retryable, not splittable
+    RETRYABLE_OUTCOMES = (OUTCOME_THROTTLED, OUTCOME_TRANSIENT)
+
+    class CircuitOpenError(RuntimeError):
+        """Raised when too many consecutive API failures indicate the API is down."""
+
+    def classify_response(status_code=None, exc=None):
+        """
+        Classify an API attempt.
+
+        Args:
+            status_code: HTTP status code (None if the request raised)
+            exc: Exception raised by the HTTP client, if any
+
+        Returns:
+            (outcome, error_type) where error_type is the api_error_log label
+        """
+        if exc is not None:
+            if isinstance(exc, httpx.TimeoutException):
+                return OUTCOME_TRANSIENT, "API_TIMEOUT"
+            return OUTCOME_TRANSIENT, "HTTP_ERROR"
+        if status_code == 200:
+            return OUTCOME_OK, None
+        if status_code == 503:
+            return OUTCOME_TOO_MANY_CRIMES, "API_503_TOO_MANY_CRIMES"
+        if status_code == 429:
+            return OUTCOME_THROTTLED, "API_429_THROTTLED"
+        if status_code in (500, 502, 504):
+            return OUTCOME_TRANSIENT, f"API_{status_code}_TRANSIENT"
+        return OUTCOME_CLIENT_ERROR, f"API_{status_code}"
+
+    def parse_retry_after(value):
+        """Parse a Retry-After header (delta-seconds or HTTP-date). Returns seconds or None."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff_delay(attempt, retry_after=None):
+        """
+        Delay before retry number `attempt` (0-based).
+        Honours Retry-After when present, otherwise exponential backoff with jitter.
+        """
+        retry_after_seconds = parse_retry_after(retry_after)
+        if retry_after_seconds is not None:
+            return min(RETRY_BACKOFF_MAX_SECONDS, retry_after_seconds)
+        ceiling = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        # Equal jitter: at least half the backoff, spread to avoid synchronised retries
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    class CircuitBreaker:
+        """
+        Counts consecutive failed attempts across every fetch path.
+        Once `threshold` is reached the breaker opens and `check()` raises,
+        stopping the whole run instead of hammering an API that is down.
+        """
+
+        def __init__(self, threshold):
+            self.threshold = threshold
+            self._failures = 0
+            self._lock = threading.Lock()
+
+        @property
+        def is_open(self):
+            return self._failures >= self.threshold
+
+        def check(self):
+            """Raise CircuitOpenError if the breaker is open."""
+            if self.is_open:
+                raise CircuitOpenError(
+                    f"API circuit breaker open after {self._failures} consecutive failures"
+                )
+
+        def record_success(self):
+            with self._lock:
+                self._failures = 0
+
+        def record_failure(self):
+            with self._lock:
+                self._failures += 1
+
+        def reset(self):
+            """Close the breaker (call at the start of each run)."""
+            self.record_success()
+
+    api_circuit_breaker = CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD)
+
+    def settle_attempt(attempt, response, error, date, polygon_str, depth=None):
+        """
+        Apply the retry policy to one API attempt (shared by the sync and async fetchers).
+
+        Classifies the attempt, records failures in api_error_log, updates the
+        circuit breaker and, when throttled, pauses the shared rate limiter.
+
+        Args:
+            attempt: 0-based attempt number
+            response: httpx response (None if the request raised)
+            error: Exception raised by the HTTP client, if any
+            date, polygon_str, depth: request details, recorded with logged errors
+
+        Returns:
+            ("decode", None) on success: the caller decodes response.content
+            ("retry", delay) to retry after sleeping `delay` seconds
+            ("return", (status_code, data, 0)) to stop without crimes
+        """
+        outcome, error_type = classify_response(
+            response.status_code if response is not None else None, error
+        )
+        if outcome == OUTCOME_OK:
+            api_circuit_breaker.record_success()
+            return "decode", None
+
+        status_code = response.status_code if response is not None else 500
+        retrying = outcome in RETRYABLE_OUTCOMES and attempt < MAX_RETRIES
+        log_api_error(
+            error_type, status_code=status_code, date_requested=date,
+            polygon=polygon_str, recursion_depth=depth,
+            error_message=f"attempt {attempt + 1}/{MAX_RETRIES + 1}: "
+                          f"{error or outcome}{' (retrying)' if retrying else ''}",
+        )
+
+        if outcome not in RETRYABLE_OUTCOMES:
+            # The API answered meaningfully (e.g. 503 too many crimes)
+            api_circuit_breaker.record_success()
+            return "return", (status_code, None, 0)
+
+        api_circuit_breaker.record_failure()
+        if not retrying:
+            return "return", (status_code, str(error) if error else None, 0)
+
+        delay = backoff_delay(attempt, response.headers.get("Retry-After") if response is not None else None)
+        if outcome == OUTCOME_THROTTLED:
+            # Slow every fetcher down, not just this one
+            api_rate_limiter.pause(delay)
+        return "retry", delay
+
+    return CircuitOpenError, api_circuit_breaker, settle_attempt
+
+
+@app.cell
+def api_functions(
+    API_BASE_URL,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_USE_HTTP2,
+    MAX_RETRIES,
+    api_circuit_breaker,
+    api_rate_limiter,
+    decode_crimes,
+    format_polygon,
+    httpx,
+    replace_resource,
+    settle_attempt,
+    sleep,
+):
+    # Shared by the sync client and every async client, so the two paths can't drift
+    http_client_settings = dict(
+        http2=HTTP_USE_HTTP2,
+        timeout=HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+    # Long-lived pooled client: one TCP+TLS handshake reused across every sync call
+    api_http_client = httpx.Client(**http_client_settings)
+    # Close the previous run's pooled connections; the last client closes at exit
+    replace_resource("api_http_client", api_http_client.close)
+
+    def fetch_crimes(polygon_coords, date, depth=None):
         """
         Fetch crime data for a given polygon and date.
-        Returns (status_code, data, crime_count)
+
+        Throttled (429) and transient (5xx, timeout) failures are retried with
+        backoff; every classified failure is recorded in api_error_log.
+        Raises CircuitOpenError if the API looks down.
+
+        Returns (status_code, data, crime_count); on success data is a CrimeBatch
         """
 
         polygon_str = format_polygon(polygon_coords)
@@ -665,18 +2677,32 @@ def api_functions(API_BASE_URL, format_polygon, httpx, sleep):
             "poly": polygon_str
         }
 
-        sleep(rate_limit_delay)  # Rate limiting
+        for attempt in range(MAX_RETRIES + 1):
+            api_circuit_breaker.check()
+            api_rate_limiter.acquire()  # Rate limiting
 
-        try:
-            response = httpx.get(API_BASE_URL, params=params, timeout=30.0)
-            if response.status_code == 200:
-                data = response.json()
-                return 200, data, len(data)
-            else:
-                return response.status_code, None, 0
-        except Exception as e:
-            return 500, str(e), 0
-    return (fetch_crimes,)
+            response, error = None, None
+            try:
+                response = api_http_client.get(API_BASE_URL, params=params)
+            except Exception as e:
+                error = e
+
+            action, value = settle_attempt(attempt, response, error, date, polygon_str, depth)
+            if action == "decode":
+                crime_count, data = decode_crimes(response.content)
+                return 200, data, crime_count
+            if action == "return":
+                return value
+            sleep(value)
+    def new_async_http_client():
+        """
+        An httpx.AsyncClient with the sync client's timeout, pool limits and
+        HTTP/2 setting. Async clients are bound to their event loop, so each
+        async job opens (and closes) its own.
+        """
+        return httpx.AsyncClient(**http_client_settings)
+
+    return api_http_client, fetch_crimes, new_async_http_client
 
 
 @app.cell
@@ -685,29 +2711,97 @@ def async_api_config():
     import asyncio
 
     # Async configuration
-    MAX_CONCURRENT_REQUESTS = 10  # Max concurrent API calls (respects 10 req/sec limit)
-    RATE_LIMIT_DELAY = 0.1  # Delay between requests (100ms = 10 req/sec)
+    MAX_CONCURRENT_REQUESTS = 10  # Max in-flight API calls (rate is enforced by api_rate_limiter)
+    DECODE_PROCESSES = 2  # Worker processes decoding and shaping responses off the event loop
+    DECODE_OFFLOAD_MIN_BYTES = 64 * 1024  # Smaller responses decode inline (well under a millisecond)
 
-    return (MAX_CONCURRENT_REQUESTS, RATE_LIMIT_DELAY, asyncio)
+    return (
+        DECODE_OFFLOAD_MIN_BYTES,
+        DECODE_PROCESSES,
+        MAX_CONCURRENT_REQUESTS,
+        asyncio,
+    )
 
 
 @app.cell
-def async_api_functions(API_BASE_URL, asyncio, httpx):
+def async_api_functions(
+    API_BASE_URL,
+    DECODE_OFFLOAD_MIN_BYTES,
+    DECODE_PROCESSES,
+    MAX_RETRIES,
+    api_circuit_breaker,
+    api_rate_limiter,
+    asyncio,
+    contextlib,
+    decode_crimes,
+    replace_resource,
+    settle_attempt,
+    threading,
+):
     """Async API functions for concurrent crime data fetching."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    class DecodePool:
+        """
+        Worker processes for decode_crimes, started on the first large response.
+
+        Decoding a 10k-crime response takes ~30 ms of CPU; in worker processes
+        it no longer stalls the event loop (or contends for its GIL). Workers
+        are spawned rather than forked, since the notebook process already runs
+        the ingest writer and error-log threads (and fork does not exist on
+        Windows); decode_crimes lives in crime_payloads, so they can import it.
+        """
+
+        def __init__(self):
+            self.executor = None
+            self.lock = threading.Lock()
 
-    async def fetch_crimes_async(client, semaphore, polygon_coords, date, format_polygon_func):
+        def get(self):
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(
+                        max_workers=DECODE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+                    )
+                return self.executor
+
+        def close(self):
+            with self.lock:
+                if self.executor is not None:
+                    self.executor.shutdown(cancel_futures=True)
+                    self.executor = None
+
+    decode_pool = DecodePool()
+    # A re-run shuts down the previous run's workers; the last pool stops at exit
+    replace_resource("decode_pool", decode_pool.close)
+
+    async def decode_crimes_async(content):
+        """decode_crimes for the event loop: large responses are decoded in the process pool."""
+        if len(content) < DECODE_OFFLOAD_MIN_BYTES:
+            return decode_crimes(content)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(decode_pool.get(), decode_crimes, content)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): decode here rather than lose the response
+            return decode_crimes(content)
+
+    async def fetch_crimes_async(client, semaphore, polygon_coords, date, format_polygon_func, depth=None):
         """
         Async version of fetch_crimes for concurrent processing.
+        Applies the same retry, backoff and circuit breaker policy (settle_attempt).
 
         Args:
-            client: httpx.AsyncClient instance
-            semaphore: asyncio.Semaphore for rate limiting
+            client: httpx.AsyncClient from new_async_http_client
+            semaphore: asyncio.Semaphore capping concurrent requests, or None when
+                the caller already bounds them (e.g. a fixed worker pool)
             polygon_coords: List of (lat, lon) tuples
             date: Date string (YYYY-MM)
             format_polygon_func: Function to format polygon coords
+            depth: Bisection depth, recorded with logged errors
 
         Returns:
-            (status_code, data, crime_count)
+            (status_code, data, crime_count); on success data is a CrimeBatch
         """
         polygon_str = format_polygon_func(polygon_coords)
         params = {
@@ -715,180 +2809,227 @@ def async_api_functions(API_BASE_URL, asyncio, httpx):
             "poly": polygon_str
         }
 
-        # Use semaphore to limit concurrent requests
-        async with semaphore:
-            try:
-                response = await client.get(API_BASE_URL, params=params, timeout=30.0)
-                if response.status_code == 200:
-                    data = response.json()
-                    return 200, data, len(data)
-                else:
-                    return response.status_code, None, 0
-            except Exception as e:
-                return 500, str(e), 0
-            finally:
-                # Small delay to respect rate limit
-                await asyncio.sleep(0.1)
+        for attempt in range(MAX_RETRIES + 1):
+            api_circuit_breaker.check()
+
+            # Semaphore caps requests in flight; the shared token bucket caps the rate
+            response, error = None, None
+            async with semaphore or contextlib.nullcontext():
+                await api_rate_limiter.acquire_async()
+                try:
+                    response = await client.get(API_BASE_URL, params=params)
+                except Exception as e:
+                    error = e
+
+            action, value = settle_attempt(attempt, response, error, date, polygon_str, depth)
+            if action == "decode":
+                crime_count, data = await decode_crimes_async(response.content)
+                return 200, data, crime_count
+            if action == "return":
+                return value
+            # Back off outside the semaphore so other requests keep flowing
+            await asyncio.sleep(value)
 
     return (fetch_crimes_async,)
 
 
 @app.cell
 def async_historical_fetcher(
+    CircuitOpenError,
+    IngestWriterError,
+    area_cache,
     asyncio,
-    DB_PATH,
+    bounds_to_polygon,
+    connect_db,
     fetch_crimes_async,
     format_polygon,
-    httpx,
+    ingest_writer,
+    load_run_leaves,
     MAX_CONCURRENT_REQUESTS,
-    sqlite3,
+    monotonic,
+    new_async_http_client,
 ):
     """Async version of historical crime fetcher with concurrent processing."""
 
-    async def fetch_historical_crimes_async(areas, date, progress_callback=None):
+    async def fetch_historical_crimes_async(areas, date, progress_callback=None, run_id=None):
         """
         Fetch crimes for all areas concurrently using async.
-        Creates its own database connection to avoid thread-safety issues.
-
-        Args:
-            areas: List of (area_id, polygon_str, crime_count) tuples
-            date: Date string (YYYY-MM)
-            progress_callback: Optional callback function
-
-        Returns:
-            Dictionary with statistics
-        """
-        # Create database connection in this thread
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Define insert_crimes_batch locally with this connection
-        def insert_crimes_batch(area_id, crimes_data):
-            """Insert crime records for this area."""
-            if not crimes_data:
-                return 0
-
-            crime_records = []
-            for crime in crimes_data:
-                crime_id = crime.get('id')
-                if not crime_id:
-                    continue
-
-                category = crime.get('category', '')
-                location = crime.get('location', {})
-                latitude = location.get('latitude')
-                longitude = location.get('longitude')
-                street_name = location.get('street', {}).get('name', '')
-                month = crime.get('month', '')
-
-                crime_records.append((
-                    area_id, crime_id, category,
-                    float(latitude) if latitude else None,
-                    float(longitude) if longitude else None,
-                    street_name, month
-                ))
-
-            if crime_records:
-                cursor.executemany(
-                    """INSERT OR IGNORE INTO crimes
-                       (area_id, crime_id, category, latitude, longitude, street_name, month)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    crime_records
-                )
-                return len(crime_records)
-            return 0
+        Cache checks go to the in-memory area_cache; crimes are saved through
+        the ingest writer so SQLite writes never block the event loop.
 
-        total_areas = len(areas)
-        successful = 0
-        failed = 0
-        cached = 0
-        total_crimes_inserted = 0
+        Runs as a one-month fetch_historical_months_async job: a fixed pool of
+        MAX_CONCURRENT_REQUESTS workers, so at most that many responses are
+        held at once, each released once the writer has queued it.
 
-        # Create semaphore for rate limiting
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        Args:
+            areas: List of (area_id, cell_id, bounds, crime_count) tuples
+            date: Date string (YYYY-MM)
+            progress_callback: Optional callback function
+            run_id: Optional checkpointed run from start_backfill_run
 
-        # Create async HTTP client
-        async with httpx.AsyncClient() as client:
-            # Process areas concurrently
-            tasks = []
-
-            for idx, (area_id, polygon_str, _) in enumerate(areas, start=1):
-                # Check cache first (synchronous)
-                cursor.execute(
-                    """SELECT id, crime_count FROM crime_areas
-                       WHERE polygon = ? AND date = ?""",
-                    (polygon_str, date)
-                )
-                result = cursor.fetchone()
+        Returns:
+            Dictionary with statistics
+        """
+        def month_progress(month, *args, **kwargs):
+            progress_callback(*args, **kwargs)
 
-                if result:
-                    # Data already exists - skip API call
-                    existing_area_id, existing_crime_count = result
-                    cursor.execute(
-                        """SELECT COUNT(*) FROM crimes WHERE area_id = ?""",
-                        (existing_area_id,)
-                    )
-                    crimes_count = cursor.fetchone()[0]
+        month_stats = await fetch_historical_months_async(
+            areas, [date], month_progress if progress_callback else None, run_id=run_id
+        )
+        stats = month_stats[date]
+        del stats['elapsed']
+        return stats
 
-                    if crimes_count > 0:
-                        # Complete data exists
-                        cached += 1
-                        total_crimes_inserted += crimes_count
-                        if progress_callback:
-                            progress_callback(idx, total_areas, area_id, existing_crime_count, crimes_count, cached=True)
-                        continue
+    async def fetch_historical_months_async(areas, months, progress_callback=None, month_callback=None, run_id=None):
+        """
+        Fetch crimes for every area and month as one concurrent job.
 
-                # Convert polygon string to coords
-                polygon_coords = []
-                for pair in polygon_str.split(':'):
-                    lat, lon = pair.split(',')
-                    polygon_coords.append((float(lat), float(lon)))
-
-                # Create async task
-                task = fetch_crimes_async(client, semaphore, polygon_coords, date, format_polygon)
-                tasks.append((idx, area_id, polygon_str, result, task))
-
-            # Wait for all tasks to complete
-            for idx, area_id, polygon_str, cached_result, task in tasks:
-                status_code, data, crime_count = await task
-
-                if status_code == 200:
-                    if not cached_result:
-                        # Insert new area/date record
-                        cursor.execute(
-                            """INSERT INTO crime_areas (polygon, crime_count, date)
-                               VALUES (?, ?, ?)""",
-                            (polygon_str, crime_count, date)
-                        )
-                        area_id_to_use = cursor.lastrowid
-                    else:
-                        area_id_to_use = cached_result[0]
+        The whole areas x months matrix goes onto one work queue, served by one
+        HTTP client and one pool of MAX_CONCURRENT_REQUESTS workers. Requests
+        for the next month start as soon as a worker is free, instead of
+        waiting at a month barrier for the current month's slowest area.
 
-                    # Insert crimes
-                    crimes_inserted = insert_crimes_batch(area_id_to_use, data)
-                    total_crimes_inserted += crimes_inserted
-                    successful += 1
-                    conn.commit()
+        Args:
+            areas: List of (area_id, cell_id, bounds, crime_count) tuples
+            months: List of date strings (YYYY-MM), queued in this order
+            progress_callback: Optional function (month, idx, total, area_id,
+                crime_count, crimes_inserted, error=None, cached=False)
+            month_callback: Optional function (month, stats, complete=True), called
+                once each month's last area is committed. If the job stops early
+                (e.g. CircuitOpenError), months left unfinished are reported with
+                their partial stats and complete=False once their writes commit
+            run_id: Optional checkpointed run from start_backfill_run. Pairs the
+                run already completed are skipped without a cache check, and
+                every completed pair is recorded in run_state
 
+        Returns:
+            {month: statistics dictionary}, with the keys fetch_historical_crimes_async
+            returns plus 'elapsed' (seconds from the start of the job until the
+            month's writes were committed)
+        """
+        started = monotonic()
+        total_areas = len(areas)
+        month_stats = {
+            month: {'total_areas': total_areas, 'successful': 0, 'failed': 0, 'cached': 0, 'total_crimes': 0, 'elapsed': 0.0}
+            for month in months
+        }
+        remaining = dict.fromkeys(months, total_areas)
+        reports = []
+
+        async def report_committed(months_done, complete=True):
+            """Report months once everything queued for them is committed."""
+            await ingest_writer.flush_async()
+            for month in months_done:
+                month_stats[month]['elapsed'] = monotonic() - started
+                if month_callback:
+                    month_callback(month, month_stats[month], complete=complete)
+
+        def area_done(month):
+            remaining[month] -= 1
+            if not remaining[month]:
+                reports.append(asyncio.create_task(report_committed([month])))
+
+        # (cell_id, month) -> crime_count for pairs the run already completed
+        completed = {}
+        if run_id is not None:
+            db_conn = connect_db()
+            completed = {(cell_id, month): crime_count
+                         for cell_id, _, _, month, crime_count, _ in load_run_leaves(run_id, db_conn.cursor())}
+            db_conn.close()
+
+        # One work queue for the whole matrix, month by month; cached areas never reach it
+        work = asyncio.Queue()
+        cached_pairs = []
+        for month in months:
+            stats = month_stats[month]
+            for idx, (area_id, cell_id, bounds, _) in enumerate(areas, start=1):
+                if (cell_id, month) in completed:
+                    # Completed earlier in this run - skip API call
+                    result = area_cache.area(cell_id, month)
+                    crimes_count = result[2] if result else 0
+                    stats['cached'] += 1
+                    stats['total_crimes'] += crimes_count
                     if progress_callback:
-                        progress_callback(idx, total_areas, area_id, crime_count, crimes_inserted)
-                else:
-                    failed += 1
+                        progress_callback(month, idx, total_areas, area_id, completed[cell_id, month], crimes_count, cached=True)
+                    area_done(month)
+                    continue
+                result = area_cache.area(cell_id, month)
+                if result and result[2] > 0:
+                    # Complete data exists - skip API call
+                    _, existing_crime_count, crimes_count = result
+                    stats['cached'] += 1
+                    stats['total_crimes'] += crimes_count
+                    cached_pairs.append((bounds, None, month, 'leaf', existing_crime_count, False))
                     if progress_callback:
-                        progress_callback(idx, total_areas, area_id, 0, 0, error=status_code)
+                        progress_callback(month, idx, total_areas, area_id, existing_crime_count, crimes_count, cached=True)
+                    area_done(month)
+                else:
+                    work.put_nowait((month, idx, area_id, bounds))
+        if run_id is not None and cached_pairs:
+            await ingest_writer.submit_run_state_async(run_id, cached_pairs)
 
-        # Close the connection we created
-        conn.close()
+        stop_error = []
 
-        return {
-            'total_areas': total_areas,
-            'successful': successful,
-            'failed': failed,
-            'cached': cached,
-            'total_crimes': total_crimes_inserted
-        }
+        async def worker(client):
+            """Pull (month, area) pairs off the work queue until cancelled."""
+            while True:
+                month, idx, area_id, bounds = await work.get()
+                stats = month_stats[month]
+                try:
+                    if stop_error:
+                        continue
+                    # Don't spend a request on a response that could not be saved
+                    ingest_writer.check_alive()
+                    polygon_coords = bounds_to_polygon(*bounds)
+                    # The pool of MAX_CONCURRENT_REQUESTS workers bounds requests in flight
+                    status_code, data, crime_count = await fetch_crimes_async(
+                        client, None, polygon_coords, month, format_polygon
+                    )
+                    if status_code == 200:
+                        # Area row (new, or existing without crimes) and crimes go to the writer
+                        await ingest_writer.submit_async(bounds, crime_count, month, data, run_id=run_id)
+                        stats['successful'] += 1
+                        stats['total_crimes'] += len(data)
+                        if progress_callback:
+                            progress_callback(month, idx, total_areas, area_id, crime_count, len(data))
+                    else:
+                        stats['failed'] += 1
+                        if progress_callback:
+                            progress_callback(month, idx, total_areas, area_id, 0, 0, error=status_code)
+                    area_done(month)
+                except (CircuitOpenError, IngestWriterError) as exc:
+                    # API is down or the writer has stopped: stop fetching, let the remaining queue drain
+                    stop_error.append(exc)
+                except Exception as exc:
+                    print(f"  ⚠ Unexpected error fetching area {area_id} for {month}: {exc}")
+                    stats['failed'] += 1
+                    area_done(month)
+                finally:
+                    work.task_done()
 
-    return (fetch_historical_crimes_async,)
+        try:
+            async with new_async_http_client() as client:
+                workers = [
+                    asyncio.create_task(worker(client))
+                    for _ in range(MAX_CONCURRENT_REQUESTS)
+                ]
+                await work.join()
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            await asyncio.gather(*reports)
+            # Months cut short (API down): report what they completed. If the
+            # writer stopped, the flush raises its error instead
+            unfinished = [month for month in months if remaining[month]]
+            if unfinished:
+                await report_committed(unfinished, complete=False)
+
+        if stop_error:
+            raise stop_error[0]
+        return month_stats
+
+    return fetch_historical_crimes_async, fetch_historical_months_async
 
 
 @app.cell
@@ -930,21 +3071,202 @@ def async_runner_helper(asyncio):
     return (run_async,)
 
 
+@app.cell
+def uk_land_test(shapely, uk_boundary_polygon):
+    """
+    Indexed "does this box contain UK land" tests for the bisection engines.
+    Component polygons are prepared and held in an STRtree, so each test only
+    touches the few coastline pieces whose bounding boxes overlap the box.
+    """
+    from shapely.strtree import STRtree
+
+    land_parts = shapely.get_parts(uk_boundary_polygon)
+    shapely.prepare(land_parts)
+    land_tree = STRtree(land_parts)
+
+    def area_has_uk_land(north, south, east, west):
+        """True if the bounding box intersects the UK boundary."""
+        # Create a box for this area (west, south, east, north)
+        area_box = shapely.box(west, south, east, north)
+        return any(land_parts[i].intersects(area_box) for i in land_tree.query(area_box))
+
+    def area_inside_uk_land(north, south, east, west):
+        """True if the bounding box lies entirely on land (its sub-boxes need no further tests)."""
+        area_box = shapely.box(west, south, east, north)
+        return any(land_parts[i].contains(area_box) for i in land_tree.query(area_box))
+
+    return area_has_uk_land, area_inside_uk_land
+
+
+@app.cell
+def payload_partition_functions(TARGET_MAX_CRIMES, np, split_cell):
+    """Resolve an over-target 200 response into leaves without further API calls."""
+
+    def crime_coordinates(crimes_data):
+        """(lat, lon) float arrays from a CrimeBatch's microdegree columns; NaN where missing."""
+        lat = np.array(crimes_data.latitudes_e6, dtype=float) / 1_000_000
+        lon = np.array(crimes_data.longitudes_e6, dtype=float) / 1_000_000
+        return lat, lon
+
+    def partition_payload(north, south, east, west, crimes_data, cell, max_depth, has_land):
+        """
+        Split a parent payload by quadrant in memory until every leaf is at or
+        below TARGET_MAX_CRIMES. Mirrors split_bounds_quad, so leaves are the
+        same boxes (and quadtree keys) the API-driven recursion would have produced.
+
+        Args:
+            north, south, east, west: Parent bounding box
+            crimes_data: Parent payload as a CrimeBatch (every crime in the box)
+            cell: Parent quadtree key (root_id, depth, quadkey)
+            max_depth: Maximum split depth; leaves stop here even if above target
+            has_land: Function (north, south, east, west) -> bool; boxes without
+                UK land are dropped, as the API-driven recursion would skip them
+
+        Returns:
+            List of ((north, south, east, west), cell, CrimeBatch) leaves
+        """
+        lat, lon = crime_coordinates(crimes_data)
+        leaves = []
+
+        def split(bounds, node_cell, idx):
+            if node_cell != cell and not has_land(*bounds):
+                return
+            if len(idx) <= TARGET_MAX_CRIMES or node_cell[1] >= max_depth:
+                leaves.append((bounds, node_cell, crimes_data.take(idx)))
+                return
+            n, s, e, w = bounds
+            # Vectorised point-in-quadrant; crimes without coordinates fall to SW so none are lost
+            in_north = lat[idx] >= (n + s) / 2
+            in_east = lon[idx] >= (e + w) / 2
+            masks = [in_north & in_east, in_north & ~in_east, ~in_north & in_east, ~in_north & ~in_east]
+            for (quad, child), mask in zip(split_cell(n, s, e, w, node_cell), masks):  # NE, NW, SE, SW
+                split(quad, child, idx[mask])
+
+        split((north, south, east, west), cell, np.arange(len(crimes_data)))
+        return leaves
+
+    return (partition_payload,)
+
+
+@app.cell
+def density_prediction_functions(MAX_CRIMES_LIMIT, PREDICTIVE_SPLIT_SAFETY, cursor, np):
+    """Predict splits for a box from areas already stored for other dates."""
+
+    def month_index(date):
+        """'YYYY-MM' -> months since year 0, for distance between dates."""
+        year, month = map(int, date.split('-'))
+        return year * 12 + month
+
+    def other_stored_dates(date):
+        """
+        Dates with stored areas, other than `date`.
+
+        Walks idx_crime_areas_date one distinct date at a time (a seek per
+        date) instead of reading every area, which SELECT DISTINCT would do.
+        """
+        cursor.execute(
+            """WITH RECURSIVE stored_dates(date) AS (
+                   SELECT MIN(date) FROM crime_areas
+                   UNION ALL
+                   SELECT (SELECT MIN(date) FROM crime_areas WHERE date > stored_dates.date)
+                   FROM stored_dates WHERE stored_dates.date IS NOT NULL
+               )
+               SELECT date FROM stored_dates WHERE date IS NOT NULL AND date != ?""",
+            (date,)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def load_density_predictor(date, bounds=None):
+        """
+        Build a crime-count estimator for `date` from a previous run.
+
+        Uses the stored areas of the closest other date as a density map.
+        Overlapping areas (e.g. runs with different test bounds) are dropped,
+        keeping the smallest, so no crimes are double counted.
+
+        Args:
+            date: Date being bisected (YYYY-MM)
+            bounds: Optional (north, south, east, west) being bisected. Only areas
+                overlapping it are loaded, and the reference is the closest date
+                that has any, so a nearer month that only covered another area
+                does not shadow it
+
+        Returns:
+            (predict_split, reference_date), or (None, None) if there is no history.
+            predict_split(north, south, east, west) returns the estimated count
+            when the box is confidently above MAX_CRIMES_LIMIT, otherwise None.
+        """
+        north, south, east, west = bounds or (90.0, -90.0, 180.0, -180.0)
+        other_dates = sorted(other_stored_dates(date),
+                             key=lambda d: (abs(month_index(d) - month_index(date)), d))
+        for reference_date in other_dates:
+            # CROSS JOIN keeps the date's areas (idx_crime_areas_date) as the outer loop
+            cursor.execute(
+                """SELECT c.north, c.south, c.east, c.west, ca.crime_count
+                   FROM crime_areas ca CROSS JOIN area_cells c ON c.id = ca.cell_id
+                   WHERE ca.date = ? AND c.north > ? AND c.south < ? AND c.east > ? AND c.west < ?""",
+                (reference_date, south, north, west, east)
+            )
+            rows = cursor.fetchall()
+            if rows:
+                break
+        else:
+            return None, None
+        rows = np.array(rows, dtype=float).reshape(-1, 5)
+        bounds, counts = rows[:, :4], rows[:, 4]
+        areas = (bounds[:, 0] - bounds[:, 1]) * (bounds[:, 2] - bounds[:, 3])
+
+        # Keep a non-overlapping subset, smallest boxes first
+        keep = []
+        for idx in np.argsort(areas):
+            if areas[idx] <= 0:
+                continue
+            if keep:
+                kept = bounds[keep]
+                overlap_lat = np.minimum(kept[:, 0], bounds[idx, 0]) - np.maximum(kept[:, 1], bounds[idx, 1])
+                overlap_lon = np.minimum(kept[:, 2], bounds[idx, 2]) - np.maximum(kept[:, 3], bounds[idx, 3])
+                if np.any((overlap_lat > 1e-12) & (overlap_lon > 1e-12)):
+                    continue
+            keep.append(idx)
+        bounds, counts, areas = bounds[keep], counts[keep], areas[keep]
+        threshold = MAX_CRIMES_LIMIT * PREDICTIVE_SPLIT_SAFETY
+
+        def estimate_crimes(north, south, east, west):
+            """Area-weighted sum of known counts overlapping the box (uniform density per area)."""
+            overlap_lat = np.clip(np.minimum(bounds[:, 0], north) - np.maximum(bounds[:, 1], south), 0, None)
+            overlap_lon = np.clip(np.minimum(bounds[:, 2], east) - np.maximum(bounds[:, 3], west), 0, None)
+            return float(np.sum(counts * overlap_lat * overlap_lon / areas))
+
+        def predict_split(north, south, east, west):
+            estimate = estimate_crimes(north, south, east, west)
+            return estimate if estimate > threshold else None
+
+        return predict_split, reference_date
+
+    return (load_density_predictor,)
+
+
 @app.cell
 def bisection_algorithm(
     TARGET_MAX_CRIMES,
     TARGET_MIN_CRIMES,
+    area_has_uk_land,
+    area_inside_uk_land,
     bounds_to_polygon,
-    box,
     check_area_cached,
-    conn,
-    cursor,
+    check_split_cached,
     fetch_crimes,
-    insert_crimes_batch,
-    split_bounds_quad,
-    uk_boundary_polygon,
+    get_root_id,
+    has_leaves_under,
+    ingest_writer,
+    load_run_frontier,
+    load_run_leaves,
+    partition_payload,
+    root_cell,
+    split_cell,
 ):
-    def process_area(north, south, east, west, date, api_call_counter, results_buffer, cache_hits, depth=0, max_depth=15):
+    def process_area(north, south, east, west, date, api_call_counter, results_buffer, cache_hits, depth=0, max_depth=15,
+                     predict_split=None, predicted_splits=None, inland=False, cell=None, run_id=None):
         """
         Recursively process an area using bisection strategy.
 
@@ -956,42 +3278,96 @@ def bisection_algorithm(
             cache_hits: List with single element to track cache hits
             depth: Current recursion depth
             max_depth: Maximum recursion depth to prevent infinite loops
+            predict_split: Optional estimator from load_density_predictor; boxes it
+                predicts must split are split without an API call
+            predicted_splits: List with single element to track skipped calls
+            inland: True if an ancestor box lies entirely on land (skips land tests)
+            cell: Quadtree key (root_id, depth, quadkey) of this box; None registers
+                the box as a new root
+            run_id: Optional checkpointed run from start_bisection_run. Every node's
+                outcome is recorded in run_state; a top-level call (cell=None)
+                continues from the run's stored frontier instead of the root box
 
         Returns:
-            List of tuples: [(polygon_coords, crime_count), ...]
+            List of tuples: [(polygon_coords, crime_count, cell), ...]
         """
         results = []
+        if run_id is not None and cell is None:
+            # Resume: the leaves the run already stored, then each pending box
+            results = [(bounds_to_polygon(*bounds), crime_count, leaf_cell)
+                       for _, bounds, leaf_cell, _, crime_count, _ in load_run_leaves(run_id)]
+            for _, bounds, node_cell, _, _, node_inland in load_run_frontier(run_id):
+                results.extend(process_area(*bounds, date, api_call_counter, results_buffer, cache_hits, node_cell[1], max_depth,
+                                            predict_split, predicted_splits, node_inland, node_cell, run_id))
+            return results
+        if cell is None:
+            cell = root_cell(get_root_id((north, south, east, west)))
+
+        def checkpoint(state, crime_count=None, children=()):
+            """Record this box's outcome, and its children as pending, in a checkpointed run."""
+            if run_id is not None:
+                nodes = [((north, south, east, west), cell, date, state, crime_count, inland)]
+                nodes += [(quad, child, date, 'pending', None, inland) for quad, child in children]
+                ingest_writer.submit_run_state(run_id, nodes)
+
+        def split_children():
+            children = split_cell(north, south, east, west, cell)
+            checkpoint('split', children=children)
+            if run_id is not None:
+                # Commit the split before any child is requested: once a restart
+                # could see the children's answers, it also sees this box's
+                ingest_writer.flush()
+            for quad, child in children:
+                results.extend(process_area(*quad, date, api_call_counter, results_buffer, cache_hits, depth + 1, max_depth,
+                                            predict_split, predicted_splits, inland, child, run_id))
 
         # Prevent infinite recursion
         if depth > max_depth:
             print(f"Max depth {max_depth} reached, stopping recursion")
+            checkpoint('skipped')
             return results
 
         indent = "  " * depth
 
-        # Create a box for this area (west, south, east, north)
-        area_box = box(west, south, east, north)
-
-        # Check if this area intersects with UK boundary
-        if not area_box.intersects(uk_boundary_polygon):
-            print(f"{indent}Depth {depth}: Area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f}) - Skipping (no UK land)")
-            return results
+        # Check if this area intersects with UK boundary (sub-boxes of an all-land box skip the test)
+        if not inland:
+            if not area_has_uk_land(north, south, east, west):
+                print(f"{indent}Depth {depth}: Area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f}) - Skipping (no UK land)")
+                checkpoint('skipped')
+                return results
+            inland = area_inside_uk_land(north, south, east, west)
 
         # Convert bounds to polygon
         polygon_coords = bounds_to_polygon(north, south, east, west)
-        polygon_str = ":".join([f"{lat},{lon}" for lat, lon in polygon_coords])
 
         # Check cache before making API call
-        cached_count = check_area_cached(polygon_str, date)
+        cached_count = check_area_cached(cell, date)
         if cached_count is not None:
             cache_hits[0] += 1
             print(f"{indent}Depth {depth}: Area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f}) - ✓ CACHED ({cached_count} crimes)")
-            results.append((polygon_coords, cached_count))
+            checkpoint('leaf', cached_count)
+            results.append((polygon_coords, cached_count, cell))
+            return results
+
+        # Split in an earlier run for this date (recorded 503, or areas stored below it);
+        # an over-target box is refetched, as one payload holds all its leaves
+        if check_split_cached(cell, date) is not None or has_leaves_under(cell, date):
+            cache_hits[0] += 1
+            print(f"{indent}Depth {depth}: Area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f}) - ✓ CACHED (split earlier), splitting without API call")
+            split_children()
+            return results
+
+        # Predicted over the API limit from earlier data: split without calling
+        estimate = predict_split(north, south, east, west) if predict_split else None
+        if estimate is not None:
+            predicted_splits[0] += 1
+            print(f"{indent}Depth {depth}: Area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f}) - ~{estimate:.0f} crimes predicted, splitting without API call")
+            split_children()
             return results
 
         # Not cached, fetch from API
         print(f"{indent}Depth {depth}: Checking area ({north:.3f}, {south:.3f}, {east:.3f}, {west:.3f})")
-        status_code, data, crime_count = fetch_crimes(polygon_coords, date)
+        status_code, data, crime_count = fetch_crimes(polygon_coords, date, depth=depth)
 
         # Increment API call counter
         api_call_counter[0] += 1
@@ -999,91 +3375,274 @@ def bisection_algorithm(
         # Handle different status codes
         if status_code == 503:
             # 503: Service unavailable (crimes > 10000)
-            error_msg = "too many crimes" if status_code == 503 else "area size too large"
-            print(f"{indent}  -> {status_code} Error ({error_msg}), splitting into 4 quadrants")
-            quadrants = split_bounds_quad(north, south, east, west)
-            for quad in quadrants:
-                results.extend(process_area(*quad, date, api_call_counter, results_buffer, cache_hits, depth + 1, max_depth))
+            print(f"{indent}  -> {status_code} Error (too many crimes), splitting into 4 quadrants")
+            ingest_writer.submit_split((north, south, east, west), cell, date, status_code)
+            split_children()
 
         elif status_code == 200:
             # Success - check if crime count is in target range
             print(f"{indent}  -> {crime_count} crimes found")
 
             if crime_count > TARGET_MAX_CRIMES:
-                # Too many crimes, split into 4 quadrants
-                print(f"{indent}  -> Above target ({TARGET_MAX_CRIMES}), splitting")
-                quadrants = split_bounds_quad(north, south, east, west)
-                for quad in quadrants:
-                    results.extend(process_area(*quad, date, api_call_counter, results_buffer, cache_hits, depth + 1, max_depth))
+                # Too many crimes, but the payload already holds every crime in the box:
+                # split it by quadrant in memory instead of fetching the quadrants again
+                print(f"{indent}  -> Above target ({TARGET_MAX_CRIMES}), splitting payload locally (no extra API calls)")
+                leaves = partition_payload(
+                    north, south, east, west, data, cell, max_depth,
+                    area_has_uk_land if not inland else (lambda *bounds: True)
+                )
+                # One job: the leaves commit together with the box's split state, so a
+                # resume never reports them twice (once stored, once under the pending box)
+                ingest_writer.submit_partition((north, south, east, west), cell, date, leaves, run_id, inland)
+                for leaf_bounds, leaf_cell, leaf_crimes in leaves:
+                    leaf_coords = bounds_to_polygon(*leaf_bounds)
+                    leaf_depth = leaf_cell[1]
+                    leaf_indent = "  " * leaf_depth
+                    print(f"{leaf_indent}Depth {leaf_depth}: Local area ({leaf_bounds[0]:.3f}, {leaf_bounds[1]:.3f}, {leaf_bounds[2]:.3f}, {leaf_bounds[3]:.3f}) "
+                          f"- {len(leaf_crimes)} crimes, queued for saving")
+                    results.append((leaf_coords, len(leaf_crimes), leaf_cell))
 
-            elif crime_count >= TARGET_MIN_CRIMES:
-                # Perfect range! Save area and crimes immediately
-                print(f"{indent}  -> ✓ In target range ({TARGET_MIN_CRIMES}-{TARGET_MAX_CRIMES}), saving area and crimes")
+            else:
+                if crime_count >= TARGET_MIN_CRIMES:
+                    # Perfect range! Save area and crimes immediately
+                    print(f"{indent}  -> ✓ In target range ({TARGET_MIN_CRIMES}-{TARGET_MAX_CRIMES}), saving area and crimes")
+                else:
+                    # Too few crimes, but save anyway for completeness
+                    print(f"{indent}  -> Below target ({TARGET_MIN_CRIMES}), saving area and crimes")
 
-                try:
-                    # Insert area (or ignore if exists)
-                    cursor.execute(
-                        """INSERT OR IGNORE INTO crime_areas (polygon, crime_count, date)
-                           VALUES (?, ?, ?)""",
-                        (polygon_str, crime_count, date)
-                    )
+                ingest_writer.submit((north, south, east, west), crime_count, date, data, cell, run_id)
+                print(f"{indent}  -> ✓ Queued area and {crime_count} crimes for saving")
+                results.append((polygon_coords, crime_count, cell))
 
-                    # Get the area_id (either newly inserted or existing)
-                    cursor.execute(
-                        """SELECT id FROM crime_areas WHERE polygon = ? AND date = ?""",
-                        (polygon_str, date)
-                    )
-                    area_id = cursor.fetchone()[0]
+        else:
+            # Throttling/transient errors that survived retries, or client errors.
+            # Splitting would only multiply the failing requests, so skip the area
+            # (already recorded in api_error_log; it stays pending, so a rerun retries it).
+            print(f"{indent}  -> Error {status_code} after retries, skipping area")
 
-                    # Insert individual crimes
-                    crimes_inserted = insert_crimes_batch(area_id, data)
-                    print(f"{indent}  -> ✓ Saved area_id={area_id}, inserted {crimes_inserted} individual crimes")
+        return results
+    return (process_area,)
 
-                    conn.commit()
-                    results.append((polygon_coords, crime_count))
 
-                except Exception as e:
-                    print(f"{indent}  -> ⚠ Error saving area/crimes: {e}")
+@app.cell
+def async_bisection_algorithm(
+    CircuitOpenError,
+    IngestWriterError,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_RECURSION_DEPTH,
+    TARGET_MAX_CRIMES,
+    TARGET_MIN_CRIMES,
+    asyncio,
+    area_has_uk_land,
+    area_inside_uk_land,
+    bounds_to_polygon,
+    check_area_cached,
+    check_split_cached,
+    connect_db,
+    fetch_crimes_async,
+    format_polygon,
+    get_root_id,
+    has_leaves_under,
+    ingest_writer,
+    load_run_frontier,
+    load_run_leaves,
+    new_async_http_client,
+    partition_payload,
+    root_cell,
+    split_cell,
+):
+    """Concurrent breadth-first bisection engine built on fetch_crimes_async."""
 
-            else:
-                # Too few crimes, but save anyway for completeness
-                print(f"{indent}  -> Below target ({TARGET_MIN_CRIMES}), saving area and crimes")
+    async def process_area_async(north, south, east, west, date, api_call_counter, results_buffer, cache_hits, max_depth=MAX_RECURSION_DEPTH,
+                                 predict_split=None, predicted_splits=None, run_id=None):
+        """
+        Bisect an area breadth-first with concurrent API calls.
 
-                try:
-                    # Insert area (or ignore if exists)
-                    cursor.execute(
-                        """INSERT OR IGNORE INTO crime_areas (polygon, crime_count, date)
-                           VALUES (?, ?, ?)""",
-                        (polygon_str, crime_count, date)
-                    )
+        Pending boxes live on a FIFO frontier queue. A pool of workers pulls
+        boxes off the frontier and fetches them concurrently; every split
+        pushes its four quadrants back onto the frontier so siblings are
+        fetched in parallel instead of one at a time.
+        Cache checks go to the in-memory area_cache; areas are saved through
+        the ingest writer so SQLite writes never block the event loop.
 
-                    # Get the area_id
-                    cursor.execute(
-                        """SELECT id FROM crime_areas WHERE polygon = ? AND date = ?""",
-                        (polygon_str, date)
-                    )
-                    area_id = cursor.fetchone()[0]
+        Args:
+            north, south, east, west: Bounding box coordinates
+            date: Date string in YYYY-MM format
+            api_call_counter: List with single element to track total API calls
+            results_buffer: List to collect results for batch commit
+            cache_hits: List with single element to track cache hits
+            max_depth: Maximum split depth to prevent infinite loops
+            predict_split: Optional estimator from load_density_predictor; boxes it
+                predicts must split are split without an API call
+            predicted_splits: List with single element to track skipped calls
+            run_id: Optional checkpointed run from start_bisection_run. Every node's
+                outcome is recorded in run_state, and the frontier starts from the
+                run's pending boxes instead of the root box
+
+        Returns:
+            List of tuples: [(polygon_coords, crime_count, cell), ...]
+        """
+        # Create database connection in this thread (registers the root box)
+        conn = connect_db()
+        cursor = conn.cursor()
 
-                    # Insert individual crimes
-                    crimes_inserted = insert_crimes_batch(area_id, data)
-                    print(f"{indent}  -> ✓ Saved area_id={area_id}, inserted {crimes_inserted} individual crimes")
+        results = []
+        frontier = asyncio.Queue()
+        if run_id is None:
+            root = root_cell(get_root_id((north, south, east, west), db_cursor=cursor))
+            frontier.put_nowait((north, south, east, west, root, False))
+        else:
+            # Resume: the leaves the run already stored, then its pending boxes
+            for _, bounds, cell, _, crime_count, _ in load_run_leaves(run_id, cursor):
+                results.append((bounds_to_polygon(*bounds), crime_count, cell))
+            for _, bounds, cell, _, _, inland in load_run_frontier(run_id, cursor):
+                frontier.put_nowait((*bounds, cell, inland))
 
-                    conn.commit()
-                    results.append((polygon_coords, crime_count))
+        # Create semaphore for rate limiting
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-                except Exception as e:
-                    print(f"{indent}  -> ⚠ Error saving area/crimes: {e}")
+        async def checkpoint(bounds, cell, state, inland, crime_count=None, children=()):
+            """Record a box's outcome, and its children as pending, in a checkpointed run."""
+            if run_id is not None:
+                nodes = [(bounds, cell, date, state, crime_count, inland)]
+                nodes += [(quad, child, date, 'pending', None, inland) for quad, child in children]
+                await ingest_writer.submit_run_state_async(run_id, nodes)
+
+        async def split_children(bounds, cell, inland):
+            children = split_cell(*bounds, cell)
+            await checkpoint(bounds, cell, 'split', inland, children=children)
+            if run_id is not None:
+                # Commit the split before any child is requested: once a restart
+                # could see the children's answers, it also sees this box's
+                await ingest_writer.flush_async()
+            return children, inland
+
+        async def process_node(client, n, s, e, w, cell, inland):
+            """
+            Process one box. Returns (child (bounds, cell) pairs to push onto the
+            frontier, inland), where inland is True if the box lies entirely on land.
+            """
+            depth = cell[1]
+            label = f"Depth {depth}: Area ({n:.3f}, {s:.3f}, {e:.3f}, {w:.3f})"
+
+            if depth > max_depth:
+                print(f"{label} - Max depth {max_depth} reached, stopping")
+                await checkpoint((n, s, e, w), cell, 'skipped', inland)
+                return [], inland
+
+            # Check if this area intersects with UK boundary (sub-boxes of an all-land box skip the test)
+            if not inland:
+                if not area_has_uk_land(n, s, e, w):
+                    print(f"{label} - Skipping (no UK land)")
+                    await checkpoint((n, s, e, w), cell, 'skipped', inland)
+                    return [], inland
+                inland = area_inside_uk_land(n, s, e, w)
+
+            polygon_coords = bounds_to_polygon(n, s, e, w)
+
+            # Check cache before making API call
+            cached_count = check_area_cached(cell, date)
+            if cached_count is not None:
+                cache_hits[0] += 1
+                print(f"{label} - ✓ CACHED ({cached_count} crimes)")
+                await checkpoint((n, s, e, w), cell, 'leaf', inland, cached_count)
+                results.append((polygon_coords, cached_count, cell))
+                return [], inland
+
+            # Split in an earlier run for this date (recorded 503, or areas stored below it);
+            # an over-target box is refetched, as one payload holds all its leaves
+            if check_split_cached(cell, date) is not None or has_leaves_under(cell, date):
+                cache_hits[0] += 1
+                print(f"{label} - ✓ CACHED (split earlier), splitting without API call")
+                return await split_children((n, s, e, w), cell, inland)
+
+            # Predicted over the API limit from earlier data: split without calling
+            estimate = predict_split(n, s, e, w) if predict_split else None
+            if estimate is not None:
+                predicted_splits[0] += 1
+                print(f"{label} - ~{estimate:.0f} crimes predicted, splitting without API call")
+                return await split_children((n, s, e, w), cell, inland)
+
+            # Don't spend a request on a response that could not be saved
+            ingest_writer.check_alive()
+            status_code, data, crime_count = await fetch_crimes_async(
+                client, semaphore, polygon_coords, date, format_polygon, depth=depth
+            )
+            api_call_counter[0] += 1
 
-        else:
-            # Other errors (500, timeout, etc.)
-            # For robustness, try splitting these too (might be area-size related)
-            print(f"{indent}  -> Error {status_code}, trying to split anyway")
-            quadrants = split_bounds_quad(north, south, east, west)
-            for quad in quadrants:
-                results.extend(process_area(*quad, date, api_call_counter, results_buffer, cache_hits, depth + 1, max_depth))
+            if status_code == 503:
+                print(f"{label} - 503 Error (too many crimes), splitting into 4 quadrants")
+                await ingest_writer.submit_split_async((n, s, e, w), cell, date, status_code)
+                return await split_children((n, s, e, w), cell, inland)
+
+            if status_code != 200:
+                # Errors that survived retries: skip rather than multiply failing requests
+                # (the box stays pending, so resuming the run retries it)
+                print(f"{label} - Error {status_code} after retries, skipping area")
+                return [], inland
+
+            if crime_count > TARGET_MAX_CRIMES:
+                # Payload holds every crime in the box: resolve the quadrants locally
+                print(f"{label} - {crime_count} crimes, above target ({TARGET_MAX_CRIMES}), splitting payload locally")
+                leaves = partition_payload(
+                    n, s, e, w, data, cell, max_depth,
+                    area_has_uk_land if not inland else (lambda *bounds: True)
+                )
+                # One job: the leaves commit together with the box's split state, so a
+                # resume never reports them twice (once stored, once under the pending box)
+                await ingest_writer.submit_partition_async((n, s, e, w), cell, date, leaves, run_id, inland)
+                for leaf_bounds, leaf_cell, leaf_crimes in leaves:
+                    leaf_coords = bounds_to_polygon(*leaf_bounds)
+                    leaf_label = f"Depth {leaf_cell[1]}: Local area ({leaf_bounds[0]:.3f}, {leaf_bounds[1]:.3f}, {leaf_bounds[2]:.3f}, {leaf_bounds[3]:.3f})"
+                    print(f"{leaf_label} - {len(leaf_crimes)} crimes, queued for saving")
+                    results.append((leaf_coords, len(leaf_crimes), leaf_cell))
+                return [], inland
+
+            in_range = "in target range" if crime_count >= TARGET_MIN_CRIMES else "below target"
+            await ingest_writer.submit_async((n, s, e, w), crime_count, date, data, cell, run_id)
+            print(f"{label} - {crime_count} crimes ({in_range}), queued for saving")
+            results.append((polygon_coords, crime_count, cell))
+            return [], inland
+
+        stop_error = []
+
+        async def worker(client):
+            """Pull boxes off the frontier until cancelled."""
+            while True:
+                n, s, e, w, cell, inland = await frontier.get()
+                depth = cell[1]
+                try:
+                    if not stop_error:
+                        children, inland = await process_node(client, n, s, e, w, cell, inland)
+                        for quad, child in children:
+                            frontier.put_nowait((*quad, child, inland))
+                except (CircuitOpenError, IngestWriterError) as exc:
+                    # API is down or the writer has stopped: stop expanding, let the remaining frontier drain
+                    stop_error.append(exc)
+                except Exception as exc:
+                    print(f"Depth {depth}: ⚠ Unexpected error processing area: {exc}")
+                finally:
+                    frontier.task_done()
+
+        async with new_async_http_client() as client:
+            workers = [
+                asyncio.create_task(worker(client))
+                for _ in range(MAX_CONCURRENT_REQUESTS)
+            ]
+            # Frontier is drained once every pushed box has been processed
+            await frontier.join()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        # Close the connection we created
+        conn.close()
 
+        if stop_error:
+            raise stop_error[0]
         return results
-    return (process_area,)
+
+    return (process_area_async,)
 
 
 @app.cell
@@ -1104,6 +3663,24 @@ def test_execution_controls(mo):
         label="Show UK boundary on map"
     )
 
+    # Create hotspot layer toggle
+    show_hotspots = mo.ui.checkbox(
+        value=True,
+        label="Show crime hotspots within the map area"
+    )
+
+    # Create bisection engine toggle
+    use_async_bisection = mo.ui.checkbox(
+        value=True,
+        label="Use Async Bisection (breadth-first, concurrent API calls)"
+    )
+
+    # Create predictive split toggle
+    use_predictive_split = mo.ui.checkbox(
+        value=True,
+        label="Predictive split (skip API calls for boxes predicted over the limit from earlier months)"
+    )
+
     mo.vstack([
         mo.md("""
         ## Execution Controls
@@ -1112,37 +3689,29 @@ def test_execution_controls(mo):
         """),
         test_date,
         test_area,
-        show_boundaries
+        show_boundaries,
+        show_hotspots,
+        use_async_bisection,
+        use_predictive_split
     ])
-    return show_boundaries, test_area, test_date
+    return (
+        show_boundaries,
+        show_hotspots,
+        test_area,
+        test_date,
+        use_async_bisection,
+        use_predictive_split,
+    )
 
 
 @app.cell
-def test_area_bounds(UK_BOUNDS, UK_FULL_BOUNDS, test_area):
-    # Define test areas
-    test_areas = {
-        "small": {  # London area
-            "north": 51.7,
-            "south": 51.3,
-            "east": 0.3,
-            "west": -0.5
-        },
-        "medium": {  # South East England
-            "north": 52.0,
-            "south": 50.5,
-            "east": 1.5,
-            "west": -1.5
-        },
-        "large": UK_BOUNDS,        # England mainland
-        "full": UK_FULL_BOUNDS     # Full UK (England, Scotland, Wales, N. Ireland)
-    }
-
-    selected_bounds = test_areas[test_area.value]
+def test_area_bounds(TEST_AREA_BOUNDS, test_area):
+    selected_bounds = TEST_AREA_BOUNDS[test_area.value]
     return (selected_bounds,)
 
 
 @app.cell
-def execute_bisection(mo, test_area, test_date):
+def execute_bisection(mo, test_area, test_date, use_async_bisection):
     area_labels = {
         "small": "Small Test (London area)",
         "medium": "Medium Test (South East England)",
@@ -1158,6 +3727,7 @@ def execute_bisection(mo, test_area, test_date):
 
         **Date**: {test_date.value}
         **Area**: {area_labels.get(test_area.value, test_area.value)}
+        **Engine**: {"Async (breadth-first, concurrent)" if use_async_bisection.value else "Sync (recursive, sequential)"}
 
         Click the button below to start the bisection algorithm.
         """),
@@ -1180,6 +3750,7 @@ def bisection_execution_helpers():
         return {
             'api_call_counter': [0],
             'cache_hits': [0],
+            'predicted_splits': [0],
             'results_buffer': []
         }
 
@@ -1190,12 +3761,14 @@ def bisection_execution_helpers():
         print(f"Bounds: {bounds}")
         print("-" * 60)
 
-    def print_bisection_summary(results, api_calls, cache_hits):
+    def print_bisection_summary(results, api_calls, cache_hits, predicted_splits=0):
         """Print summary statistics after bisection completes."""
         print("-" * 60)
         print(f"Completed! Found {len(results)} areas in target range.")
         print(f"Total API calls made: {api_calls}")
         print(f"Cache hits: {cache_hits} (avoided {cache_hits} API calls)")
+        if predicted_splits:
+            print(f"Predicted splits: {predicted_splits} (avoided {predicted_splits} API calls)")
 
         if api_calls + cache_hits > 0:
             cache_rate = cache_hits / (api_calls + cache_hits) * 100
@@ -1204,22 +3777,26 @@ def bisection_execution_helpers():
 
 
 @app.cell
-def bisection_executor_function():
+def bisection_executor_function(run_async):
     """Wrapper for bisection execution logic."""
-    def execute_bisection_algorithm(process_area, selected_bounds, test_date, counters):
+    import inspect
+
+    def execute_bisection_algorithm(process_area, selected_bounds, test_date, counters, predict_split=None, run_id=None):
         """
         Execute the bisection algorithm with given parameters.
 
         Args:
-            process_area: The bisection algorithm function
+            process_area: The bisection algorithm function (sync or async)
             selected_bounds: Dictionary with north, south, east, west keys
             test_date: Date string in YYYY-MM format
-            counters: Dictionary with api_call_counter, cache_hits, results_buffer
+            counters: Dictionary with api_call_counter, cache_hits, predicted_splits, results_buffer
+            predict_split: Optional estimator from load_density_predictor
+            run_id: Optional checkpointed run from start_bisection_run
 
         Returns:
-            List of (polygon_coords, crime_count) tuples
+            List of (polygon_coords, crime_count, cell) tuples
         """
-        results = process_area(
+        kwargs = dict(
             north=selected_bounds["north"],
             south=selected_bounds["south"],
             east=selected_bounds["east"],
@@ -1228,21 +3805,36 @@ def bisection_executor_function():
             api_call_counter=counters['api_call_counter'],
             results_buffer=counters['results_buffer'],
             cache_hits=counters['cache_hits'],
+            predict_split=predict_split,
+            predicted_splits=counters['predicted_splits'],
+            run_id=run_id,
         )
-        return results
+        if inspect.iscoroutinefunction(process_area):
+            return run_async(process_area, **kwargs)
+        return process_area(**kwargs)
     return (execute_bisection_algorithm,)
 
 
 @app.cell
 def run_bisection_process(
+    CircuitOpenError,
+    api_circuit_breaker,
     execute_bisection_algorithm,
+    finish_run,
+    get_run_progress,
+    ingest_writer,
     initialize_counters,
+    load_density_predictor,
     print_bisection_header,
     print_bisection_summary,
     process_area,
+    process_area_async,
     run_button,
     selected_bounds,
+    start_bisection_run,
     test_date,
+    use_async_bisection,
+    use_predictive_split,
 ):
     """Main orchestrator for bisection execution."""
     run_button  # Create dependency
@@ -1250,23 +3842,55 @@ def run_bisection_process(
     if run_button.value:
         # Initialize
         counters = initialize_counters()
+        api_circuit_breaker.reset()
 
         # Print header
         print_bisection_header(test_date.value, selected_bounds)
 
-        # Execute bisection
-        results = execute_bisection_algorithm(
-            process_area,
-            selected_bounds,
-            test_date.value,
-            counters
-        )
+        # Checkpointed run: an unfinished run for the same box and date is resumed
+        root_bounds = (selected_bounds["north"], selected_bounds["south"], selected_bounds["east"], selected_bounds["west"])
+        bisection_run_id, bisection_resumed = start_bisection_run(root_bounds, test_date.value)
+        if bisection_resumed:
+            run_progress = get_run_progress(bisection_run_id)
+            print(f"Resuming run {bisection_run_id}: {run_progress.get('pending', 0)} boxes pending, "
+                  f"{run_progress.get('leaf', 0)} leaves and {run_progress.get('split', 0)} splits already recorded")
+
+        # Build a density predictor from the closest month stored for this area, if requested and available
+        predict_split = None
+        if use_predictive_split.value:
+            predict_split, reference_date = load_density_predictor(test_date.value, root_bounds)
+            if predict_split:
+                print(f"Predictive split: using crime density from {reference_date}")
+            else:
+                print("Predictive split: no earlier data, every box will be fetched")
+
+        # Execute bisection with the selected engine
+        try:
+            results = execute_bisection_algorithm(
+                process_area_async if use_async_bisection.value else process_area,
+                selected_bounds,
+                test_date.value,
+                counters,
+                predict_split=predict_split,
+                run_id=bisection_run_id,
+            )
+        except CircuitOpenError as e:
+            # Saved areas and the run's frontier are already in the database; a rerun resumes the run
+            print(f"⛔ Run stopped: {e}. See the error log below.")
+            results = []
+        finally:
+            # Commit everything queued before the summary and views read it
+            ingest_writer.flush()
+        bisection_remaining = finish_run(bisection_run_id)
+        if bisection_remaining:
+            print(f"Run {bisection_run_id} has {bisection_remaining} boxes left; run again to resume it")
 
         # Print summary
         print_bisection_summary(
             results,
             counters['api_call_counter'][0],
-            counters['cache_hits'][0]
+            counters['cache_hits'][0],
+            counters['predicted_splits'][0]
         )
 
         # Store results
@@ -1283,12 +3907,17 @@ def run_bisection_process(
 @app.cell
 def map_helper_functions(folium):
     """Helper functions for map creation and manipulation."""
+    def calculate_map_bounds(bisection_results):
+        """Calculate (north, south, east, west) covering all bisection results."""
+        all_lats = [coord[0] for coords, *_ in bisection_results for coord in coords]
+        all_lons = [coord[1] for coords, *_ in bisection_results for coord in coords]
+        return max(all_lats), min(all_lats), max(all_lons), min(all_lons)
+
     def calculate_map_center(bisection_results):
         """Calculate center point from bisection results."""
-        all_lats = [coord[0] for coords, _ in bisection_results for coord in coords]
-        all_lons = [coord[1] for coords, _ in bisection_results for coord in coords]
-        center_lat = (max(all_lats) + min(all_lats)) / 2
-        center_lon = (max(all_lons) + min(all_lons)) / 2
+        north, south, east, west = calculate_map_bounds(bisection_results)
+        center_lat = (north + south) / 2
+        center_lon = (east + west) / 2
         return center_lat, center_lon
 
     def create_base_map(center_lat, center_lon, zoom_start=8):
@@ -1298,7 +3927,7 @@ def map_helper_functions(folium):
             zoom_start=zoom_start,
             tiles='OpenStreetMap'
         )
-    return calculate_map_center, create_base_map
+    return calculate_map_bounds, calculate_map_center, create_base_map
 
 
 @app.cell
@@ -1359,10 +3988,10 @@ def area_rendering_functions(folium):
 
         Args:
             map_obj: Folium map object
-            bisection_results: List of (polygon_coords, crime_count) tuples
+            bisection_results: List of (polygon_coords, crime_count, cell) tuples
         """
         # Start enumeration at 1 to match database area_id
-        for idx, (polygon_coords, crime_count) in enumerate(bisection_results, start=1):
+        for idx, (polygon_coords, crime_count, cell) in enumerate(bisection_results, start=1):
             # Convert to list of [lat, lon] for folium
             locations = [[lat, lon] for lat, lon in polygon_coords]
 
@@ -1377,6 +4006,7 @@ def area_rendering_functions(folium):
                 popup=folium.Popup(
                     f"<b>Area {idx}</b><br>"
                     f"Crimes: {crime_count:,}<br>"
+                    f"Cell: depth {cell[1]}, quadkey {cell[2]:#x}<br>"
                     f"Bounds:<br>"
                     f"N: {max([c[0] for c in polygon_coords]):.4f}<br>"
                     f"S: {min([c[0] for c in polygon_coords]):.4f}<br>"
@@ -1389,12 +4019,54 @@ def area_rendering_functions(folium):
     return (add_area_polygons_to_map,)
 
 
+@app.cell
+def hotspot_rendering_functions(folium):
+    """Functions for rendering crime hotspots on map."""
+    # Hotspot styling constants
+    HOTSPOT_COLOR = '#d62728'      # Red
+    HOTSPOT_MAP_LIMIT = 200        # Busiest locations drawn per map
+    HOTSPOT_MIN_RADIUS = 3         # Marker radius in px for a 2-crime location
+    HOTSPOT_MAX_RADIUS = 15
+
+    def add_hotspots_to_map(map_obj, hotspots):
+        """
+        Add crime hotspot markers to folium map, sized by crime count.
+
+        Args:
+            map_obj: Folium map object
+            hotspots: List of (latitude, longitude, street_name, crime_count, crime_types)
+                      tuples, as returned by hotspots_in_bbox
+        """
+        if not hotspots:
+            return
+        max_count = max(count for _, _, _, count, _ in hotspots)
+        for latitude, longitude, street_name, crime_count, crime_types in hotspots:
+            scale = (crime_count - 2) / max(max_count - 2, 1)
+            folium.CircleMarker(
+                location=[latitude, longitude],
+                radius=HOTSPOT_MIN_RADIUS + scale * (HOTSPOT_MAX_RADIUS - HOTSPOT_MIN_RADIUS),
+                color=HOTSPOT_COLOR,
+                weight=1,
+                fill=True,
+                fillColor=HOTSPOT_COLOR,
+                fillOpacity=0.6,
+                popup=folium.Popup(
+                    f"<b>{street_name or 'Unknown location'}</b><br>"
+                    f"Crimes: {crime_count:,}<br>"
+                    f"Types: {(crime_types or '').replace(',', ', ')}",
+                    max_width=300
+                ),
+                tooltip=f"{street_name or 'Unknown location'}: {crime_count:,} crimes"
+            ).add_to(map_obj)
+    return HOTSPOT_MAP_LIMIT, add_hotspots_to_map
+
+
 @app.cell
 def statistics_functions():
     """Functions for calculating and formatting statistics."""
     def calculate_crime_statistics(bisection_results):
         """Calculate statistics from bisection results."""
-        crime_counts = [count for _, count in bisection_results]
+        crime_counts = [count for _, count, _ in bisection_results]
         return {
             'crime_counts': crime_counts,
             'total_crimes': sum(crime_counts),
@@ -1420,25 +4092,31 @@ def statistics_functions():
         - **API Calls Made**: {total_api_calls}
         - **Cache Hits**: {total_cache_hits} ({cache_rate:.1f}% cache hit rate)
 
-        **Map**: Blue polygons show bisected areas. Click for details, hover for quick stats.
+        **Map**: Blue polygons show bisected areas, red circles the busiest crime locations. Click for details, hover for quick stats.
         """
     return calculate_crime_statistics, format_statistics_markdown
 
 
 @app.cell
 def visualize_results(
+    HOTSPOT_MAP_LIMIT,
     add_area_polygons_to_map,
+    add_hotspots_to_map,
     add_uk_boundary_to_map,
     bisection_results,
+    boundary_for_zoom,
     calculate_crime_statistics,
+    calculate_map_bounds,
     calculate_map_center,
     create_base_map,
     format_statistics_markdown,
+    hotspots_in_bbox,
     mo,
     show_boundaries,
+    show_hotspots,
+    test_date,
     total_api_calls,
     total_cache_hits,
-    uk_boundary_polygon,
 ):
     """Main visualization orchestrator function."""
     if len(bisection_results) == 0:
@@ -1448,13 +4126,19 @@ def visualize_results(
         center_lat, center_lon = calculate_map_center(bisection_results)
         m = create_base_map(center_lat, center_lon)
 
-        # Add UK boundary if requested
+        # Add UK boundary if requested, simplified to the map's zoom level
         if show_boundaries.value:
-            add_uk_boundary_to_map(m, uk_boundary_polygon)
+            add_uk_boundary_to_map(m, boundary_for_zoom(m.options['zoom']))
 
         # Add area polygons
         add_area_polygons_to_map(m, bisection_results)
 
+        # Add hotspots inside the mapped area (an R*Tree lookup, not a scan of crimes)
+        if show_hotspots.value:
+            add_hotspots_to_map(m, hotspots_in_bbox(
+                *calculate_map_bounds(bisection_results), month=test_date.value, limit=HOTSPOT_MAP_LIMIT
+            ))
+
         # Calculate and format statistics
         stats = calculate_crime_statistics(bisection_results)
         stats_md = format_statistics_markdown(stats, total_api_calls, total_cache_hits)
@@ -1509,7 +4193,7 @@ def database_summary_stats(conn, pl, mo):
 
     def get_summary_stats_display():
         """Create and return the summary statistics display."""
-        # Query all the views we created
+        # Query the views over the materialised summary tables
         monthly_stats = pl.read_database("SELECT * FROM monthly_totals", conn)
         category_stats = pl.read_database("SELECT * FROM category_totals", conn)
         area_stats = pl.read_database(
@@ -1528,8 +4212,8 @@ def database_summary_stats(conn, pl, mo):
         db_stats = pl.read_database(
             """SELECT
                 (SELECT COUNT(*) FROM crime_areas) as total_area_records,
-                (SELECT COUNT(*) FROM crimes) as total_crime_records,
-                (SELECT COUNT(DISTINCT polygon) FROM crime_areas) as unique_polygons,
+                (SELECT COALESCE(SUM(total_crimes), 0) FROM month_totals) as total_crime_records,
+                (SELECT COUNT(DISTINCT cell_id) FROM crime_areas) as unique_cells,
                 (SELECT COUNT(DISTINCT date) FROM crime_areas) as date_range_count
             """,
             conn
@@ -1545,7 +4229,7 @@ def database_summary_stats(conn, pl, mo):
         ## Overall Coverage
         - **Total Crime Records**: {stats['total_crime_records']:,}
         - **Total Area Records**: {stats['total_area_records']:,}
-        - **Unique Geographic Areas**: {stats['unique_polygons']:,}
+        - **Unique Geographic Areas**: {stats['unique_cells']:,}
         - **Date Range**: {area_info['earliest_crime_date']} to {area_info['latest_crime_date']}
         - **Months Covered**: {stats['date_range_count']}
 
@@ -1567,7 +4251,7 @@ def database_summary_stats(conn, pl, mo):
         ## Monthly Coverage
         - **Months with Data**: {len(monthly_stats)}
         - **Average Crimes per Month**: {monthly_stats['total_crimes'].mean():.0f}
-        - **Peak Month**: {monthly_stats.filter(pl.col('total_crimes') == pl.col('total_crimes').max()).select('month').item()} ({monthly_stats['total_crimes'].max():,} crimes)
+        - **Peak Month**: {monthly_stats.sort('total_crimes', descending=True).item(0, 'month')} ({monthly_stats['total_crimes'].max():,} crimes)
         """
 
         # Create display with both markdown and dataframes
@@ -1587,9 +4271,35 @@ def database_summary_stats(conn, pl, mo):
 
 
 @app.cell
-def show_summary_stats(get_summary_stats_display):
-    """Display the summary statistics."""
-    summary_stats_output = get_summary_stats_display()
+def summary_rebuild_controls(mo):
+    """Button to rebuild the summary tables from the crimes table."""
+    rebuild_summary_button = mo.ui.run_button(label="Rebuild summary tables")
+    return (rebuild_summary_button,)
+
+
+@app.cell
+def show_summary_stats(
+    get_summary_stats_display,
+    ingest_writer,
+    mo,
+    rebuild_summary_button,
+    rebuild_summary_tables,
+):
+    """Display the summary statistics, rebuilding the summary tables first if requested."""
+    rebuild_status = mo.md("Summary tables are maintained during ingest; rebuild to check them against the crimes table.")
+    if rebuild_summary_button.value:
+        ingest_writer.flush()
+        drift = rebuild_summary_tables()
+        drifted = {table: rows for table, rows in drift.items() if rows}
+        if drifted:
+            rebuild_status = mo.md("⚠ Summary tables rebuilt; drifted rows: " + ", ".join(f"{table} ({rows})" for table, rows in drifted.items()))
+        else:
+            rebuild_status = mo.md("✓ Summary tables rebuilt; they matched the crimes table")
+
+    summary_stats_output = mo.vstack([
+        mo.hstack([rebuild_summary_button, rebuild_status], justify="start"),
+        get_summary_stats_display()
+    ])
     return (summary_stats_output,)
 
 
@@ -1659,43 +4369,39 @@ def _(error_log_output):
     return
 
 
-@app.cell
-def _():
-    return
-
-
 @app.cell
 def historical_data_functions(cursor):
     """Functions for loading existing areas and processing historical data."""
     def load_existing_areas(base_date=None):
         """
-        Load existing area polygons from the database.
+        Load existing areas from the database.
 
         Args:
             base_date: Optional date to filter areas (YYYY-MM format)
-                      If None, loads all unique polygons
+                      If None, loads all unique cells
 
         Returns:
-            List of tuples: [(area_id, polygon_str, base_crime_count), ...]
+            List of tuples: [(area_id, cell_id, (north, south, east, west), base_crime_count), ...]
         """
         if base_date:
             cursor.execute(
-                """SELECT id, polygon, crime_count
-                   FROM crime_areas
-                   WHERE date = ?
-                   ORDER BY id""",
+                """SELECT ca.id, ca.cell_id, c.north, c.south, c.east, c.west, ca.crime_count
+                   FROM crime_areas ca JOIN area_cells c ON c.id = ca.cell_id
+                   WHERE ca.date = ?
+                   ORDER BY ca.id""",
                 (base_date,)
             )
         else:
-            # Get unique polygons (take first occurrence of each)
+            # Get unique cells (take first occurrence of each)
             cursor.execute(
-                """SELECT id, polygon, crime_count
-                   FROM crime_areas
-                   GROUP BY polygon
-                   ORDER BY id"""
+                """SELECT MIN(ca.id), ca.cell_id, c.north, c.south, c.east, c.west, ca.crime_count
+                   FROM crime_areas ca JOIN area_cells c ON c.id = ca.cell_id
+                   GROUP BY ca.cell_id
+                   ORDER BY MIN(ca.id)"""
             )
 
-        areas = cursor.fetchall()
+        areas = [(area_id, cell_id, (n, s, e, w), count)
+                 for area_id, cell_id, n, s, e, w, count in cursor.fetchall()]
         return areas
 
     def generate_month_range(start_date, end_date):
@@ -1728,16 +4434,18 @@ def historical_data_functions(cursor):
 
 
 @app.cell
-def historical_crime_fetcher(conn, cursor, fetch_crimes, insert_crimes_batch):
+def historical_crime_fetcher(area_cache, bounds_to_polygon, fetch_crimes, ingest_writer, load_run_leaves):
     """Fetch historical crime data for existing areas."""
-    def fetch_historical_crimes(areas, date, progress_callback=None):
+    def fetch_historical_crimes(areas, date, progress_callback=None, run_id=None):
         """
         Fetch crimes for all areas for a specific date.
 
         Args:
-            areas: List of (area_id, polygon_str, crime_count) tuples
+            areas: List of (area_id, cell_id, bounds, crime_count) tuples
             date: Date string in YYYY-MM format
             progress_callback: Optional function to call with progress updates
+            run_id: Optional checkpointed run from start_backfill_run; areas the
+                run already completed are skipped, completed areas are recorded
 
         Returns:
             Dictionary with statistics
@@ -1747,65 +4455,52 @@ def historical_crime_fetcher(conn, cursor, fetch_crimes, insert_crimes_batch):
         failed = 0
         cached = 0
         total_crimes_inserted = 0
+        completed = {}
+        if run_id is not None:
+            completed = {cell_id: crime_count for cell_id, _, _, month, crime_count, _ in load_run_leaves(run_id)
+                         if month == date}
+        cached_pairs = []
 
-        for idx, (area_id, polygon_str, _) in enumerate(areas, start=1):
+        for idx, (area_id, cell_id, bounds, _) in enumerate(areas, start=1):
             # Check if this area/date combination already exists in database
-            cursor.execute(
-                """SELECT id, crime_count FROM crime_areas
-                   WHERE polygon = ? AND date = ?""",
-                (polygon_str, date)
-            )
-            result = cursor.fetchone()
+            result = area_cache.area(cell_id, date)
+
+            if cell_id in completed:
+                # Completed earlier in this run - skip API call
+                crimes_count = result[2] if result else 0
+                cached += 1
+                total_crimes_inserted += crimes_count
+                if progress_callback:
+                    progress_callback(idx, total_areas, area_id, completed[cell_id], crimes_count, cached=True)
+                continue
 
             if result:
                 # Data already exists - skip API call
-                existing_area_id, existing_crime_count = result
+                _, existing_crime_count, crimes_count = result
 
                 # Check if crimes were actually inserted for this area
-                cursor.execute(
-                    """SELECT COUNT(*) FROM crimes WHERE area_id = ?""",
-                    (existing_area_id,)
-                )
-                crimes_count = cursor.fetchone()[0]
-
                 if crimes_count > 0:
                     # Complete data exists, skip entirely
                     cached += 1
                     total_crimes_inserted += crimes_count
+                    cached_pairs.append((bounds, None, date, 'leaf', existing_crime_count, False))
                     if progress_callback:
                         progress_callback(idx, total_areas, area_id, existing_crime_count, crimes_count, cached=True)
                     continue
-                else:
-                    # Area exists but no crimes - will refetch below
-                    area_id_to_use = existing_area_id
+                # Area exists but no crimes - will refetch below
 
-            # Convert polygon string back to coords for API
-            # Format: "lat1,lon1:lat2,lon2:..."
-            polygon_coords = []
-            for pair in polygon_str.split(':'):
-                lat, lon = pair.split(',')
-                polygon_coords.append((float(lat), float(lon)))
+            polygon_coords = bounds_to_polygon(*bounds)
 
             # Fetch crimes from API (only if not cached)
             status_code, data, crime_count = fetch_crimes(polygon_coords, date)
 
             if status_code == 200:
-                if not result:
-                    # Insert new area/date record
-                    cursor.execute(
-                        """INSERT INTO crime_areas (polygon, crime_count, date)
-                           VALUES (?, ?, ?)""",
-                        (polygon_str, crime_count, date)
-                    )
-                    area_id_to_use = cursor.lastrowid
-
-                # Insert individual crimes
-                crimes_inserted = insert_crimes_batch(area_id_to_use, data)
+                # Area row (new, or existing without crimes) and crimes go to the writer
+                ingest_writer.submit(bounds, crime_count, date, data, run_id=run_id)
+                crimes_inserted = len(data)
                 total_crimes_inserted += crimes_inserted
                 successful += 1
 
-                conn.commit()
-
                 if progress_callback:
                     progress_callback(idx, total_areas, area_id, crime_count, crimes_inserted)
             else:
@@ -1813,6 +4508,9 @@ def historical_crime_fetcher(conn, cursor, fetch_crimes, insert_crimes_batch):
                 if progress_callback:
                     progress_callback(idx, total_areas, area_id, 0, 0, error=status_code)
 
+        if run_id is not None and cached_pairs:
+            ingest_writer.submit_run_state(run_id, cached_pairs)
+
         return {
             'total_areas': total_areas,
             'successful': successful,
@@ -1892,23 +4590,31 @@ def show_historical_controls(historical_display):
 
 @app.cell
 def run_historical_collection(
+    CircuitOpenError,
+    api_circuit_breaker,
     base_date_for_areas,
     fetch_historical_crimes,
-    fetch_historical_crimes_async,
+    fetch_historical_months_async,
+    finish_run,
     generate_month_range,
+    get_run_progress,
     historical_end_date,
     historical_run_button,
     historical_start_date,
+    ingest_writer,
     load_existing_areas,
     run_async,
+    start_backfill_run,
     use_async_mode,
 ):
     """Execute historical data collection with optional async mode."""
     import time
+    from functools import partial
     historical_run_button  # Create dependency
 
     if historical_run_button.value:
         start_time = time.time()
+        api_circuit_breaker.reset()
 
         print("=" * 70)
         print("HISTORICAL CRIME DATA COLLECTION")
@@ -1931,6 +4637,13 @@ def run_historical_collection(
             )
             print(f"✓ Will process {len(months)} month(s): {', '.join(months)}")
 
+            # Checkpointed run: an unfinished backfill of the same base date and months is resumed
+            backfill_run_id, backfill_resumed = start_backfill_run(areas, base_date_for_areas.value, months)
+            if backfill_resumed:
+                backfill_progress = get_run_progress(backfill_run_id)
+                print(f"✓ Resuming run {backfill_run_id}: {backfill_progress.get('leaf', 0)} area-months done, "
+                      f"{backfill_progress.get('pending', 0)} pending")
+
             # Process each month
             total_stats = {
                 'months_processed': 0,
@@ -1939,45 +4652,66 @@ def run_historical_collection(
                 'total_cache_hits': 0
             }
 
-            # Choose fetcher based on mode
-            fetcher = fetch_historical_crimes_async if use_async_mode.value else fetch_historical_crimes
-
-            for month in months:
-                month_start = time.time()
-                print(f"\n{'─' * 70}")
-                print(f"Processing: {month}")
-                print(f"{'─' * 70}")
-
-                def progress(idx, total, area_id, crime_count, crimes_inserted, error=None, cached=False):
-                    if error:
-                        print(f"  [{idx}/{total}] Area {area_id} - ⚠ Error {error}")
-                    elif cached:
-                        print(f"  [{idx}/{total}] Area {area_id} - ✓ CACHED ({crime_count} crimes)")
-                    else:
-                        print(f"  [{idx}/{total}] Area {area_id} - {crime_count} crimes, {crimes_inserted} inserted")
-
-                # Run async or sync based on mode
-                if use_async_mode.value:
-                    month_stats = run_async(fetcher, areas, month, progress)
+            def progress(month, idx, total, area_id, crime_count, crimes_inserted, error=None, cached=False):
+                if error:
+                    print(f"  [{month} {idx}/{total}] Area {area_id} - ⚠ Error {error}")
+                elif cached:
+                    print(f"  [{month} {idx}/{total}] Area {area_id} - ✓ CACHED ({crime_count} crimes)")
                 else:
-                    month_stats = fetcher(areas, month, progress)
-
-                month_duration = time.time() - month_start
+                    print(f"  [{month} {idx}/{total}] Area {area_id} - {crime_count} crimes, {crimes_inserted} inserted")
 
+            def report_month(month, month_stats, complete=True):
                 # Calculate API calls (successful + failed, excluding cached)
                 api_calls = month_stats['successful'] + month_stats['failed']
 
-                print(f"\n✓ {month} Complete ({month_duration:.1f}s):")
+                if complete:
+                    print(f"\n✓ {month} Complete (at {month_stats['elapsed']:.1f}s):")
+                else:
+                    unfinished = month_stats['total_areas'] - api_calls - month_stats['cached']
+                    print(f"\n⚠ {month} Stopped with {unfinished} areas unfetched (at {month_stats['elapsed']:.1f}s):")
                 print(f"  - Total areas: {month_stats['total_areas']}")
                 print(f"  - API calls made: {api_calls} (Successful: {month_stats['successful']}, Failed: {month_stats['failed']})")
                 print(f"  - Cache hits: {month_stats['cached']}")
                 print(f"  - Total crimes: {month_stats['total_crimes']:,}")
 
-                total_stats['months_processed'] += 1
+                if complete:
+                    total_stats['months_processed'] += 1
                 total_stats['total_crimes'] += month_stats['total_crimes']
                 total_stats['total_api_calls'] += api_calls
                 total_stats['total_cache_hits'] += month_stats['cached']
 
+            if use_async_mode.value:
+                # Every month in one job: no barrier between months
+                print(f"\n{'─' * 70}")
+                print(f"Processing: {len(months)} month(s) × {len(areas)} areas as one job")
+                print(f"{'─' * 70}")
+                try:
+                    run_async(fetch_historical_months_async, areas, months, progress, report_month, run_id=backfill_run_id)
+                except CircuitOpenError as e:
+                    print(f"\n⛔ Collection stopped: {e}. See the error log.")
+                finally:
+                    # Collection is complete once its queued areas are committed
+                    ingest_writer.flush()
+            else:
+                for month in months:
+                    print(f"\n{'─' * 70}")
+                    print(f"Processing: {month}")
+                    print(f"{'─' * 70}")
+                    try:
+                        month_stats = fetch_historical_crimes(areas, month, partial(progress, month), run_id=backfill_run_id)
+                    except CircuitOpenError as e:
+                        print(f"\n⛔ Collection stopped at {month}: {e}. See the error log.")
+                        break
+                    finally:
+                        # Month is complete once its queued areas are committed
+                        ingest_writer.flush()
+                    month_stats['elapsed'] = time.time() - start_time
+                    report_month(month, month_stats)
+
+            backfill_remaining = finish_run(backfill_run_id)
+            if backfill_remaining:
+                print(f"\n⚠ Run {backfill_run_id} has {backfill_remaining} area-months left; run again to resume it")
+
             total_duration = time.time() - start_time
 
             print(f"\n{'═' * 70}")